@@ -6,20 +6,24 @@ import sys
 from time import time
 from collections import OrderedDict
 
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Set
 
 import voluptuous as vol
 
 from homeassistant import (
-    core, config as conf_util, config_entries, components as core_components)
+    core, config as conf_util, config_entries, components as core_components,
+    loader)
 from homeassistant.components import persistent_notification
-from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, PLATFORM_FORMAT
 from homeassistant.setup import async_setup_component
 from homeassistant.util.logging import AsyncHandler
 from homeassistant.util.package import async_get_user_site, is_virtual_env
-from homeassistant.util.yaml import clear_secret_cache
+from homeassistant.util.yaml import (
+    clear_secret_cache, load_config_cache, save_config_cache)
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_per_platform
 from homeassistant.helpers.signal import async_register_signal_handling
+from homeassistant.helpers.storage import STORAGE_DIR
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +32,9 @@ ERROR_LOG_FILENAME = 'home-assistant.log'
 # hass.data key for logging information.
 DATA_LOGGING = 'logging'
 
+# Stored cache of parsed configuration files
+CONFIG_CACHE_FILE = 'core.config_cache'
+
 FIRST_INIT_COMPONENT = {'system_log', 'recorder', 'mqtt', 'mqtt_eventstream',
                         'logger', 'introduction', 'frontend', 'history'}
 
@@ -133,6 +140,11 @@ async def async_from_config_dict(config: Dict[str, Any],
 
     _LOGGER.info("Home Assistant core initialized")
 
+    # Import all components and platforms up front, so slow imports don't
+    # hold up setting up the other components.
+    await loader.async_import_components(
+        hass, _components_and_platforms(config, components))
+
     # stage 1
     for component in components:
         if component not in FIRST_INIT_COMPONENT:
@@ -156,6 +168,18 @@ async def async_from_config_dict(config: Dict[str, Any],
     return hass
 
 
+def _components_and_platforms(config: Dict, components: Set[str]) -> Set[str]:
+    """Return the components and the platforms they are configured with."""
+    result = set(components)
+
+    for component in components:
+        for platform, _ in config_per_platform(config, component):
+            if isinstance(platform, str):
+                result.add(PLATFORM_FORMAT.format(component, platform))
+
+    return result
+
+
 def from_config_file(config_path: str,
                      hass: Optional[core.HomeAssistant] = None,
                      verbose: bool = False,
@@ -207,7 +231,8 @@ async def async_from_config_file(config_path: str,
 
     try:
         config_dict = await hass.async_add_executor_job(
-            conf_util.load_yaml_config_file, config_path)
+            _load_config_file, config_path,
+            hass.config.path(STORAGE_DIR, CONFIG_CACHE_FILE))
     except HomeAssistantError as err:
         _LOGGER.error("Error loading %s: %s", config_path, err)
         return None
@@ -218,6 +243,16 @@ async def async_from_config_file(config_path: str,
         config_dict, hass, enable_log=False, skip_pip=skip_pip)
 
 
+def _load_config_file(config_path: str, cache_path: str) -> Dict:
+    """Load the configuration file using the stored cache of parsed files."""
+    load_config_cache(cache_path)
+
+    try:
+        return conf_util.load_yaml_config_file(config_path)
+    finally:
+        save_config_cache(cache_path)
+
+
 @core.callback
 def async_enable_logging(hass: core.HomeAssistant,
                          verbose: bool = False,
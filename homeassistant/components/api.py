@@ -16,15 +16,17 @@ from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP, EVENT_TIME_CHANGED, HTTP_BAD_REQUEST,
     HTTP_CREATED, HTTP_NOT_FOUND, MATCH_ALL, URL_API, URL_API_COMPONENTS,
-    URL_API_CONFIG, URL_API_DISCOVERY_INFO, URL_API_ERROR_LOG, URL_API_EVENTS,
-    URL_API_SERVICES, URL_API_STATES, URL_API_STATES_ENTITY, URL_API_STREAM,
-    URL_API_TEMPLATE, __version__)
+    URL_API_COMPONENTS_TIMING, URL_API_CONFIG, URL_API_DISCOVERY_INFO,
+    URL_API_ERROR_LOG, URL_API_EVENTS, URL_API_SERVICES, URL_API_STATES,
+    URL_API_STATES_ENTITY, URL_API_STREAM, URL_API_TEMPLATE, __version__)
+from homeassistant import loader
 import homeassistant.core as ha
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import template
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.state import AsyncTrackStates
 import homeassistant.remote as rem
+from homeassistant.setup import DATA_SETUP_TIME
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,6 +55,7 @@ def setup(hass, config):
     hass.http.register_view(APIServicesView)
     hass.http.register_view(APIDomainServicesView)
     hass.http.register_view(APIComponentsView)
+    hass.http.register_view(APIComponentsTimingView)
     hass.http.register_view(APITemplateView)
 
     if DATA_LOGGING in hass.data:
@@ -333,6 +336,26 @@ class APIComponentsView(HomeAssistantView):
         return self.json(request.app['hass'].config.components)
 
 
+class APIComponentsTimingView(HomeAssistantView):
+    """View to handle Components timing requests."""
+
+    url = URL_API_COMPONENTS_TIMING
+    name = 'api:components:timing'
+
+    @ha.callback
+    def get(self, request):
+        """Get how long importing and setting up components took."""
+        hass = request.app['hass']
+        import_time = hass.data.get(loader.DATA_IMPORT_TIME, {})
+        setup_time = hass.data.get(DATA_SETUP_TIME, {})
+        return self.json({
+            name: {
+                'import': import_time.get(name),
+                'setup': setup_time.get(name),
+            } for name in set(import_time) | set(setup_time)
+        })
+
+
 class APITemplateView(HomeAssistantView):
     """View to handle Template requests."""
 
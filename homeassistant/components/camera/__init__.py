@@ -121,7 +121,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         with async_timeout.timeout(timeout, loop=hass.loop):
-            image = await camera.async_camera_image()
+            image = await camera.frame_broker.async_get_frame()
 
             if image:
                 return Image(camera.content_type, image)
@@ -187,7 +187,7 @@ async def async_setup(hass, config):
                     "Can't write %s, no access to path!", snapshot_file)
                 continue
 
-            image = await camera.async_camera_image()
+            image = await camera.frame_broker.async_get_frame()
 
             def _write_image(to_file, image_data):
                 """Executor helper to write image."""
@@ -223,9 +223,200 @@ async def async_unload_entry(hass, entry):
     return await hass.data[DOMAIN].async_unload_entry(entry)
 
 
+class CameraFrameSubscription:
+    """Receive the frames a camera frame broker publishes.
+
+    Only the newest frame is kept, so a consumer that is slower than the
+    camera skips the frames it couldn't keep up with.
+    """
+
+    def __init__(self, broker, interval):
+        """Initialize a frame subscription."""
+        self._broker = broker
+        self.interval = interval
+        self.dropped = 0
+        self._frame = None
+        self._pending = False
+        self._ended = False
+        self._event = asyncio.Event(loop=broker.hass.loop)
+
+    @callback
+    def async_publish(self, frame):
+        """Hand a frame to the consumer."""
+        if self._pending:
+            self.dropped += 1
+
+        self._frame = frame
+        self._pending = True
+        self._event.set()
+
+    @callback
+    def async_end(self):
+        """Tell the consumer that no more frames will follow."""
+        self._ended = True
+        self._event.set()
+
+    async def async_next_frame(self):
+        """Wait for the next frame.
+
+        Returns None when the broker stopped producing frames.
+        """
+        await self._event.wait()
+
+        if not self._pending:
+            return None
+
+        self._pending = False
+
+        if not self._ended:
+            self._event.clear()
+
+        return self._frame
+
+    @callback
+    def async_cancel(self):
+        """Stop receiving frames."""
+        self._broker.async_unsubscribe(self)
+
+
+class CameraFrameBroker:
+    """Fetch the frames of a camera once and share them with all consumers.
+
+    Frames are produced while there are subscriptions. By default they are
+    fetched from the camera at the interval of the fastest subscriber.
+    """
+
+    def __init__(self, camera, async_produce_frames=None):
+        """Initialize a frame broker.
+
+        async_produce_frames is called with the broker and publishes frames
+        until the stream ends or it is cancelled.
+        """
+        self.camera = camera
+        self.frame = None
+        self._frame_time = None
+        self._fetch = None
+        self._producer = None
+        self._subscriptions = []
+        self._async_produce_frames = (
+            async_produce_frames or CameraFrameBroker.async_poll_frames)
+
+    @property
+    def hass(self):
+        """Return the Home Assistant instance of the camera."""
+        return self.camera.hass
+
+    @property
+    def interval(self):
+        """Return the interval of the fastest subscriber."""
+        return min((subscription.interval
+                    for subscription in self._subscriptions), default=0)
+
+    async def async_get_frame(self):
+        """Return a frame of the camera.
+
+        Consumers asking while a frame is fetched share it. While frames are
+        polled for subscribers, the newest frame is returned.
+        """
+        if (self._producer is not None and self._frame_time is not None and
+                self.hass.loop.time() - self._frame_time < self.interval):
+            return self.frame
+
+        return await self._async_fetch()
+
+    async def _async_fetch(self):
+        """Fetch a frame or wait for the frame being fetched."""
+        if self._fetch is None:
+            self._fetch = self.hass.async_create_task(
+                self._async_fetch_frame())
+
+        return await asyncio.shield(self._fetch, loop=self.hass.loop)
+
+    async def _async_fetch_frame(self):
+        """Fetch a frame from the camera."""
+        try:
+            frame = await self.camera.async_camera_image()
+        finally:
+            self._fetch = None
+
+        self.frame = frame
+        self._frame_time = self.hass.loop.time()
+        return frame
+
+    @callback
+    def async_subscribe(self, interval=0):
+        """Subscribe to the frames of the camera."""
+        subscription = CameraFrameSubscription(self, interval)
+        self._subscriptions.append(subscription)
+
+        if self._producer is None:
+            self._producer = self.hass.async_create_task(
+                self._async_run_producer())
+        elif self.frame is not None:
+            subscription.async_publish(self.frame)
+
+        return subscription
+
+    @callback
+    def async_unsubscribe(self, subscription):
+        """Remove a subscription and stop producing frames if it was last."""
+        if subscription not in self._subscriptions:
+            return
+
+        self._subscriptions.remove(subscription)
+
+        if subscription.dropped:
+            _LOGGER.debug("Dropped %d frames of %s for a slow consumer",
+                          subscription.dropped, self.camera.entity_id)
+
+        if not self._subscriptions and self._producer is not None:
+            self._producer.cancel()
+            self._producer = None
+
+    @callback
+    def async_publish(self, frame):
+        """Publish a frame to all subscribers."""
+        self.frame = frame
+        self._frame_time = self.hass.loop.time()
+
+        for subscription in self._subscriptions:
+            subscription.async_publish(frame)
+
+    async def _async_run_producer(self):
+        """Produce frames and tell subscribers when it stops."""
+        task = asyncio.Task.current_task(loop=self.hass.loop)
+
+        try:
+            await self._async_produce_frames(self)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error getting frames of %s",
+                              self.camera.entity_id)
+        finally:
+            if self._producer is task:
+                self._producer = None
+
+        for subscription in self._subscriptions:
+            subscription.async_end()
+
+    async def async_poll_frames(self):
+        """Publish camera images at the interval of the fastest subscriber."""
+        while True:
+            frame = await self._async_fetch()
+
+            if not frame:
+                return
+
+            self.async_publish(frame)
+            await asyncio.sleep(self.interval, loop=self.hass.loop)
+
+
 class Camera(Entity):
     """The base class for camera entities."""
 
+    _frame_broker = None
+
     def __init__(self):
         """Initialize a camera."""
         self.is_streaming = False
@@ -268,6 +459,13 @@ class Camera(Entity):
         """Return the interval between frames of the mjpeg stream."""
         return 0.5
 
+    @property
+    def frame_broker(self):
+        """Return the broker sharing the frames of this camera."""
+        if self._frame_broker is None:
+            self._frame_broker = CameraFrameBroker(self)
+        return self._frame_broker
+
     def camera_image(self):
         """Return bytes of camera image."""
         raise NotImplementedError()
@@ -300,10 +498,11 @@ class Camera(Entity):
                 'utf-8') + img_bytes + b'\r\n')
 
         last_image = None
+        subscription = self.frame_broker.async_subscribe(interval)
 
         try:
             while True:
-                img_bytes = await self.async_camera_image()
+                img_bytes = await subscription.async_next_frame()
                 if not img_bytes:
                     break
 
@@ -317,14 +516,13 @@ class Camera(Entity):
 
                     last_image = img_bytes
 
-                await asyncio.sleep(interval)
-
         except asyncio.CancelledError:
             _LOGGER.debug("Stream closed by frontend.")
             response = None
             raise
 
         finally:
+            subscription.async_cancel()
             if response is not None:
                 await response.write_eof()
 
@@ -429,7 +627,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             with async_timeout.timeout(10, loop=request.app['hass'].loop):
-                image = await camera.async_camera_image()
+                image = await camera.frame_broker.async_get_frame()
 
             if image:
                 return web.Response(body=image,
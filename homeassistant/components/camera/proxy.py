@@ -6,19 +6,25 @@ https://home-assistant.io/components/proxy
 """
 import logging
 import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import hashlib
+
 import aiohttp
 import async_timeout
 
 import voluptuous as vol
 
+from homeassistant.core import callback
 from homeassistant.util.async_ import run_coroutine_threadsafe
 from homeassistant.helpers import config_validation as cv
 
 import homeassistant.util.dt as dt_util
 from homeassistant.const import (
-    CONF_NAME, CONF_ENTITY_ID, HTTP_HEADER_HA_AUTH)
+    CONF_NAME, CONF_ENTITY_ID, EVENT_HOMEASSISTANT_STOP, HTTP_HEADER_HA_AUTH)
 from homeassistant.components.camera import (
-    PLATFORM_SCHEMA, Camera)
+    PLATFORM_SCHEMA, Camera, CameraFrameBroker)
 from homeassistant.helpers.aiohttp_client import (
     async_get_clientsession, async_aiohttp_proxy_web)
 
@@ -37,6 +43,13 @@ CONF_CACHE_IMAGES = "cache_images"
 DEFAULT_BASENAME = "Camera Proxy"
 DEFAULT_QUALITY = 75
 
+DATA_RESIZER = 'camera_proxy_resizer'
+
+# Threads resizing images, kept apart from the shared executor
+RESIZE_WORKERS = 2
+# Memory for remembered resized images
+RESIZE_CACHE_SIZE = 10 * 1024 * 1024  # bytes
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_ENTITY_ID): cv.entity_id,
     vol.Optional(CONF_NAME): cv.string,
@@ -116,6 +129,85 @@ class ImageOpts():
         return bool(self.max_width or self.quality)
 
 
+class ImageResizer:
+    """Resize images in a dedicated pool and remember the results."""
+
+    def __init__(self, hass, workers=RESIZE_WORKERS,
+                 cache_size=RESIZE_CACHE_SIZE):
+        """Initialize the image resizer."""
+        self.hass = hass
+        self.hits = 0
+        self.misses = 0
+        self._pool = ThreadPoolExecutor(workers)
+        self._cache_size = cache_size
+        self._cached_bytes = 0
+        self._cache = OrderedDict()
+        self._pending = {}
+
+    async def async_resize(self, image, opts):
+        """Return the resized image."""
+        if not opts:
+            return image
+
+        key = (hashlib.sha1(image).digest(), opts.max_width, opts.quality,
+               opts.force_resize)
+        resized = self._cache.get(key)
+
+        if resized is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return resized
+
+        self.misses += 1
+        future = self._pending.get(key)
+
+        # Requests for the same image share the resize
+        if future is None:
+            future = self._pending[key] = self.hass.loop.run_in_executor(
+                self._pool, _resize_image, image, opts)
+            future.add_done_callback(partial(self._async_resized, key))
+
+        return await asyncio.shield(future, loop=self.hass.loop)
+
+    @callback
+    def _async_resized(self, key, future):
+        """Remember a resized image, evicting the least recently used."""
+        del self._pending[key]
+
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        resized = future.result()
+
+        if len(resized) > self._cache_size:
+            return
+
+        self._cache[key] = resized
+        self._cached_bytes += len(resized)
+
+        while self._cached_bytes > self._cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+    @callback
+    def async_shutdown(self, event=None):
+        """Stop the resize threads."""
+        self._pool.shutdown(wait=False)
+
+
+@callback
+def async_get_resizer(hass):
+    """Return the image resizer shared by all proxy cameras."""
+    resizer = hass.data.get(DATA_RESIZER)
+
+    if resizer is None:
+        resizer = hass.data[DATA_RESIZER] = ImageResizer(hass)
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, resizer.async_shutdown)
+
+    return resizer
+
+
 class ProxyCamera(Camera):
     """The representation of a Proxy camera."""
 
@@ -143,6 +235,8 @@ class ProxyCamera(Camera):
             or config.get(CONF_CACHE_IMAGES))
         self._last_image_time = 0
         self._last_image = None
+        self._stream_broker = CameraFrameBroker(
+            self, self._async_produce_stream_frames)
         self._headers = (
             {HTTP_HEADER_HA_AUTH: self.hass.config.api.api_password}
             if self.hass.config.api.api_password is not None
@@ -176,8 +270,8 @@ class ProxyCamera(Camera):
             _LOGGER.error("Error getting new camera image: %s", err)
             return self._last_image
 
-        image = await self.hass.async_add_job(
-            _resize_image, image, self._image_opts)
+        image = await async_get_resizer(self.hass).async_resize(
+            image, self._image_opts)
 
         if self._cache_images:
             self._last_image = image
@@ -185,12 +279,11 @@ class ProxyCamera(Camera):
 
     async def handle_async_mjpeg_stream(self, request):
         """Generate an HTTP MJPEG stream from camera images."""
-        websession = async_get_clientsession(self.hass)
-        url = "{}/api/camera_proxy_stream/{}".format(
-            self.hass.config.api.base_url, self._proxied_camera)
-        stream_coro = websession.get(url, headers=self._headers)
-
         if not self._stream_opts:
+            websession = async_get_clientsession(self.hass)
+            url = "{}/api/camera_proxy_stream/{}".format(
+                self.hass.config.api.base_url, self._proxied_camera)
+            stream_coro = websession.get(url, headers=self._headers)
             await async_aiohttp_proxy_web(self.hass, request, stream_coro)
             return
 
@@ -208,8 +301,34 @@ class ProxyCamera(Camera):
                     self.content_type, len(img_bytes)),
                 'utf-8') + img_bytes + b'\r\n')
 
+        # Streams of all clients share the upstream stream and its resized
+        # frames
+        subscription = self._stream_broker.async_subscribe()
+
+        try:
+            while True:
+                image = await subscription.async_next_frame()
+                if not image:
+                    break
+                await write(image)
+        except asyncio.CancelledError:
+            _LOGGER.debug("Stream closed by frontend.")
+            response = None
+            raise
+
+        finally:
+            subscription.async_cancel()
+            if response is not None:
+                await response.write_eof()
+
+    async def _async_produce_stream_frames(self, broker):
+        """Publish the resized frames of the proxied camera stream."""
+        websession = async_get_clientsession(self.hass)
+        url = "{}/api/camera_proxy_stream/{}".format(
+            self.hass.config.api.base_url, self._proxied_camera)
+
         with async_timeout.timeout(10, loop=self.hass.loop):
-            req = await stream_coro
+            req = await websession.get(url, headers=self._headers)
 
         try:
             # This would be nicer as an async generator
@@ -225,19 +344,12 @@ class ProxyCamera(Camera):
                 jpg_end = data.find(b'\xff\xd9')
                 if jpg_start != -1 and jpg_end != -1:
                     image = data[jpg_start:jpg_end + 2]
-                    image = await self.hass.async_add_job(
-                        _resize_image, image, self._stream_opts)
-                    await write(image)
+                    image = await async_get_resizer(self.hass).async_resize(
+                        image, self._stream_opts)
+                    broker.async_publish(image)
                     data = data[jpg_end + 2:]
-        except asyncio.CancelledError:
-            _LOGGER.debug("Stream closed by frontend.")
-            req.close()
-            response = None
-            raise
-
         finally:
-            if response is not None:
-                await response.write_eof()
+            req.close()
 
     @property
     def name(self):
@@ -5,6 +5,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/device_tracker/
 """
 import asyncio
+from collections import OrderedDict
 from datetime import timedelta
 import logging
 from typing import Any, List, Sequence, Callable
@@ -186,7 +187,8 @@ def async_setup(hass: HomeAssistantType, config: ConfigType):
 
             if scanner:
                 async_setup_scanner_platform(
-                    hass, p_config, scanner, tracker.async_see, p_type)
+                    hass, p_config, scanner, tracker.async_see, p_type,
+                    tracker.async_see_many)
                 return
 
             if not setup:
@@ -278,6 +280,72 @@ class DeviceTracker:
             consider_home: timedelta = None):
         """Notify the device tracker that you see a device.
 
+        This method is a coroutine.
+        """
+        device, new = yield from self._async_see_device(
+            mac, dev_id, host_name, location_name, gps, gps_accuracy,
+            battery, attributes, source_type, picture, icon, consider_home)
+
+        if device.track:
+            yield from device.async_update_ha_state()
+
+        if not new:
+            return
+
+        self._async_add_new_devices([device])
+
+        # update known_devices.yaml
+        self.hass.async_add_job(
+            self.async_update_config(
+                self.hass.config.path(YAML_DEVICES), device.dev_id, device)
+        )
+
+    @asyncio.coroutine
+    def async_see_many(self, seen: Sequence[dict]):
+        """Notify the device tracker that you see multiple devices.
+
+        Every item holds the keyword arguments of a call to async_see. The
+        state of each device is written once and new devices are added to
+        the group and known_devices.yaml together.
+
+        This method is a coroutine.
+        """
+        devices = OrderedDict()
+        new_devices = []
+
+        for kwargs in seen:
+            device, new = yield from self._async_see_device(**kwargs)
+            devices[device.dev_id] = device
+            if new:
+                new_devices.append(device)
+
+        for device in devices.values():
+            if device.track:
+                yield from device.async_update_ha_state()
+
+        if not new_devices:
+            return
+
+        self._async_add_new_devices(new_devices)
+
+        # update known_devices.yaml
+        self.hass.async_add_job(
+            self.async_update_config_devices(
+                self.hass.config.path(YAML_DEVICES), new_devices)
+        )
+
+    @asyncio.coroutine
+    def _async_see_device(
+            self, mac: str = None, dev_id: str = None, host_name: str = None,
+            location_name: str = None, gps: GPSType = None,
+            gps_accuracy: int = None, battery: int = None,
+            attributes: dict = None, source_type: str = SOURCE_TYPE_GPS,
+            picture: str = None, icon: str = None,
+            consider_home: timedelta = None):
+        """Find or create a device and mark it as seen.
+
+        Returns the device and whether it was created.
+
         This method is a coroutine.
         """
         if mac is None and dev_id is None:
@@ -295,9 +363,7 @@ class DeviceTracker:
             yield from device.async_seen(
                 host_name, location_name, gps, gps_accuracy, battery,
                 attributes, source_type, consider_home)
-            if device.track:
-                yield from device.async_update_ha_state()
-            return
+            return device, False
 
         # If no device can be found, create it
         dev_id = util.ensure_unique_string(dev_id, self.devices.keys())
@@ -314,26 +380,27 @@ class DeviceTracker:
             host_name, location_name, gps, gps_accuracy, battery, attributes,
             source_type)
 
-        if device.track:
-            yield from device.async_update_ha_state()
+        return device, True
+
+    @callback
+    def _async_add_new_devices(self, devices: Sequence):
+        """Add new devices to the group and announce them.
 
+        This method must be run in the event loop.
+        """
         # During init, we ignore the group
         if self.group and self.track_new:
             self.group.async_set_group(
                 util.slugify(GROUP_NAME_ALL_DEVICES), visible=False,
-                name=GROUP_NAME_ALL_DEVICES, add=[device.entity_id])
+                name=GROUP_NAME_ALL_DEVICES,
+                add=[device.entity_id for device in devices])
 
-        self.hass.bus.async_fire(EVENT_NEW_DEVICE, {
-            ATTR_ENTITY_ID: device.entity_id,
-            ATTR_HOST_NAME: device.host_name,
-            ATTR_MAC: device.mac,
-        })
-
-        # update known_devices.yaml
-        self.hass.async_add_job(
-            self.async_update_config(
-                self.hass.config.path(YAML_DEVICES), dev_id, device)
-        )
+        for device in devices:
+            self.hass.bus.async_fire(EVENT_NEW_DEVICE, {
+                ATTR_ENTITY_ID: device.entity_id,
+                ATTR_HOST_NAME: device.host_name,
+                ATTR_MAC: device.mac,
+            })
 
     @asyncio.coroutine
     def async_update_config(self, path, dev_id, device):
@@ -346,6 +413,17 @@ class DeviceTracker:
                 update_config, self.hass.config.path(YAML_DEVICES),
                 dev_id, device)
 
+    @asyncio.coroutine
+    def async_update_config_devices(self, path, devices):
+        """Add multiple devices to YAML configuration file in one write.
+
+        This method is a coroutine.
+        """
+        with (yield from self._is_updating):
+            yield from self.hass.async_add_job(
+                update_config_devices, self.hass.config.path(YAML_DEVICES),
+                devices)
+
     @callback
     def async_setup_group(self):
         """Initialize group for all tracked devices.
@@ -669,9 +747,13 @@ def async_load_config(path: str, hass: HomeAssistantType,
 @callback
 def async_setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
                                  scanner: Any, async_see_device: Callable,
-                                 platform: str):
+                                 platform: str,
+                                 async_see_devices: Callable = None):
     """Set up the connect scanner-based platform to device tracker.
 
+    If async_see_devices is given, each scan result is passed to it at once
+    instead of calling async_see_device for every device.
+
     This method must be run in the event loop.
     """
     interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
@@ -693,6 +775,9 @@ def async_setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
         with (yield from update_lock):
             found_devices = yield from scanner.async_scan_devices()
 
+        zone_home = hass.states.get(zone.ENTITY_ID_HOME)
+        found = []
+
         for mac in found_devices:
             if mac in seen:
                 host_name = None
@@ -716,31 +801,46 @@ def async_setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
                 }
             }
 
-            zone_home = hass.states.get(zone.ENTITY_ID_HOME)
             if zone_home:
                 kwargs['gps'] = [zone_home.attributes[ATTR_LATITUDE],
                                  zone_home.attributes[ATTR_LONGITUDE]]
                 kwargs['gps_accuracy'] = 0
 
-            hass.async_add_job(async_see_device(**kwargs))
+            if async_see_devices is None:
+                hass.async_add_job(async_see_device(**kwargs))
+            else:
+                found.append(kwargs)
+
+        if found:
+            hass.async_add_job(async_see_devices(found))
 
     async_track_time_interval(hass, async_device_tracker_scan, interval)
     hass.async_add_job(async_device_tracker_scan(None))
 
 
+def _device_config(device: Device) -> str:
+    """Return the YAML configuration of a device."""
+    return '\n' + dump({device.dev_id: {
+        ATTR_NAME: device.name,
+        ATTR_MAC: device.mac,
+        ATTR_ICON: device.icon,
+        'picture': device.config_picture,
+        'track': device.track,
+        CONF_AWAY_HIDE: device.away_hide,
+    }})
+
+
 def update_config(path: str, dev_id: str, device: Device):
     """Add device to YAML configuration file."""
+    update_config_devices(path, [device])
+
+
+def update_config_devices(path: str, devices: Sequence[Device]):
+    """Add devices to YAML configuration file in a single write."""
+    content = ''.join(_device_config(device) for device in devices)
+
     with open(path, 'a') as out:
-        device = {device.dev_id: {
-            ATTR_NAME: device.name,
-            ATTR_MAC: device.mac,
-            ATTR_ICON: device.icon,
-            'picture': device.config_picture,
-            'track': device.track,
-            CONF_AWAY_HIDE: device.away_hide,
-        }}
-        out.write('\n')
-        out.write(dump(device))
+        out.write(content)
 
 
 def get_gravatar_for_email(email: str):
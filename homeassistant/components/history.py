@@ -4,22 +4,33 @@ Provide pre-made queries on top of the recorder component.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/history/
 """
-from collections import defaultdict
+import asyncio
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
+import math
+import re
+import threading
 import time
 
+from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
+import async_timeout
 import voluptuous as vol
 
 from homeassistant.const import (
-    HTTP_BAD_REQUEST, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE)
+    HTTP_BAD_REQUEST, HTTP_INTERNAL_SERVER_ERROR, CONF_DOMAINS, CONF_ENTITIES,
+    CONF_EXCLUDE, CONF_INCLUDE, CONTENT_TYPE_JSON, EVENT_HOMEASSISTANT_STOP)
 import homeassistant.util.dt as dt_util
 from homeassistant.components import recorder, script
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import ATTR_HIDDEN
 from homeassistant.components.recorder.util import session_scope, execute
 import homeassistant.helpers.config_validation as cv
+from homeassistant.remote import JSONEncoder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,6 +48,20 @@ CONFIG_SCHEMA = vol.Schema({
 SIGNIFICANT_DOMAINS = ('thermostat', 'climate')
 IGNORE_DOMAINS = ('zone', 'scene',)
 
+# Rows fetched from the database per round trip when streaming
+STREAM_BATCH_SIZE = 1000
+# Approximate size in bytes of each chunk written to the client
+STREAM_CHUNK_SIZE = 65536
+# Chunks that can be waiting to be written to the client
+STREAM_MAX_PENDING = 8
+# Threads reading streamed history, separate from the core executor
+STREAM_WORKERS = 2
+# Seconds a client can take to accept a chunk before it is disconnected
+STREAM_WRITE_TIMEOUT = 60
+
+RESOLUTION_RE = re.compile(r'^(\d+)([smhd])$')
+RESOLUTION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
 
 def last_recorder_run(hass):
     """Retrieve the last closed recorder run from the database."""
@@ -65,16 +90,8 @@ def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
     from homeassistant.components.recorder.models import States
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
-            (States.domain.in_(SIGNIFICANT_DOMAINS) |
-             (States.last_changed == States.last_updated)) &
-            (States.last_updated > start_time))
-
-        if filters:
-            query = filters.apply(query, entity_ids)
-
-        if end_time is not None:
-            query = query.filter(States.last_updated < end_time)
+        query = _significant_states_query(
+            session, start_time, end_time, entity_ids, filters)
 
         query = query.order_by(States.last_updated)
 
@@ -93,6 +110,204 @@ def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
         include_start_time_state)
 
 
+def iter_significant_states(hass, start_time, end_time=None,
+                            entity_ids=None, filters=None,
+                            include_start_time_state=True):
+    """Yield significant states during UTC period start_time - end_time.
+
+    Like get_significant_states, the states are grouped by entity in the
+    same order of entities. The states are fetched from the database with
+    one query in batches while they are consumed, so only a batch of rows
+    is held in memory at a time.
+    """
+    from homeassistant.components.recorder.models import States
+    from sqlalchemy import case, func
+
+    start_states = OrderedDict()
+    if include_start_time_state:
+        for state in get_states(hass, start_time, entity_ids, filters=filters):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state
+
+    with session_scope(hass=hass) as session:
+        query = _significant_states_query(
+            session, start_time, end_time, entity_ids, filters)
+
+        # Entities with a state at the start come first, then the others
+        # in the order of their first change
+        changed = [
+            row.entity_id for row in query.with_entities(
+                States.entity_id
+            ).group_by(States.entity_id).order_by(
+                func.min(States.last_updated), func.min(States.state_id))]
+        changed_set = set(changed)
+        order = list(start_states)
+        order.extend(entity_id for entity_id in changed
+                     if entity_id not in start_states)
+
+        groups = iter(())
+        if changed:
+            position = {entity_id: idx for idx, entity_id in enumerate(order)
+                        if entity_id in changed_set}
+            rows = query.order_by(
+                case(position, value=States.entity_id), States.last_updated
+            ).yield_per(STREAM_BATCH_SIZE)
+            groups = groupby(rows, lambda row: row.entity_id)
+
+        for entity_id in order:
+            start_state = start_states.get(entity_id)
+            if start_state is not None:
+                yield start_state
+
+            if entity_id not in changed_set:
+                continue
+
+            _, rows = next(groups)
+            for row in rows:
+                state = row.to_native()
+                if (state is None or not _is_significant(state) or
+                        state.attributes.get(ATTR_HIDDEN, False)):
+                    continue
+                yield state
+
+
+def _significant_states_query(session, start_time, end_time, entity_ids,
+                              filters):
+    """Return the query for significant states during a period."""
+    from homeassistant.components.recorder.models import States
+
+    query = session.query(States).filter(
+        (States.domain.in_(SIGNIFICANT_DOMAINS) |
+         (States.last_changed == States.last_updated)) &
+        (States.last_updated > start_time))
+
+    if filters:
+        query = filters.apply(query, entity_ids)
+
+    if end_time is not None:
+        query = query.filter(States.last_updated < end_time)
+
+    return query
+
+
+def parse_resolution(value):
+    """Parse a bucket size like 30s, 5m, 1h or 1d.
+
+    Returns None if the value is not a valid resolution.
+    """
+    match = RESOLUTION_RE.match(value)
+    if match is None:
+        return None
+
+    resolution = timedelta(
+        seconds=int(match.group(1)) * RESOLUTION_UNITS[match.group(2)])
+    return resolution if resolution else None
+
+
+def get_aggregated_states(hass, start_time, end_time, resolution,
+                          entity_ids=None, filters=None):
+    """Return the mean, min and max of numeric states per time bucket.
+
+    Buckets are aligned to multiples of resolution since the epoch. States
+    that are not numeric are ignored. When the resolution is a whole
+    number of hours, complete hours are read from the hourly statistics
+    compiled by the recorder where available instead of from the states.
+    Hours without statistics are read from the states.
+    """
+    from homeassistant.components.recorder.models import States, Statistics
+    from homeassistant.components.recorder.statistics import PERIOD
+
+    timer_start = time.perf_counter()
+    result = OrderedDict()
+    step = resolution.total_seconds()
+
+    def add(entity_id, when, mean, low, high, count):
+        """Add an aggregate to the bucket it belongs to."""
+        timestamp = dt_util.as_utc(when).timestamp()
+        bucket = dt_util.utc_from_timestamp(timestamp - timestamp % step)
+        buckets = result.setdefault(entity_id, OrderedDict())
+        current = buckets.get(bucket)
+        if current is None:
+            buckets[bucket] = [mean * count, count, low, high]
+        else:
+            current[0] += mean * count
+            current[1] += count
+            current[2] = min(current[2], low)
+            current[3] = max(current[3], high)
+
+    def filtered(query, table):
+        """Apply the entity and history filters to a query."""
+        if filters:
+            return filters.apply(query, entity_ids, table)
+        elif entity_ids:
+            return query.filter(table.entity_id.in_(entity_ids))
+        return query
+
+    def add_states(session, start, end):
+        """Aggregate the states between start and end."""
+        query = session.query(
+            States.entity_id, States.last_updated, States.state
+        ).filter(
+            (States.last_updated >= start) & (States.last_updated < end))
+
+        for entity_id, when, state in filtered(query, States).yield_per(
+                STREAM_BATCH_SIZE):
+            try:
+                value = float(state)
+            except (TypeError, ValueError):
+                continue
+            if not math.isfinite(value):
+                continue
+            add(entity_id, when, value, value, value, 1)
+
+    with session_scope(hass=hass) as session:
+        compiled = set()
+        if step % PERIOD.total_seconds() == 0:
+            stats_start = start_time.replace(
+                minute=0, second=0, microsecond=0)
+            if stats_start < start_time:
+                stats_start += PERIOD
+            stats_end = end_time.replace(minute=0, second=0, microsecond=0)
+
+            if stats_start < stats_end:
+                query = session.query(Statistics.start).filter(
+                    (Statistics.start >= stats_start) &
+                    (Statistics.start < stats_end)).distinct()
+                compiled = {dt_util.as_utc(row.start) for row in query}
+
+        # Hours that were not compiled, like before statistics were
+        # enabled or while Home Assistant was down, are read from the states
+        position = start_time
+        for hour in sorted(compiled):
+            if position < hour:
+                add_states(session, position, hour)
+            position = hour + PERIOD
+        if position < end_time:
+            add_states(session, position, end_time)
+
+        if compiled:
+            query = session.query(
+                Statistics.entity_id, Statistics.start, Statistics.mean,
+                Statistics.min, Statistics.max, Statistics.count
+            ).filter(
+                (Statistics.start >= min(compiled)) &
+                (Statistics.start <= max(compiled)))
+            for row in filtered(query, Statistics):
+                add(*row)
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug('get_aggregated_states took %fs', elapsed)
+
+    return OrderedDict(
+        (entity_id, [
+            {'entity_id': entity_id, 'start': bucket,
+             'mean': total / count, 'min': low, 'max': high}
+            for bucket, (total, count, low, high) in sorted(buckets.items())])
+        for entity_id, buckets in result.items())
+
+
 def state_changes_during_period(hass, start_time, end_time=None,
                                 entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
@@ -272,7 +487,12 @@ async def async_setup(hass, config):
         filters.included_domains = include.get(CONF_DOMAINS, [])
     use_include_order = conf.get(CONF_ORDER)
 
-    hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    pool = ThreadPoolExecutor(STREAM_WORKERS)
+    hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_STOP, lambda event: pool.shutdown(wait=False))
+
+    hass.http.register_view(
+        HistoryPeriodView(filters, use_include_order, pool))
     await hass.components.frontend.async_register_built_in_panel(
         'history', 'history', 'hass:poll-box')
 
@@ -286,10 +506,11 @@ class HistoryPeriodView(HomeAssistantView):
     name = 'api:history:view-period'
     extra_urls = ['/api/history/period/{datetime}']
 
-    def __init__(self, filters, use_include_order):
+    def __init__(self, filters, use_include_order, pool):
         """Initialize the history period view."""
         self.filters = filters
         self.use_include_order = use_include_order
+        self.pool = pool
 
     async def get(self, request, datetime=None):
         """Return history over a period of time."""
@@ -327,30 +548,165 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app['hass']
 
+        resolution = request.query.get('resolution')
+        if resolution is not None:
+            resolution = parse_resolution(resolution)
+            if resolution is None:
+                return self.json_message(
+                    'Invalid resolution', HTTP_BAD_REQUEST)
+
+            result = await hass.async_add_job(
+                get_aggregated_states, hass, start_time, end_time,
+                resolution, entity_ids, self.filters)
+            return await hass.async_add_job(
+                self.json, self._ordered_result(result))
+
+        # Reordering by the include order needs the whole result
+        if not self.use_include_order:
+            return await self._stream_states(
+                request, hass, start_time, end_time, entity_ids,
+                include_start_time_state)
+
         result = await hass.async_add_job(
             get_significant_states, hass, start_time, end_time,
             entity_ids, self.filters, include_start_time_state)
-        result = list(result.values())
+        result = self._ordered_result(result)
         if _LOGGER.isEnabledFor(logging.DEBUG):
             elapsed = time.perf_counter() - timer_start
             _LOGGER.debug(
                 'Extracted %d states in %fs', sum(map(len, result)), elapsed)
 
-        # Optionally reorder the result to respect the ordering given
-        # by any entities explicitly included in the configuration.
+        return await hass.async_add_job(self.json, result)
 
-        if self.use_include_order:
-            sorted_result = []
-            for order_entity in self.filters.included_entities:
-                for state_list in result:
-                    if state_list[0].entity_id == order_entity:
-                        sorted_result.append(state_list)
-                        result.remove(state_list)
-                        break
-            sorted_result.extend(result)
-            result = sorted_result
+    def _ordered_result(self, result):
+        """Return the lists of states per entity of a result.
+
+        Optionally reorder the result to respect the ordering given
+        by any entities explicitly included in the configuration.
+        """
+        if not self.use_include_order:
+            return list(result.values())
+
+        sorted_result = [
+            result.pop(order_entity)
+            for order_entity in self.filters.included_entities
+            if order_entity in result]
+        sorted_result.extend(result.values())
+        return sorted_result
+
+    async def _stream_states(self, request, hass, start_time, end_time,
+                             entity_ids, include_start_time_state):
+        """Stream the states as JSON while they are read from the database.
+
+        The states are read and serialized in a thread of the stream pool,
+        so streams can't take up the core executor. Chunks are handed to the
+        event loop through a bounded queue, so a slow client pauses the
+        database reads instead of buffering the whole result. A client that
+        stops reading is disconnected after STREAM_WRITE_TIMEOUT, releasing
+        the thread. The response starts with the first chunk, errors before
+        it return an error response. Errors after it close the connection
+        before the response is complete.
+        """
+        chunks = asyncio.Queue(maxsize=STREAM_MAX_PENDING, loop=hass.loop)
+        stop = threading.Event()
+
+        def produce():
+            """Serialize the states and queue them in chunks."""
+            states = iter_significant_states(
+                hass, start_time, end_time, entity_ids, self.filters,
+                include_start_time_state)
+            try:
+                for chunk in _states_json_chunks(states):
+                    asyncio.run_coroutine_threadsafe(
+                        chunks.put(chunk), hass.loop).result()
+                    if stop.is_set():
+                        return
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error reading history")
+                chunk = None
+            else:
+                chunk = b''
+            if not stop.is_set():
+                # An empty chunk ends the document, None reports an error
+                asyncio.run_coroutine_threadsafe(
+                    chunks.put(chunk), hass.loop).result()
+
+        timer_start = time.perf_counter()
+        producer = hass.loop.run_in_executor(self.pool, produce)
+        response = None
+        timed_out = False
+        chunk = await chunks.get()
+
+        try:
+            if chunk is None:
+                return self.json_message(
+                    'Error reading history', HTTP_INTERNAL_SERVER_ERROR)
+
+            response = web.StreamResponse(
+                headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+            response.enable_compression()
+            await response.prepare(request)
+
+            while chunk:
+                with async_timeout.timeout(
+                        STREAM_WRITE_TIMEOUT, loop=hass.loop):
+                    await response.write(chunk)
+                chunk = await chunks.get()
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Client stopped reading history, disconnecting")
+            timed_out = True
+        finally:
+            if chunk:
+                # Client went away, unblock and stop the producer
+                stop.set()
+                while not chunks.empty():
+                    chunks.get_nowait()
+
+        await producer
+
+        if chunk is None or timed_out:
+            # Don't let an incomplete document look like a complete one
+            request.transport.close()
+            return response
+
+        await response.write_eof()
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug('Streamed history in %fs', elapsed)
+
+        return response
 
-        return await hass.async_add_job(self.json, result)
+
+def _states_json_chunks(states):
+    """Serialize states ordered by entity into chunks of a JSON document.
+
+    The document is a list with a list of states for each entity.
+    """
+    parts = ['[']
+    size = 1
+    entity_id = None
+
+    for state in states:
+        if entity_id is None:
+            part = '['
+        elif state.entity_id != entity_id:
+            part = '],['
+        else:
+            part = ','
+        entity_id = state.entity_id
+
+        part += json.dumps(state, sort_keys=True, cls=JSONEncoder)
+        parts.append(part)
+        size += len(part)
+
+        if size >= STREAM_CHUNK_SIZE:
+            yield ''.join(parts).encode('UTF-8')
+            parts = []
+            size = 0
+
+    parts.append(']]' if entity_id is not None else ']')
+    yield ''.join(parts).encode('UTF-8')
 
 
 class Filters:
@@ -363,9 +719,12 @@ class Filters:
         self.included_entities = []
         self.included_domains = []
 
-    def apply(self, query, entity_ids=None):
+    def apply(self, query, entity_ids=None, table=None):
         """Apply the include/exclude filter on domains and entities on query.
 
+        The filter is applied to the States table unless another table with
+        entity_id and domain columns is given.
+
         Following rules apply:
         * only the include section is configured - just query the specified
           entities or domains.
@@ -376,40 +735,43 @@ class Filters:
         """
         from homeassistant.components.recorder.models import States
 
+        if table is None:
+            table = States
+
         # specific entities requested - do not in/exclude anything
         if entity_ids is not None:
-            return query.filter(States.entity_id.in_(entity_ids))
-        query = query.filter(~States.domain.in_(IGNORE_DOMAINS))
+            return query.filter(table.entity_id.in_(entity_ids))
+        query = query.filter(~table.domain.in_(IGNORE_DOMAINS))
 
         filter_query = None
         # filter if only excluded domain is configured
         if self.excluded_domains and not self.included_domains:
-            filter_query = ~States.domain.in_(self.excluded_domains)
+            filter_query = ~table.domain.in_(self.excluded_domains)
             if self.included_entities:
-                filter_query &= States.entity_id.in_(self.included_entities)
+                filter_query &= table.entity_id.in_(self.included_entities)
         # filter if only included domain is configured
         elif not self.excluded_domains and self.included_domains:
-            filter_query = States.domain.in_(self.included_domains)
+            filter_query = table.domain.in_(self.included_domains)
             if self.included_entities:
-                filter_query |= States.entity_id.in_(self.included_entities)
+                filter_query |= table.entity_id.in_(self.included_entities)
         # filter if included and excluded domain is configured
         elif self.excluded_domains and self.included_domains:
-            filter_query = ~States.domain.in_(self.excluded_domains)
+            filter_query = ~table.domain.in_(self.excluded_domains)
             if self.included_entities:
-                filter_query &= (States.domain.in_(self.included_domains) |
-                                 States.entity_id.in_(self.included_entities))
+                filter_query &= (table.domain.in_(self.included_domains) |
+                                 table.entity_id.in_(self.included_entities))
             else:
-                filter_query &= (States.domain.in_(self.included_domains) & ~
-                                 States.domain.in_(self.excluded_domains))
+                filter_query &= (table.domain.in_(self.included_domains) & ~
+                                 table.domain.in_(self.excluded_domains))
         # no domain filter just included entities
         elif not self.excluded_domains and not self.included_domains and \
                 self.included_entities:
-            filter_query = States.entity_id.in_(self.included_entities)
+            filter_query = table.entity_id.in_(self.included_entities)
         if filter_query is not None:
             query = query.filter(filter_query)
         # finally apply excluded entities filter if configured
         if self.excluded_entities:
-            query = query.filter(~States.entity_id.in_(self.excluded_entities))
+            query = query.filter(~table.entity_id.in_(self.excluded_entities))
         return query
 
 
@@ -6,6 +6,7 @@ https://home-assistant.io/components/image_processing/
 """
 import asyncio
 from datetime import timedelta
+import io
 import logging
 
 import voluptuous as vol
@@ -47,10 +48,18 @@ ATTR_TOTAL_FACES = 'total_faces'
 
 CONF_SOURCE = 'source'
 CONF_CONFIDENCE = 'confidence'
+CONF_FRAME_CHANGE_THRESHOLD = 'frame_change_threshold'
+
+DATA_BATCHES = 'image_processing_batches'
 
 DEFAULT_TIMEOUT = 10
 DEFAULT_CONFIDENCE = 80
 
+# Seconds to collect frames for a batch before processing it
+BATCH_DELAY = 0.1
+# Width and height of the grayscale thumbnails frames are compared by
+FINGERPRINT_SIZE = 16
+
 SOURCE_SCHEMA = vol.Schema({
     vol.Required(CONF_ENTITY_ID): cv.entity_domain('camera'),
     vol.Optional(CONF_NAME): cv.string,
@@ -91,6 +100,10 @@ async def async_setup(hass, config):
         """Service handler for scan."""
         image_entities = component.async_extract_from_service(service)
 
+        # A requested scan processes the frame even if it didn't change
+        for entity in image_entities:
+            entity.async_clear_last_frame()
+
         update_task = [entity.async_update_ha_state(True) for
                        entity in image_entities]
         if update_task:
@@ -103,11 +116,76 @@ async def async_setup(hass, config):
     return True
 
 
+def _frame_fingerprint(image):
+    """Return a small grayscale thumbnail of a frame.
+
+    Returns None if the frame can't be decoded.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        img = Image.open(io.BytesIO(image))
+        # Let JPEG decode at a fraction of its size
+        img.draft('L', (FINGERPRINT_SIZE * 8, FINGERPRINT_SIZE * 8))
+        return img.convert('L').resize(
+            (FINGERPRINT_SIZE, FINGERPRINT_SIZE)).tobytes()
+    except (OSError, ValueError) as err:
+        _LOGGER.debug("Unable to decode frame: %s", err)
+        return None
+
+
+def _fingerprint_difference(first, second):
+    """Return the mean difference of two fingerprints, from 0 to 255."""
+    return sum(abs(a - b) for a, b in zip(first, second)) / len(first)
+
+
+async def _async_process_batched(entity, image):
+    """Process a frame together with the frames of the same batch key."""
+    hass = entity.hass
+    batches = hass.data.setdefault(DATA_BATCHES, {})
+    batch = batches.get(entity.batch_key)
+
+    if batch is None:
+        batch = batches[entity.batch_key] = (
+            [], hass.loop.create_future())
+        hass.loop.call_later(
+            BATCH_DELAY, _async_run_batch, hass, entity.batch_key)
+
+    frames, future = batch
+    frames.append((entity, image))
+    await asyncio.shield(future, loop=hass.loop)
+
+
+@callback
+def _async_run_batch(hass, batch_key):
+    """Process the frames collected for a batch key in one job."""
+    frames, future = hass.data[DATA_BATCHES].pop(batch_key)
+    job = hass.async_add_job(frames[0][0].process_images, frames)
+
+    def _set_result(job):
+        """Hand the result of the job to the waiting entities."""
+        if job.cancelled():
+            future.cancel()
+        elif job.exception() is not None:
+            future.set_exception(job.exception())
+        else:
+            future.set_result(None)
+
+    job.add_done_callback(_set_result)
+
+
 class ImageProcessingEntity(Entity):
     """Base entity class for image processing."""
 
     timeout = DEFAULT_TIMEOUT
 
+    # Last processed frame and its fingerprint
+    _last_frame = None
+    _last_fingerprint = None
+
     @property
     def camera_entity(self):
         """Return camera entity id from process pictures."""
@@ -118,17 +196,55 @@ class ImageProcessingEntity(Entity):
         """Return minimum confidence for do some things."""
         return None
 
+    @property
+    def frame_change_threshold(self):
+        """Return how much a frame has to change to be processed.
+
+        None processes every frame and 0 skips frames identical to the last
+        processed one. Above 0, frames are skipped if their thumbnails
+        differ less on average, on a 0 to 255 grayscale. Platforms opt in
+        by overriding this property.
+        """
+        return None
+
+    @property
+    def batch_key(self):
+        """Return a key shared by entities processing frames together.
+
+        Frames of entities with the same key that arrive close together are
+        handed to process_images in one executor job.
+        """
+        return None
+
     def process_image(self, image):
         """Process image."""
         raise NotImplementedError()
 
+    def process_images(self, frames):
+        """Process a list of (entity, image) of entities sharing a batch key.
+
+        Backends that can process multiple frames more efficiently at once
+        should override this method.
+        """
+        for entity, image in frames:
+            entity.process_image(image)
+
     def async_process_image(self, image):
         """Process image.
 
         This method must be run in the event loop and returns a coroutine.
         """
+        if self.batch_key is not None:
+            return _async_process_batched(self, image)
+
         return self.hass.async_add_job(self.process_image, image)
 
+    @callback
+    def async_clear_last_frame(self):
+        """Forget the last processed frame to process the next one."""
+        self._last_frame = None
+        self._last_fingerprint = None
+
     async def async_update(self):
         """Update image and process it.
 
@@ -145,9 +261,35 @@ class ImageProcessingEntity(Entity):
             _LOGGER.error("Error on receive image from entity: %s", err)
             return
 
+        threshold = self.frame_change_threshold
+        fingerprint = None
+
+        if threshold is not None:
+            if image.content == self._last_frame:
+                _LOGGER.debug("Skipping unchanged frame of %s",
+                              self.camera_entity)
+                return
+
+            if threshold:
+                fingerprint = await self.hass.async_add_job(
+                    _frame_fingerprint, image.content)
+
+                if (fingerprint is not None and
+                        self._last_fingerprint is not None and
+                        _fingerprint_difference(
+                            fingerprint, self._last_fingerprint) <=
+                        threshold):
+                    _LOGGER.debug("Skipping similar frame of %s",
+                                  self.camera_entity)
+                    return
+
         # process image data
         await self.async_process_image(image.content)
 
+        if threshold is not None:
+            self._last_frame = image.content
+            self._last_fingerprint = fingerprint
+
 
 class ImageProcessingFaceEntity(ImageProcessingEntity):
     """Base entity class for face image processing."""
@@ -21,9 +21,14 @@ _LOGGER = logging.getLogger(__name__)
 
 ATTR_NAME = 'name'
 CONF_FACES = 'faces'
+CONF_TOLERANCE = 'tolerance'
+
+DEFAULT_TOLERANCE = 0.6
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_FACES): {cv.string: cv.isfile},
+    vol.Optional(CONF_TOLERANCE, default=DEFAULT_TOLERANCE):
+        vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
 })
 
 
@@ -32,7 +37,8 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
     entities = []
     for camera in config[CONF_SOURCE]:
         entities.append(DlibFaceIdentifyEntity(
-            camera[CONF_ENTITY_ID], config[CONF_FACES], camera.get(CONF_NAME)
+            camera[CONF_ENTITY_ID], config[CONF_FACES], camera.get(CONF_NAME),
+            config[CONF_TOLERANCE]
         ))
 
     add_devices(entities)
@@ -41,10 +47,12 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
 class DlibFaceIdentifyEntity(ImageProcessingFaceEntity):
     """Dlib Face API entity for identify."""
 
-    def __init__(self, camera_entity, faces, name=None):
+    def __init__(self, camera_entity, faces, name=None,
+                 tolerance=DEFAULT_TOLERANCE):
         """Initialize Dlib face identify entry."""
         # pylint: disable=import-error
         import face_recognition
+        import numpy as np
         super().__init__()
 
         self._camera = camera_entity
@@ -55,15 +63,20 @@ class DlibFaceIdentifyEntity(ImageProcessingFaceEntity):
             self._name = "Dlib Face {0}".format(
                 split_entity_id(camera_entity)[1])
 
-        self._faces = {}
+        self._tolerance = tolerance
+        self._names = []
+        encodings = []
         for face_name, face_file in faces.items():
             try:
                 image = face_recognition.load_image_file(face_file)
-                self._faces[face_name] = \
-                    face_recognition.face_encodings(image)[0]
+                encodings.append(face_recognition.face_encodings(image)[0])
+                self._names.append(face_name)
             except IndexError as err:
                 _LOGGER.error("Failed to parse %s. Error: %s", face_file, err)
 
+        # One row per known face, compared to a face all at once
+        self._encodings = np.array(encodings)
+
     @property
     def camera_entity(self):
         """Return camera entity id from process pictures."""
@@ -88,11 +101,16 @@ class DlibFaceIdentifyEntity(ImageProcessingFaceEntity):
 
         found = []
         for unknown_face in unknowns:
-            for name, face in self._faces.items():
-                result = face_recognition.compare_faces([face], unknown_face)
-                if result[0]:
-                    found.append({
-                        ATTR_NAME: name
-                    })
+            if not self._names:
+                break
+
+            distances = face_recognition.face_distance(
+                self._encodings, unknown_face)
+            closest = distances.argmin()
+
+            if distances[closest] <= self._tolerance:
+                found.append({
+                    ATTR_NAME: self._names[closest]
+                })
 
         self.process_faces(found, len(unknowns))
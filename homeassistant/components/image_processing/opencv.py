@@ -11,8 +11,8 @@ import requests
 import voluptuous as vol
 
 from homeassistant.components.image_processing import (
-    CONF_ENTITY_ID, CONF_NAME, CONF_SOURCE, PLATFORM_SCHEMA,
-    ImageProcessingEntity)
+    CONF_ENTITY_ID, CONF_FRAME_CHANGE_THRESHOLD, CONF_NAME, CONF_SOURCE,
+    PLATFORM_SCHEMA, ImageProcessingEntity)
 from homeassistant.core import split_entity_id
 import homeassistant.helpers.config_validation as cv
 
@@ -54,7 +54,9 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
                     vol.Schema((int, int))
             })
         )
-    }
+    },
+    vol.Optional(CONF_FRAME_CHANGE_THRESHOLD, default=0):
+        vol.All(vol.Coerce(float), vol.Range(min=0, max=255)),
 })
 
 
@@ -103,7 +105,8 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
     for camera in config[CONF_SOURCE]:
         entities.append(OpenCVImageProcessor(
             hass, camera[CONF_ENTITY_ID], camera.get(CONF_NAME),
-            config[CONF_CLASSIFIER]))
+            config[CONF_CLASSIFIER],
+            config.get(CONF_FRAME_CHANGE_THRESHOLD, 0)))
 
     add_devices(entities)
 
@@ -111,7 +114,8 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
 class OpenCVImageProcessor(ImageProcessingEntity):
     """Representation of an OpenCV image processor."""
 
-    def __init__(self, hass, camera_entity, name, classifiers):
+    def __init__(self, hass, camera_entity, name, classifiers,
+                 frame_change_threshold=0):
         """Initialize the OpenCV entity."""
         self.hass = hass
         self._camera_entity = camera_entity
@@ -120,6 +124,7 @@ class OpenCVImageProcessor(ImageProcessingEntity):
         else:
             self._name = "OpenCV {0}".format(split_entity_id(camera_entity)[1])
         self._classifiers = classifiers
+        self._frame_change_threshold = frame_change_threshold
         self._matches = {}
         self._total_matches = 0
         self._last_image = None
@@ -147,14 +152,27 @@ class OpenCVImageProcessor(ImageProcessingEntity):
             ATTR_TOTAL_MATCHES: self._total_matches
         }
 
+    @property
+    def frame_change_threshold(self):
+        """Return how much a frame has to change to be processed."""
+        return self._frame_change_threshold
+
+    @property
+    def batch_key(self):
+        """Return a key shared by processors with the same classifiers."""
+        return (__name__, id(self._classifiers))
+
     def process_image(self, image):
         """Process the image."""
+        self.process_images([(self, image)])
+
+    def process_images(self, frames):
+        """Process the images of processors sharing classifiers."""
         import cv2  # pylint: disable=import-error
         import numpy
 
-        cv_image = cv2.imdecode(
-            numpy.asarray(bytearray(image)), cv2.IMREAD_UNCHANGED)
-
+        # Load every classifier once for all frames
+        cascades = []
         for name, classifier in self._classifiers.items():
             scale = DEFAULT_SCALE
             neighbors = DEFAULT_NEIGHBORS
@@ -167,22 +185,29 @@ class OpenCVImageProcessor(ImageProcessingEntity):
             else:
                 path = classifier
 
-            cascade = cv2.CascadeClassifier(path)
-
-            detections = cascade.detectMultiScale(
-                cv_image,
-                scaleFactor=scale,
-                minNeighbors=neighbors,
-                minSize=min_size)
-            matches = {}
-            total_matches = 0
-            regions = []
-            # pylint: disable=invalid-name
-            for (x, y, w, h) in detections:
-                regions.append((int(x), int(y), int(w), int(h)))
-                total_matches += 1
-
-            matches[name] = regions
-
-        self._matches = matches
-        self._total_matches = total_matches
+            cascades.append((name, cv2.CascadeClassifier(path), scale,
+                             neighbors, min_size))
+
+        for processor, image in frames:
+            cv_image = cv2.imdecode(
+                numpy.asarray(bytearray(image)), cv2.IMREAD_UNCHANGED)
+
+            for name, cascade, scale, neighbors, min_size in cascades:
+                detections = cascade.detectMultiScale(
+                    cv_image,
+                    scaleFactor=scale,
+                    minNeighbors=neighbors,
+                    minSize=min_size)
+                matches = {}
+                total_matches = 0
+                regions = []
+                # pylint: disable=invalid-name
+                for (x, y, w, h) in detections:
+                    regions.append((int(x), int(y), int(w), int(h)))
+                    total_matches += 1
+
+                matches[name] = regions
+
+            # pylint: disable=protected-access
+            processor._matches = matches
+            processor._total_matches = total_matches
@@ -5,15 +5,17 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/mqtt/
 """
 import asyncio
+from collections import deque
 from itertools import groupby
-from typing import Optional, Any, Union, Callable, List, cast  # noqa: F401
+from typing import (  # noqa: F401
+    Optional, Any, Union, Callable, Dict, List, Tuple, cast)
 from operator import attrgetter
 import logging
 import os
 import socket
 import time
 import ssl
-import re
+import threading
 import requests.certs
 import attr
 
@@ -89,6 +91,9 @@ ATTR_RETAIN = CONF_RETAIN
 
 MAX_RECONNECT_WAIT = 300  # seconds
 
+# Most received messages handled per event loop callback
+MAX_MESSAGES_PER_BATCH = 100
+
 
 def valid_topic(value: Any) -> str:
     """Validate that this is a valid topic name/filter."""
@@ -471,6 +476,82 @@ class Subscription:
     encoding = attr.ib(type=str, default='utf-8')
 
 
+class _TopicNode:
+    """Level of the subscription tree."""
+
+    __slots__ = ['children', 'subscriptions']
+
+    def __init__(self) -> None:
+        """Initialize the topic level."""
+        self.children = {}  # type: Dict[str, _TopicNode]
+        self.subscriptions = []  # type: List[Subscription]
+
+
+class SubscriptionTree:
+    """Index of subscriptions by topic level.
+
+    Matching a topic only visits the levels of the tree that can match it,
+    following the literal level and the + and # wildcards.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the subscription tree."""
+        self._root = _TopicNode()
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription to the tree."""
+        node = self._root
+        for level in subscription.topic.split('/'):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        node.subscriptions.append(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription from the tree."""
+        path = [(None, self._root)]  # type: List[Tuple[Any, _TopicNode]]
+        for level in subscription.topic.split('/'):
+            path.append((level, path[-1][1].children[level]))
+        path[-1][1].subscriptions.remove(subscription)
+
+        # Prune levels that no longer lead to a subscription
+        for idx in range(len(path) - 1, 0, -1):
+            level, node = path[idx]
+            if node.subscriptions or node.children:
+                break
+            del path[idx - 1][1].children[level]
+
+    def matches(self, topic: str) -> List[Subscription]:
+        """Return the subscriptions matching a topic."""
+        levels = topic.split('/')
+        depth = len(levels)
+        matches = []  # type: List[Subscription]
+        stack = [(self._root, 0)]
+
+        while stack:
+            node, idx = stack.pop()
+            children = node.children
+
+            # A # matches the parent level and everything below it
+            wildcard = children.get('#')
+            if wildcard is not None:
+                matches.extend(wildcard.subscriptions)
+
+            if idx == depth:
+                matches.extend(node.subscriptions)
+                continue
+
+            child = children.get('+')
+            if child is not None:
+                stack.append((child, idx + 1))
+            child = children.get(levels[idx])
+            if child is not None:
+                stack.append((child, idx + 1))
+
+        return matches
+
+
 @attr.s(slots=True, frozen=True)
 class Message:
     """MQTT Message."""
@@ -499,9 +580,17 @@ class MQTT:
         self.port = port
         self.keepalive = keepalive
         self.subscriptions = []  # type: List[Subscription]
+        self._subscription_tree = SubscriptionTree()
         self.birth_message = birth_message
         self._mqttc = None  # type: mqtt.Client
         self._paho_lock = asyncio.Lock(loop=hass.loop)
+        # Received messages waiting to be handled in the event loop
+        self._pending_messages = deque()  # type: deque
+        self._pending_messages_lock = threading.Lock()
+        self._handle_messages_scheduled = False
+        # Messages waiting to be handed to paho in one executor job
+        self._pending_publishes = []  # type: List[Tuple[Message, Any]]
+        self._publish_task = None  # type: Optional[asyncio.Future]
 
         if protocol == PROTOCOL_31:
             proto = mqtt.MQTTv31  # type: int
@@ -537,9 +626,57 @@ class MQTT:
 
         This method must be run in the event loop and returns a coroutine.
         """
-        async with self._paho_lock:
-            await self.hass.async_add_job(
-                self._mqttc.publish, topic, payload, qos, retain)
+        future = self.hass.loop.create_future()
+        self._pending_publishes.append(
+            (Message(topic, payload, qos, retain), future))
+
+        if self._publish_task is None:
+            self._publish_task = self.hass.async_add_job(
+                self._async_publish_pending())
+
+        await future
+
+    async def _async_publish_pending(self) -> None:
+        """Publish the queued messages until none are left.
+
+        This method is a coroutine.
+        """
+        try:
+            while self._pending_publishes:
+                pending = self._pending_publishes
+                self._pending_publishes = []
+                try:
+                    async with self._paho_lock:
+                        errors = await self.hass.async_add_job(
+                            self._publish_messages,
+                            [message for message, _ in pending])
+                except Exception as err:  # pylint: disable=broad-except
+                    errors = [err] * len(pending)
+
+                for (message, future), error in zip(pending, errors):
+                    if future.done():
+                        # The caller stopped waiting, nobody sees the error
+                        if error is not None:
+                            _LOGGER.error("Error publishing to %s: %s",
+                                          message.topic, error)
+                    elif error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+        finally:
+            self._publish_task = None
+
+    def _publish_messages(self, messages: List[Message]) -> List[Any]:
+        """Hand messages to paho and return the error of each message."""
+        errors = []
+        for message in messages:
+            try:
+                self._mqttc.publish(*attr.astuple(message))
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(err)
+            else:
+                errors.append(None)
+        return errors
 
     async def async_connect(self) -> bool:
         """Connect to the host. Does process messages yet.
@@ -587,6 +724,7 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        self._subscription_tree.add(subscription)
 
         await self._async_perform_subscription(topic, qos)
 
@@ -596,6 +734,7 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
+            self._subscription_tree.remove(subscription)
 
             if any(other.topic == topic for other in self.subscriptions):
                 # Other subscriptions on topic remaining - don't unsubscribe.
@@ -653,17 +792,45 @@ class MQTT:
                 self.async_publish(*attr.astuple(self.birth_message)))
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Messages are buffered and handed to the event loop in batches, so a
+        flood of messages wakes up the loop once instead of per message.
+        """
+        with self._pending_messages_lock:
+            self._pending_messages.append(msg)
+            if self._handle_messages_scheduled:
+                return
+            self._handle_messages_scheduled = True
+
+        self.hass.loop.call_soon_threadsafe(self._mqtt_handle_messages)
+
+    @callback
+    def _mqtt_handle_messages(self) -> None:
+        """Handle a batch of received messages."""
+        pending = self._pending_messages
+
+        with self._pending_messages_lock:
+            messages = [pending.popleft() for _ in range(
+                min(len(pending), MAX_MESSAGES_PER_BATCH))]
+            if pending:
+                # Let other work run before handling the next batch
+                self.hass.loop.call_soon(self._mqtt_handle_messages)
+            else:
+                self._handle_messages_scheduled = False
+
+        for msg in messages:
+            # A failing subscriber must not drop the rest of the batch
+            try:
+                self._mqtt_handle_message(msg)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling message on %s", msg.topic)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
         _LOGGER.debug("Received message on %s: %s", msg.topic, msg.payload)
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
-
+        for subscription in self._subscription_tree.matches(msg.topic):
             payload = msg.payload  # type: SubscribePayloadType
             if subscription.encoding is not None:
                 try:
@@ -712,27 +879,6 @@ def _raise_on_error(result_code: int) -> None:
             'Error talking to MQTT: {}'.format(mqtt.error_string(result_code)))
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    reg_ex_parts = []  # type: List[str]
-    suffix = ""
-    if subscription.endswith('#'):
-        subscription = subscription[:-2]
-        suffix = "(.*)"
-    sub_parts = subscription.split('/')
-    for sub_part in sub_parts:
-        if sub_part == "+":
-            reg_ex_parts.append(r"([^\/]+)")
-        else:
-            reg_ex_parts.append(re.escape(sub_part))
-
-    reg_ex = "^" + (r'\/'.join(reg_ex_parts)) + suffix + "$"
-
-    reg = re.compile(reg_ex)
-
-    return reg.match(topic) is not None
-
-
 class MqttAvailability(Entity):
     """Mixin used for platforms that report availability."""
 
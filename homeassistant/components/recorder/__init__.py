@@ -8,7 +8,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/recorder/
 """
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
@@ -31,7 +31,7 @@ from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 from homeassistant.loader import bind_hass
 
-from . import migration, purge
+from . import migration, purge, statistics
 from .const import DATA_INSTANCE
 from .util import session_scope
 
@@ -58,9 +58,18 @@ CONF_DB_URL = 'db_url'
 CONF_PURGE_KEEP_DAYS = 'purge_keep_days'
 CONF_PURGE_INTERVAL = 'purge_interval'
 CONF_EVENT_TYPES = 'event_types'
+CONF_COMMIT_INTERVAL = 'commit_interval'
+CONF_COMMIT_MAX_EVENTS = 'commit_max_events'
+CONF_STATISTICS = 'statistics'
 
 CONNECT_RETRY_WAIT = 3
 
+DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_COMMIT_MAX_EVENTS = 1000
+
+# Number of recently written attribute sets remembered by the writer
+ATTRIBUTES_CACHE_SIZE = 2048
+
 FILTER_SCHEMA = vol.Schema({
     vol.Optional(CONF_EXCLUDE, default={}): vol.Schema({
         vol.Optional(CONF_DOMAINS): vol.All(cv.ensure_list, [cv.string]),
@@ -80,6 +89,12 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PURGE_INTERVAL, default=1):
             vol.All(vol.Coerce(int), vol.Range(min=0)),
         vol.Optional(CONF_DB_URL): cv.string,
+        vol.Optional(CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_COMMIT_MAX_EVENTS,
+                     default=DEFAULT_COMMIT_MAX_EVENTS):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_STATISTICS, default=False): cv.boolean,
     })
 }, extra=vol.ALLOW_EXTRA)
 
@@ -116,6 +131,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config.get(DOMAIN, {})
     keep_days = conf.get(CONF_PURGE_KEEP_DAYS)
     purge_interval = conf.get(CONF_PURGE_INTERVAL)
+    commit_interval = conf.get(CONF_COMMIT_INTERVAL, DEFAULT_COMMIT_INTERVAL)
+    commit_max_events = conf.get(
+        CONF_COMMIT_MAX_EVENTS, DEFAULT_COMMIT_MAX_EVENTS)
+    compile_statistics = conf.get(CONF_STATISTICS, False)
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -126,7 +145,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     exclude = conf.get(CONF_EXCLUDE, {})
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass=hass, keep_days=keep_days, purge_interval=purge_interval,
-        uri=db_url, include=include, exclude=exclude)
+        uri=db_url, include=include, exclude=exclude,
+        commit_interval=commit_interval, commit_max_events=commit_max_events,
+        compile_statistics=compile_statistics)
     instance.async_initialize()
     instance.start()
 
@@ -142,6 +163,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 
 PurgeTask = namedtuple('PurgeTask', ['keep_days', 'repack'])
+StatisticsTask = namedtuple('StatisticsTask', ['start'])
 
 
 class Recorder(threading.Thread):
@@ -149,13 +171,19 @@ class Recorder(threading.Thread):
 
     def __init__(self, hass: HomeAssistant, keep_days: int,
                  purge_interval: int, uri: str,
-                 include: Dict, exclude: Dict) -> None:
+                 include: Dict, exclude: Dict,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 commit_max_events: int = DEFAULT_COMMIT_MAX_EVENTS,
+                 compile_statistics: bool = False) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name='Recorder')
 
         self.hass = hass
         self.keep_days = keep_days
         self.purge_interval = purge_interval
+        self.commit_interval = commit_interval
+        self.commit_max_events = commit_max_events
+        self.compile_statistics = compile_statistics
         self.queue = queue.Queue()  # type: Any
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
@@ -167,6 +195,7 @@ class Recorder(threading.Thread):
             include.get(CONF_DOMAINS, []), include.get(CONF_ENTITIES, []),
             exclude.get(CONF_DOMAINS, []), exclude.get(CONF_ENTITIES, []))
         self.exclude_t = exclude.get(CONF_EVENT_TYPES, [])
+        self._attributes_ids = OrderedDict()  # type: OrderedDict
 
         self.get_session = None
 
@@ -184,9 +213,8 @@ class Recorder(threading.Thread):
 
     def run(self):
         """Start processing events to save."""
-        from .models import States, Events
+        from .models import Events
         from homeassistant.components import persistent_notification
-        from sqlalchemy import exc
 
         tries = 1
         connected = False
@@ -276,59 +304,195 @@ class Recorder(threading.Thread):
 
             self.hass.helpers.event.track_point_in_time(async_purge, run)
 
+        # Compile statistics of the previous hour shortly after every hour
+        if self.compile_statistics:
+            @callback
+            def async_compile_statistics(now):
+                """Queue compiling the statistics of the previous hour."""
+                start = now.replace(minute=0, second=0, microsecond=0)
+                self.queue.put(StatisticsTask(start - statistics.PERIOD))
+
+            self.hass.add_job(async_compile_statistics, dt_util.utcnow())
+            self.hass.helpers.event.track_utc_time_change(
+                async_compile_statistics, minute=5, second=0)
+
+        # Special queue items (shutdown, tasks) taken off the queue while
+        # collecting a batch are carried over to the next iteration.
+        carry = []
+
         while True:
-            event = self.queue.get()
+            item = carry.pop() if carry else self.queue.get()
 
-            if event is None:
+            if item is None:
                 self._close_run()
                 self._close_connection()
                 self.queue.task_done()
                 return
-            elif isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
+            elif isinstance(item, PurgeTask):
+                purge.purge_old_data(self, item.keep_days, item.repack)
+                self._attributes_ids.clear()
                 self.queue.task_done()
                 continue
-            elif event.event_type == EVENT_TIME_CHANGED:
+            elif isinstance(item, StatisticsTask):
+                statistics.compile_statistics(self, item.start)
                 self.queue.task_done()
                 continue
-            elif event.event_type in self.exclude_t:
+
+            taken = 1
+            batch = [item] if self._should_record(item) else []
+            deadline = time.monotonic() + self.commit_interval
+
+            while len(batch) < self.commit_max_events:
+                try:
+                    if self.commit_interval:
+                        timeout = deadline - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        item = self.queue.get(timeout=timeout)
+                    else:
+                        item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is None or isinstance(
+                        item, (PurgeTask, StatisticsTask)):
+                    carry.append(item)
+                    break
+
+                taken += 1
+                if self._should_record(item):
+                    batch.append(item)
+
+            if batch:
+                self._commit_events(batch)
+
+            for _ in range(taken):
                 self.queue.task_done()
-                continue
 
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                if not self.entity_filter(entity_id):
-                    self.queue.task_done()
+    def _should_record(self, event):
+        """Return if an event should be written to the database."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            return False
+        elif event.event_type in self.exclude_t:
+            return False
+
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        return entity_id is None or self.entity_filter(entity_id)
+
+    def _commit_events(self, events):
+        """Write a batch of events and their states in one transaction.
+
+        If the batch can't be written for another reason than the database
+        connection, its events are written one at a time, so only the events
+        that fail are lost.
+        """
+        from sqlalchemy import exc
+
+        tries = 1
+        updated = False
+        while not updated and tries <= 10:
+            if tries != 1:
+                time.sleep(CONNECT_RETRY_WAIT)
+            try:
+                new_ids = self._write_events(events)
+                updated = True
+
+            except exc.OperationalError as err:
+                _LOGGER.error("Error in database connectivity: %s. "
+                              "(retrying in %s seconds)", err,
+                              CONNECT_RETRY_WAIT)
+                tries += 1
+
+            except (exc.SQLAlchemyError, TypeError, ValueError) as err:
+                # The transaction was rolled back by session_scope
+                if len(events) == 1:
+                    _LOGGER.error("Error saving event %s: %s", events[0], err)
+                    return
+
+                _LOGGER.error("Error saving a batch of %d events: %s. "
+                              "Saving them one at a time", len(events), err)
+                for event in events:
+                    self._commit_events([event])
+                return
+
+        if not updated:
+            _LOGGER.error("Error in database update. Could not save "
+                          "after %d tries. Giving up", tries)
+            return
+
+        # Only remember new attribute rows once they are committed
+        for shared_attrs, attributes_id in new_ids.items():
+            self._cache_attributes_id(shared_attrs, attributes_id)
+
+    def _write_events(self, events):
+        """Write events and their states, return new attribute row ids."""
+        from .models import States, Events, StateAttributes
+
+        pending = {}
+        with session_scope(session=self.get_session()) as session:
+            dbevents = [Events.from_event(event) for event in events]
+            session.add_all(dbevents)
+
+            linked = []
+            for event, dbevent in zip(events, dbevents):
+                if event.event_type != EVENT_STATE_CHANGED:
                     continue
+                dbstate = States.from_event(event)
+                shared_attrs = dbstate.attributes
+                dbstate.attributes = None
+
+                attributes_id = None
+                if shared_attrs not in pending:
+                    attributes_id = self._lookup_attributes_id(
+                        session, shared_attrs)
+                    if attributes_id is None:
+                        pending[shared_attrs] = StateAttributes(
+                            hash=StateAttributes.hash_shared_attrs(
+                                shared_attrs),
+                            shared_attrs=shared_attrs)
+                        session.add(pending[shared_attrs])
+                linked.append((dbstate, dbevent, shared_attrs, attributes_id))
 
-            tries = 1
-            updated = False
-            while not updated and tries <= 10:
-                if tries != 1:
-                    time.sleep(CONNECT_RETRY_WAIT)
-                try:
-                    with session_scope(session=self.get_session()) as session:
-                        dbevent = Events.from_event(event)
-                        session.add(dbevent)
-                        session.flush()
-
-                        if event.event_type == EVENT_STATE_CHANGED:
-                            dbstate = States.from_event(event)
-                            dbstate.event_id = dbevent.event_id
-                            session.add(dbstate)
-                    updated = True
-
-                except exc.OperationalError as err:
-                    _LOGGER.error("Error in database connectivity: %s. "
-                                  "(retrying in %s seconds)", err,
-                                  CONNECT_RETRY_WAIT)
-                    tries += 1
-
-            if not updated:
-                _LOGGER.error("Error in database update. Could not save "
-                              "after %d tries. Giving up", tries)
-
-            self.queue.task_done()
+            session.flush()
+
+            for dbstate, dbevent, shared_attrs, attributes_id in linked:
+                dbstate.event_id = dbevent.event_id
+                if attributes_id is None:
+                    attributes_id = pending[shared_attrs].attributes_id
+                dbstate.attributes_id = attributes_id
+            session.bulk_save_objects(
+                [dbstate for dbstate, _, _, _ in linked])
+            new_ids = {shared_attrs: dbattrs.attributes_id
+                       for shared_attrs, dbattrs in pending.items()}
+
+        return new_ids
+
+    def _lookup_attributes_id(self, session, shared_attrs):
+        """Return the id of stored attributes or None if not stored yet."""
+        from .models import StateAttributes
+
+        attributes_id = self._attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._attributes_ids.move_to_end(shared_attrs)
+            return attributes_id
+
+        query = session.query(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).filter(StateAttributes.hash ==
+                 StateAttributes.hash_shared_attrs(shared_attrs))
+
+        for attributes_id, stored_attrs in query:
+            if stored_attrs == shared_attrs:
+                self._cache_attributes_id(shared_attrs, attributes_id)
+                return attributes_id
+
+        return None
+
+    def _cache_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of stored attributes."""
+        self._attributes_ids[shared_attrs] = attributes_id
+        if len(self._attributes_ids) > ATTRIBUTES_CACHE_SIZE:
+            self._attributes_ids.popitem(last=False)
 
     @callback
     def event_listener(self, event):
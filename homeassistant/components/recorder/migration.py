@@ -114,6 +114,30 @@ def _drop_index(engine, table_name, index_name):
                         "critical operation.", index_name, table_name)
 
 
+def _add_columns(engine, table_name, columns_def):
+    """Add columns to a table."""
+    from sqlalchemy import text
+
+    _LOGGER.info("Adding columns %s to table %s. Note: this can take several "
+                 "minutes on large databases and slow computers. Please "
+                 "be patient!", ', '.join(
+                     column.split(' ')[0] for column in columns_def),
+                 table_name)
+
+    for column_def in columns_def:
+        engine.execute(text("ALTER TABLE {table} ADD COLUMN {column}".format(
+            table=table_name, column=column_def)))
+
+
+def _create_table(engine, table_name):
+    """Create a table from the models if it does not exist yet."""
+    from . import models
+
+    table = models.Base.metadata.tables[table_name]
+    _LOGGER.debug("Creating table %s", table_name)
+    table.create(engine, checkfirst=True)
+
+
 def _apply_update(engine, new_version, old_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -146,6 +170,14 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 5:
         # Create supporting index for States.event_id foreign key
         _create_index(engine, "states", "ix_states_event_id")
+    elif new_version == 6:
+        # Deduplicate state attributes into their own table. Existing rows
+        # keep their inline attributes.
+        _create_table(engine, "state_attributes")
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 7:
+        _create_table(engine, "statistics")
     else:
         raise ValueError("No schema migration defined for version {}"
                          .format(new_version))
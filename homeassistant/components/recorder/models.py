@@ -1,12 +1,14 @@
 """Models for SQLAlchemy."""
+import hashlib
 import json
 from datetime import datetime
 import logging
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text,
-    distinct)
+    BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer,
+    String, Text, distinct)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import Event, EventOrigin, State, split_entity_id
@@ -16,7 +18,7 @@ from homeassistant.remote import JSONEncoder
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 5
+SCHEMA_VERSION = 7
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,6 +57,21 @@ class Events(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):   # type: ignore
+    """Attributes shared by state rows, stored once per distinct value."""
+
+    __tablename__ = 'state_attributes'
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return a stable 63 bit hash of serialized attributes."""
+        digest = hashlib.sha1(shared_attrs.encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big') >> 1
+
+
 class States(Base):   # type: ignore
     """State change history."""
 
@@ -63,8 +80,11 @@ class States(Base):   # type: ignore
     domain = Column(String(64))
     entity_id = Column(String(255))
     state = Column(String(255))
+    # Only set for rows written before attributes were deduplicated
     attributes = Column(Text)
     event_id = Column(Integer, ForeignKey('events.event_id'), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey('state_attributes.attributes_id'), index=True)
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow,
                           index=True)
@@ -76,6 +96,8 @@ class States(Base):   # type: ignore
         Index(
             'ix_states_entity_id_last_updated', 'entity_id', 'last_updated'),)
 
+    state_attributes = relationship(StateAttributes, lazy='joined')
+
     @staticmethod
     def from_event(event):
         """Create object from a state_changed event."""
@@ -103,10 +125,15 @@ class States(Base):   # type: ignore
 
     def to_native(self):
         """Convert to an HA state object."""
+        if self.state_attributes is not None:
+            attributes = self.state_attributes.shared_attrs
+        else:
+            attributes = self.attributes
+
         try:
             return State(
                 self.entity_id, self.state,
-                json.loads(self.attributes),
+                json.loads(attributes),
                 _process_timestamp(self.last_changed),
                 _process_timestamp(self.last_updated)
             )
@@ -116,6 +143,24 @@ class States(Base):   # type: ignore
             return None
 
 
+class Statistics(Base):   # type: ignore
+    """Hourly aggregates of numeric states."""
+
+    __tablename__ = 'statistics'
+    statistic_id = Column(Integer, primary_key=True)
+    domain = Column(String(64))
+    entity_id = Column(String(255))
+    start = Column(DateTime(timezone=True))
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    count = Column(Integer)
+    created = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_statistics_start_entity_id', 'start', 'entity_id'),)
+
+
 class RecorderRuns(Base):   # type: ignore
     """Representation of recorder run."""
 
@@ -11,7 +11,7 @@ _LOGGER = logging.getLogger(__name__)
 
 def purge_old_data(instance, purge_days, repack):
     """Purge events and states older than purge_days ago."""
-    from .models import States, Events
+    from .models import States, Events, StateAttributes
     from sqlalchemy import func
 
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
@@ -58,6 +58,16 @@ def purge_old_data(instance, purge_days, repack):
         deleted_rows = delete_events.delete(synchronize_session=False)
         _LOGGER.debug("Deleted %s events", deleted_rows)
 
+        # Attributes are shared between states, only remove the ones that
+        # are no longer referenced by any remaining state.
+        used_attributes = session.query(States.attributes_id) \
+            .filter(States.attributes_id.isnot(None))
+
+        deleted_rows = session.query(StateAttributes) \
+            .filter(~StateAttributes.attributes_id.in_(used_attributes)) \
+            .delete(synchronize_session=False)
+        _LOGGER.debug("Deleted %s state attributes", deleted_rows)
+
     # Execute sqlite vacuum command to free up space on disk
     _LOGGER.debug("DB engine driver: %s", instance.engine.driver)
     if repack and instance.engine.driver == 'pysqlite':
@@ -0,0 +1,77 @@
+"""Compile hourly statistics of numeric states."""
+from datetime import timedelta
+import logging
+import math
+
+from homeassistant.core import split_entity_id
+
+from .util import session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+PERIOD = timedelta(hours=1)
+
+
+def aggregate_values(rows):
+    """Aggregate (entity_id, state) rows ordered by entity.
+
+    Yields (entity_id, mean, min, max, count) for every entity that has
+    finite numeric states. Other states are ignored.
+    """
+    entity_id = None
+    total = count = 0
+    low = high = None
+
+    for row_entity_id, state in rows:
+        if row_entity_id != entity_id:
+            if count:
+                yield entity_id, total / count, low, high, count
+            entity_id = row_entity_id
+            total = count = 0
+            low = high = None
+
+        try:
+            value = float(state)
+        except (TypeError, ValueError):
+            continue
+        if not math.isfinite(value):
+            continue
+
+        total += value
+        count += 1
+        low = value if low is None else min(low, value)
+        high = value if high is None else max(high, value)
+
+    if count:
+        yield entity_id, total / count, low, high, count
+
+
+def compile_statistics(instance, start):
+    """Compile statistics for the hour starting at start.
+
+    Hours that were already compiled are skipped.
+    """
+    from .models import States, Statistics
+
+    end = start + PERIOD
+
+    with session_scope(session=instance.get_session()) as session:
+        if session.query(Statistics.statistic_id).filter(
+                Statistics.start == start).first() is not None:
+            _LOGGER.debug("Statistics for %s already compiled", start)
+            return
+
+        query = session.query(States.entity_id, States.state).filter(
+            (States.last_updated >= start) &
+            (States.last_updated < end)
+        ).order_by(States.entity_id)
+
+        rows = [
+            Statistics(domain=split_entity_id(entity_id)[0],
+                       entity_id=entity_id, start=start, mean=mean,
+                       min=low, max=high, count=count)
+            for entity_id, mean, low, high, count in aggregate_values(query)]
+        session.bulk_save_objects(rows)
+
+    _LOGGER.debug("Compiled statistics for %d entities for %s",
+                  len(rows), start)
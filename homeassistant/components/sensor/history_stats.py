@@ -7,6 +7,7 @@ https://home-assistant.io/components/sensor.history_stats/
 import datetime
 import logging
 import math
+import threading
 
 import voluptuous as vol
 
@@ -17,6 +18,7 @@ from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     CONF_NAME, CONF_ENTITY_ID, CONF_STATE, CONF_TYPE,
     EVENT_HOMEASSISTANT_START)
+from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import track_state_change
@@ -109,15 +111,30 @@ class HistoryStatsSensor(Entity):
         self.value = None
         self.count = None
 
+        # Changes of the tracked entity as (timestamp, is measured state),
+        # loaded from the history once and then kept up to date
+        self._lock = threading.Lock()
+        self._changes = []
+        self._initial_state = False
+        self._loaded_start = None
+        self._covered_until = None
+        self._tracking_since = dt_util.utcnow().timestamp()
+
         def force_refresh(*args):
             """Force the component to refresh."""
             self.schedule_update_ha_state(True)
 
+        @callback
+        def async_state_changed(entity_id, old_state, new_state):
+            """Record the change and refresh the sensor."""
+            self.record_change(new_state)
+            self.async_schedule_update_ha_state(True)
+
         # Update value when home assistant starts
         hass.bus.listen_once(EVENT_HOMEASSISTANT_START, force_refresh)
 
         # Update value when tracked entity changes its state
-        track_state_change(hass, entity_id, force_refresh)
+        track_state_change(hass, entity_id, async_state_changed)
 
     @property
     def name(self):
@@ -195,25 +212,29 @@ class HistoryStatsSensor(Entity):
             # Don't compute anything as the value cannot have changed
             return
 
-        # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id))
+        with self._lock:
+            loaded = (self._loaded_start is not None and
+                      self._loaded_start <= start.timestamp() and
+                      end.timestamp() <= self._covered_until)
 
-        if self._entity_id not in history_list.keys():
+        # Only query the history if the period moved back or past the
+        # changes that are known
+        if not loaded and not self.load_history(start, end):
             return
 
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = (last_state is not None and
-                      last_state == self._entity_state)
+        with self._lock:
+            self._evict_changes(start.timestamp())
+            changes = list(self._changes)
+            last_state = self._initial_state
+
         last_time = start_timestamp
         elapsed = 0
         count = 0
 
         # Make calculations
-        for item in history_list.get(self._entity_id):
-            current_state = item.state == self._entity_state
-            current_time = item.last_changed.timestamp()
+        for current_time, current_state in changes:
+            if current_time >= end.timestamp():
+                break
 
             if last_state:
                 elapsed += current_time - last_time
@@ -234,6 +255,78 @@ class HistoryStatsSensor(Entity):
         # Save counter
         self.count = count
 
+    def load_history(self, start, end):
+        """Load the changes between start and end from the history.
+
+        Returns False if the history has no changes of the entity.
+        """
+        history_list = history.state_changes_during_period(
+            self.hass, start, end, str(self._entity_id))
+
+        if self._entity_id not in history_list.keys():
+            return False
+
+        # Get the first state
+        last_state = history.get_state(self.hass, start, self._entity_id)
+        changes = [(item.last_changed.timestamp(),
+                    item.state == self._entity_state)
+                   for item in history_list.get(self._entity_id)]
+        last_loaded = changes[-1][0] if changes else start.timestamp()
+
+        with self._lock:
+            self._initial_state = (last_state is not None and
+                                   last_state == self._entity_state)
+
+            # Keep the changes seen while the history was queried
+            self._changes = changes + [
+                change for change in self._changes
+                if change[0] > last_loaded]
+            self._loaded_start = start.timestamp()
+
+            # Changes seen since tracking started complete the history if
+            # it reaches that far
+            if end.timestamp() >= self._tracking_since:
+                self._covered_until = math.inf
+            else:
+                self._covered_until = end.timestamp()
+
+        return True
+
+    def record_change(self, new_state):
+        """Record a change of the tracked entity."""
+        if new_state is None:
+            change = (dt_util.utcnow().timestamp(), False)
+        elif new_state.last_changed == new_state.last_updated:
+            change = (new_state.last_changed.timestamp(),
+                      new_state.state == self._entity_state)
+        else:
+            # Only the attributes changed
+            return
+
+        with self._lock:
+            self._changes.append(change)
+
+    def _evict_changes(self, start_timestamp):
+        """Drop the changes before the start of the period.
+
+        The state at the start becomes the initial state, like the history
+        reports it. Must be called with the lock held.
+        """
+        if self._loaded_start is None or \
+                start_timestamp <= self._loaded_start:
+            return
+
+        index = 0
+        while index < len(self._changes) and \
+                self._changes[index][0] < start_timestamp:
+            index += 1
+
+        if index:
+            self._initial_state = self._changes[index - 1][1]
+            del self._changes[:index]
+
+        self._loaded_start = start_timestamp
+
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
         start = None
@@ -17,11 +17,12 @@ from homeassistant.const import (
     ATTR_FRIENDLY_NAME, ATTR_UNIT_OF_MEASUREMENT, CONF_VALUE_TEMPLATE,
     CONF_ICON_TEMPLATE, CONF_ENTITY_PICTURE_TEMPLATE, ATTR_ENTITY_ID,
     CONF_SENSORS, EVENT_HOMEASSISTANT_START, CONF_FRIENDLY_NAME_TEMPLATE,
-    MATCH_ALL, CONF_DEVICE_CLASS)
+    CONF_DEVICE_CLASS)
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_render_info, async_track_state_change)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -56,28 +57,14 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
         unit_of_measurement = device_config.get(ATTR_UNIT_OF_MEASUREMENT)
         device_class = device_config.get(CONF_DEVICE_CLASS)
 
-        entity_ids = set()
-        manual_entity_ids = device_config.get(ATTR_ENTITY_ID)
+        # Without configured entities the sensor tracks the states its
+        # templates access while rendering
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         for template in (state_template, icon_template,
                          entity_picture_template, friendly_name_template):
-            if template is None:
-                continue
-            template.hass = hass
-
-            if entity_ids == MATCH_ALL or manual_entity_ids is not None:
-                continue
-
-            template_entity_ids = template.extract_entities()
-            if template_entity_ids == MATCH_ALL:
-                entity_ids = MATCH_ALL
-            else:
-                entity_ids |= set(template_entity_ids)
-
-        if manual_entity_ids is not None:
-            entity_ids = manual_entity_ids
-        elif entity_ids != MATCH_ALL:
-            entity_ids = list(entity_ids)
+            if template is not None:
+                template.hass = hass
 
         sensors.append(
             SensorTemplate(
@@ -121,26 +108,45 @@ class SensorTemplate(Entity):
         self._entity_picture = None
         self._entities = entity_ids
         self._device_class = device_class
+        self._dependencies = None
+        self._async_remove_listener = None
 
     @asyncio.coroutine
     def async_added_to_hass(self):
         """Register callbacks."""
-        @callback
-        def template_sensor_state_listener(entity, old_state, new_state):
-            """Handle device state changes."""
-            self.async_schedule_update_ha_state(True)
-
         @callback
         def template_sensor_startup(event):
             """Update template on startup."""
-            async_track_state_change(
-                self.hass, self._entities, template_sensor_state_listener)
+            if self._entities is not None:
+                async_track_state_change(
+                    self.hass, self._entities,
+                    self._async_template_sensor_state_listener)
 
             self.async_schedule_update_ha_state(True)
 
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, template_sensor_startup)
 
+    @callback
+    def _async_template_sensor_state_listener(self, entity, old_state,
+                                              new_state):
+        """Handle device state changes."""
+        self.async_schedule_update_ha_state(True)
+
+    @callback
+    def _async_track_render_info(self, render_infos):
+        """Listen to the states the templates accessed while rendering."""
+        dependencies = [info.dependencies for info in render_infos]
+        if dependencies == self._dependencies:
+            return
+
+        if self._async_remove_listener is not None:
+            self._async_remove_listener()
+        self._dependencies = dependencies
+        self._async_remove_listener = async_track_render_info(
+            self.hass, render_infos,
+            self._async_template_sensor_state_listener)
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -179,8 +185,18 @@ class SensorTemplate(Entity):
     @asyncio.coroutine
     def async_update(self):
         """Update the state from the template."""
+        render_infos = []
+
+        def render(template):
+            """Render a template and remember what it accessed."""
+            render_info = template.async_render_to_info()
+            render_infos.append(render_info)
+            if render_info.exception is not None:
+                raise render_info.exception
+            return render_info.result
+
         try:
-            self._state = self._template.async_render()
+            self._state = render(self._template)
         except TemplateError as ex:
             if ex.args and ex.args[0].startswith(
                     "UndefinedError: 'None' has no attribute"):
@@ -199,7 +215,7 @@ class SensorTemplate(Entity):
                 continue
 
             try:
-                setattr(self, property_name, template.async_render())
+                setattr(self, property_name, render(template))
             except TemplateError as ex:
                 friendly_property_name = property_name[1:].replace('_', ' ')
                 if ex.args and ex.args[0].startswith(
@@ -216,3 +232,6 @@ class SensorTemplate(Entity):
                 except AttributeError:
                     _LOGGER.error('Could not render %s template %s: %s',
                                   friendly_property_name, self._name, ex)
+
+        if self._entities is None:
+            self._async_track_render_info(render_infos)
@@ -170,9 +170,9 @@ class WazeTravelTime(Entity):
 
     def _resolve_zone(self, friendly_name):
         """Get a lat/long from a zones friendly_name."""
-        states = self.hass.states.all()
+        states = self.hass.states.all('zone')
         for state in states:
-            if state.domain == 'zone' and state.name == friendly_name:
+            if state.name == friendly_name:
                 return _get_location_from_attributes(state)
 
         return friendly_name
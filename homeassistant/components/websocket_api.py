@@ -60,6 +60,9 @@ _LOGGER = logging.getLogger(__name__)
 
 JSON_DUMP = partial(json.dumps, cls=JSONEncoder)
 
+# The last event forwarded to subscribers and its JSON representation
+DATA_EVENT_JSON = 'websocket_api_event_json'
+
 AUTH_MESSAGE_SCHEMA = vol.Schema({
     vol.Required('type'): TYPE_AUTH,
     vol.Exclusive('api_password', 'auth'): str,
@@ -156,6 +159,27 @@ def event_message(iden, event):
     }
 
 
+def cached_event_message(hass, iden, event):
+    """Return an event message serialized to JSON.
+
+    The event is serialized once and shared by all subscriptions, only the
+    message id is added per subscription.
+    """
+    return '{{"id": {}, "type": "{}", "event": {}}}'.format(
+        JSON_DUMP(iden), TYPE_EVENT, _event_json(hass, event))
+
+
+def _event_json(hass, event):
+    """Return the JSON representation of an event, serializing it once."""
+    cache = hass.data.get(DATA_EVENT_JSON)
+
+    if cache is None or cache[0] is not event:
+        cache = hass.data[DATA_EVENT_JSON] = (
+            event, JSON_DUMP(event.as_dict()))
+
+    return cache[1]
+
+
 def error_message(iden, code, message):
     """Return an error result message."""
     return {
@@ -280,7 +304,10 @@ class ActiveConnection:
                     break
                 self.debug("Sending", message)
                 try:
-                    await self.wsock.send_json(message, dumps=JSON_DUMP)
+                    if isinstance(message, str):
+                        await self.wsock.send_str(message)
+                    else:
+                        await self.wsock.send_json(message, dumps=JSON_DUMP)
                 except TypeError as err:
                     _LOGGER.error('Unable to serialize to JSON: %s\n%s',
                                   err, message)
@@ -470,12 +497,19 @@ def handle_subscribe_events(hass, connection, msg):
 
     Async friendly.
     """
-    async def forward_events(event):
+    @callback
+    def forward_events(event):
         """Forward events to websocket."""
         if event.event_type == EVENT_TIME_CHANGED:
             return
 
-        connection.send_message_outside(event_message(msg['id'], event))
+        try:
+            message = cached_event_message(hass, msg['id'], event)
+        except TypeError as err:
+            _LOGGER.error('Unable to serialize to JSON: %s\n%s', err, event)
+            return
+
+        connection.send_message_outside(message)
 
     connection.event_listeners[msg['id']] = hass.bus.async_listen(
         msg['event_type'], forward_events)
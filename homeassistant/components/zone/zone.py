@@ -1,6 +1,9 @@
 """Component entity and functionality."""
+import math
 
-from homeassistant.const import ATTR_HIDDEN, ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.const import (
+    ATTR_HIDDEN, ATTR_LATITUDE, ATTR_LONGITUDE, EVENT_STATE_CHANGED)
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.loader import bind_hass
 from homeassistant.util.async_ import run_callback_threadsafe
@@ -11,8 +14,19 @@ from .const import DOMAIN
 ATTR_PASSIVE = 'passive'
 ATTR_RADIUS = 'radius'
 
+DATA_ZONE_INDEX = 'zone_index'
+
 STATE = 'zoning'
 
+# Size of the cells of the zone index in degrees
+CELL_SIZE = 0.1
+CELL_COLUMNS = int(360 / CELL_SIZE)
+# Zones and searches covering more cells are not looked up in the index
+MAX_CELLS = 100
+# Less than the length of a degree latitude anywhere on earth, so areas
+# are never underestimated
+METERS_PER_DEGREE = 110000
+
 
 @bind_hass
 def active_zone(hass, latitude, longitude, radius=0):
@@ -29,8 +43,8 @@ def async_active_zone(hass, latitude, longitude, radius=0):
     This method must be run in the event loop.
     """
     # Sort entity IDs so that we are deterministic if equal distance to 2 zones
-    zones = (hass.states.get(entity_id) for entity_id
-             in sorted(hass.states.async_entity_ids(DOMAIN)))
+    zones = sorted(_async_get_index(hass).candidates(
+        latitude, longitude, radius), key=lambda state: state.entity_id)
 
     min_dist = None
     closest = None
@@ -56,6 +70,146 @@ def async_active_zone(hass, latitude, longitude, radius=0):
     return closest
 
 
+@callback
+def _async_get_index(hass):
+    """Return the zone index, keeping it up to date with zone states."""
+    index = hass.data.get(DATA_ZONE_INDEX)
+
+    if index is not None:
+        return index
+
+    index = hass.data[DATA_ZONE_INDEX] = ZoneIndex()
+
+    for state in hass.states.async_all(DOMAIN):
+        index.update(state.entity_id, state)
+
+    @callback
+    def zone_changed(event):
+        """Update the index when a zone changes."""
+        entity_id = event.data['entity_id']
+
+        if entity_id.startswith(DOMAIN + '.'):
+            index.update(entity_id, event.data.get('new_state'))
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, zone_changed)
+    return index
+
+
+def _bounds(latitude, radius):
+    """Return how far a circle reaches in degrees latitude and longitude.
+
+    Returns None if the circle comes close to a pole.
+    """
+    delta_lat = (max(radius, 0) + 1) / METERS_PER_DEGREE
+    max_lat = abs(latitude) + delta_lat
+
+    if not max_lat < 89:
+        return None
+
+    return delta_lat, delta_lat / math.cos(math.radians(max_lat))
+
+
+def _cells(latitude, longitude, radius):
+    """Return the index cells covering a circle.
+
+    Returns None if the circle covers too many cells or isn't valid.
+    """
+    try:
+        bounds = _bounds(latitude, radius)
+
+        if bounds is None:
+            return None
+
+        delta_lat, delta_lon = bounds
+        rows = range(math.floor((latitude - delta_lat) / CELL_SIZE),
+                     math.floor((latitude + delta_lat) / CELL_SIZE) + 1)
+        columns = range(math.floor((longitude - delta_lon) / CELL_SIZE),
+                        math.floor((longitude + delta_lon) / CELL_SIZE) + 1)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+    if len(rows) * len(columns) > MAX_CELLS:
+        return None
+
+    return [(row, column % CELL_COLUMNS)
+            for row in rows for column in columns]
+
+
+class ZoneIndex:
+    """Grid of the areas zones cover, to find the zones near a point."""
+
+    def __init__(self):
+        """Initialize the zone index."""
+        self._zones = {}
+        self._grid = {}
+        # Zones that can't be put on the grid are always candidates
+        self._unindexed = set()
+
+    def update(self, entity_id, state):
+        """Add, update or remove a zone."""
+        self.remove(entity_id)
+
+        if state is None or state.attributes.get(ATTR_PASSIVE):
+            return
+
+        try:
+            cells = _cells(state.attributes[ATTR_LATITUDE],
+                           state.attributes[ATTR_LONGITUDE],
+                           state.attributes[ATTR_RADIUS])
+        except KeyError:
+            cells = None
+
+        self._zones[entity_id] = (state, cells)
+
+        if cells is None:
+            self._unindexed.add(entity_id)
+            return
+
+        for cell in cells:
+            self._grid.setdefault(cell, set()).add(entity_id)
+
+    def remove(self, entity_id):
+        """Remove a zone."""
+        _, cells = self._zones.pop(entity_id, (None, None))
+        self._unindexed.discard(entity_id)
+
+        for cell in cells or ():
+            entity_ids = self._grid[cell]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._grid[cell]
+
+    def candidates(self, latitude, longitude, radius=0):
+        """Return the zones that a circle could be in."""
+        cells = _cells(latitude, longitude, radius)
+
+        if cells is None:
+            return [state for state, _ in self._zones.values()]
+
+        entity_ids = set()
+        for cell in cells:
+            entity_ids.update(self._grid.get(cell, ()))
+
+        result = [self._zones[entity_id][0] for entity_id in self._unindexed]
+
+        for entity_id in entity_ids:
+            state = self._zones[entity_id][0]
+            zone_lat = state.attributes[ATTR_LATITUDE]
+            bounds = _bounds(zone_lat, state.attributes[ATTR_RADIUS] + radius)
+
+            # Skip zones that are too far away without calculating the
+            # exact distance
+            if bounds is not None and (
+                    abs(latitude - zone_lat) > bounds[0] or
+                    abs((longitude - state.attributes[ATTR_LONGITUDE] + 180)
+                        % 360 - 180) > bounds[1]):
+                continue
+
+            result.append(state)
+
+        return result
+
+
 def in_zone(zone, latitude, longitude, radius=0):
     """Test if given latitude, longitude is in given zone.
 
@@ -397,6 +397,7 @@ URL_API_EVENTS_EVENT = '/api/events/{}'
 URL_API_SERVICES = '/api/services'
 URL_API_SERVICES_SERVICE = '/api/services/{}/{}'
 URL_API_COMPONENTS = '/api/components'
+URL_API_COMPONENTS_TIMING = '/api/components/timing'
 URL_API_ERROR_LOG = '/api/error_log'
 URL_API_LOG_OUT = '/api/log_out'
 URL_API_TEMPLATE = '/api/template'
@@ -6,8 +6,12 @@ of entities and react to changes.
 """
 # pylint: disable=unused-import
 import asyncio
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
+import datetime
 import enum
+import functools
+import heapq
 import logging
 import os
 import pathlib
@@ -18,7 +22,7 @@ from time import monotonic
 
 from types import MappingProxyType
 from typing import (  # NOQA
-    Optional, Any, Callable, List, TypeVar, Dict, Coroutine, Set,
+    Optional, Any, Callable, List, TypeVar, Dict, Coroutine, Set, Tuple,
     TYPE_CHECKING)
 
 from async_timeout import timeout
@@ -90,6 +94,27 @@ def is_callback(func: Callable[..., Any]) -> bool:
     return getattr(func, '_hass_callback', False) is True
 
 
+class JobType(enum.Enum):
+    """Represent how a job should be run."""
+
+    callback = 'CALLBACK'
+    coroutinefunction = 'COROUTINEFUNCTION'
+    executor = 'EXECUTOR'
+
+
+def get_job_type(target: Callable[..., Any]) -> JobType:
+    """Determine how a callable should be run."""
+    if is_callback(target):
+        return JobType.callback
+    if asyncio.iscoroutinefunction(target):
+        return JobType.coroutinefunction
+    return JobType.executor
+
+
+# A listener together with how it should be called
+ListenerJob = Tuple[Callable, JobType]
+
+
 @callback
 def async_loop_exception_handler(loop, context):
     """Handle all exception inside the core loop."""
@@ -138,6 +163,11 @@ class HomeAssistant:
         self.bus = EventBus(self)
         self.services = ServiceRegistry(self)
         self.states = StateMachine(self.bus, self.loop)
+        self.scheduler = Scheduler(self.loop)
+        # Time changed events run the jobs scheduled until their time, also
+        # when they are not fired by the timer
+        self.bus.async_listen(
+            EVENT_TIME_CHANGED, self.scheduler.async_time_changed)
         self.config = Config()  # type: Config
         self.components = loader.Components(self)
         self.helpers = loader.Helpers(self)
@@ -397,7 +427,10 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners = {}  # type: Dict[str, List[Callable]]
+        # Event type -> list of (listener, job type) in subscribe order
+        self._listeners = {}  # type: Dict[str, List[ListenerJob]]
+        # Event type -> listeners to call, including MATCH_ALL listeners
+        self._dispatch = {}  # type: Dict[str, Tuple[ListenerJob, ...]]
         self._hass = hass
 
     @callback
@@ -428,24 +461,57 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
+        dispatch = self._dispatch.get(event_type)
 
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if (match_all_listeners is not None and
-                event_type != EVENT_HOMEASSISTANT_CLOSE):
-            listeners = match_all_listeners + listeners
+        if dispatch is None:
+            dispatch = self._async_build_dispatch(event_type)
 
         event = Event(event_type, event_data, origin)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.info("Bus:Handling %s", event)
 
-        if not listeners:
+        if not dispatch:
             return
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        hass = self._hass
+
+        for func, job_type in dispatch:
+            if job_type is JobType.callback:
+                try:
+                    func(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error running listener %s", func)
+            elif job_type is JobType.coroutinefunction:
+                hass.async_create_task(func(event))
+            else:
+                hass.async_add_executor_job(func, event)
+
+    @callback
+    def _async_build_dispatch(self, event_type):
+        """Build and cache the listeners to call for an event type.
+
+        This method must be run in the event loop.
+        """
+        listeners = self._listeners.get(event_type, [])
+
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        match_all_listeners = self._listeners.get(MATCH_ALL)
+        if (match_all_listeners is not None and
+                event_type != EVENT_HOMEASSISTANT_CLOSE):
+            listeners = match_all_listeners + listeners
+
+        dispatch = tuple(listeners)
+        self._dispatch[event_type] = dispatch
+        return dispatch
+
+    @callback
+    def _async_invalidate_dispatch(self, event_type):
+        """Drop cached dispatch tuples affected by a listener change."""
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(event_type, None)
 
     def listen(self, event_type, listener):
         """Listen for all events or events of a specific type.
@@ -472,10 +538,14 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        job = (listener, get_job_type(listener))
+
         if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
+            self._listeners[event_type].append(job)
         else:
-            self._listeners[event_type] = [listener]
+            self._listeners[event_type] = [job]
+
+        self._async_invalidate_dispatch(event_type)
 
         def remove_listener():
             """Remove the listener."""
@@ -536,15 +606,20 @@ class EventBus:
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            listeners = self._listeners[event_type]
+            listeners.remove(next(
+                job for job in listeners if job[0] == listener))
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
                 self._listeners.pop(event_type)
-        except (KeyError, ValueError):
+        except (KeyError, StopIteration):
             # KeyError is key event_type listener did not exist
-            # ValueError if listener did not exist within event_type
+            # StopIteration if listener did not exist within event_type
             _LOGGER.warning("Unable to remove unknown listener %s", listener)
+            return
+
+        self._async_invalidate_dispatch(event_type)
 
 
 class State:
@@ -557,8 +632,8 @@ class State:
     last_updated: last time this object was updated.
     """
 
-    __slots__ = ['entity_id', 'state', 'attributes',
-                 'last_changed', 'last_updated']
+    __slots__ = ['entity_id', 'domain', 'object_id', 'state', 'attributes',
+                 '_last_changed', '_last_updated', '_as_dict']
 
     def __init__(self, entity_id, state, attributes=None, last_changed=None,
                  last_updated=None):
@@ -576,20 +651,34 @@ class State:
                 "State max length is 255 characters.").format(entity_id))
 
         self.entity_id = entity_id.lower()
+        self.domain, self.object_id = split_entity_id(self.entity_id)
         self.state = state
         self.attributes = MappingProxyType(attributes or {})
-        self.last_updated = last_updated or dt_util.utcnow()
-        self.last_changed = last_changed or self.last_updated
+        self._last_updated = last_updated or dt_util.utcnow()
+        self._last_changed = last_changed or self._last_updated
+        self._as_dict = None  # type: Optional[MappingProxyType]
 
     @property
-    def domain(self):
-        """Domain of this state."""
-        return split_entity_id(self.entity_id)[0]
+    def last_changed(self):
+        """Return the last time the state was changed."""
+        return self._last_changed
+
+    @last_changed.setter
+    def last_changed(self, value):
+        """Set the last time the state was changed."""
+        self._last_changed = value
+        self._as_dict = None
 
     @property
-    def object_id(self):
-        """Object id of this state."""
-        return split_entity_id(self.entity_id)[1]
+    def last_updated(self):
+        """Return the last time the state was updated."""
+        return self._last_updated
+
+    @last_updated.setter
+    def last_updated(self, value):
+        """Set the last time the state was updated."""
+        self._last_updated = value
+        self._as_dict = None
 
     @property
     def name(self):
@@ -605,12 +694,18 @@ class State:
 
         To be used for JSON serialization.
         Ensures: state == State.from_dict(state.as_dict())
+
+        The read-only mapping is built once and shared between callers. It is
+        built again after last_changed or last_updated are set.
         """
-        return {'entity_id': self.entity_id,
+        if self._as_dict is None:
+            self._as_dict = MappingProxyType({
+                'entity_id': self.entity_id,
                 'state': self.state,
-                'attributes': dict(self.attributes),
-                'last_changed': self.last_changed,
-                'last_updated': self.last_updated}
+                'attributes': self.attributes,
+                'last_changed': self._last_changed,
+                'last_updated': self._last_updated})
+        return self._as_dict
 
     @classmethod
     def from_dict(cls, json_dict):
@@ -660,6 +755,8 @@ class StateMachine:
     def __init__(self, bus, loop):
         """Initialize state machine."""
         self._states = {}  # type: Dict[str, State]
+        # Domain -> entity id -> state, in the order entities were added
+        self._domain_index = {}  # type: Dict[str, OrderedDict]
         self._bus = bus
         self._loop = loop
 
@@ -679,22 +776,28 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states.keys())
 
-        domain_filter = domain_filter.lower()
+        return list(self._domain_index.get(domain_filter.lower(), ()))
 
-        return [state.entity_id for state in self._states.values()
-                if state.domain == domain_filter]
-
-    def all(self):
+    def all(self, domain_filter=None):
         """Create a list of all states."""
-        return run_callback_threadsafe(self._loop, self.async_all).result()
+        return run_callback_threadsafe(
+            self._loop, self.async_all, domain_filter).result()
 
     @callback
-    def async_all(self):
+    def async_all(self, domain_filter=None):
         """Create a list of all states.
 
         This method must be run in the event loop.
         """
-        return list(self._states.values())
+        if domain_filter is None:
+            return list(self._states.values())
+
+        domain_states = self._domain_index.get(domain_filter.lower())
+
+        if domain_states is None:
+            return []
+
+        return list(domain_states.values())
 
     def get(self, entity_id):
         """Retrieve state of entity_id or None if not found.
@@ -733,6 +836,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
+
         self._bus.async_fire(EVENT_STATE_CHANGED, {
             'entity_id': entity_id,
             'old_state': old_state,
@@ -780,6 +888,10 @@ class StateMachine:
         last_changed = old_state.last_changed if same_state else None
         state = State(entity_id, new_state, attributes, last_changed)
         self._states[entity_id] = state
+        domain_states = self._domain_index.get(state.domain)
+        if domain_states is None:
+            domain_states = self._domain_index[state.domain] = OrderedDict()
+        domain_states[entity_id] = state
         self._bus.async_fire(EVENT_STATE_CHANGED, {
             'entity_id': entity_id,
             'old_state': old_state,
@@ -1055,6 +1167,243 @@ class ServiceRegistry:
             _LOGGER.exception('Error executing service %s', service_call)
 
 
+class Scheduler:
+    """Run callbacks at points in UTC time.
+
+    Pending callbacks are kept in a heap ordered by their point in time.
+    Once the timer is started, a single loop timer is armed for the earliest
+    one instead of every callback inspecting every time changed event. Time
+    changed events also run the callbacks due at their time.
+    """
+
+    # Compact the heap when more than this many entries are cancelled
+    _MIN_CANCELLED_COMPACT = 100
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Initialize the scheduler."""
+        self._loop = loop
+        # Entries are [point in time, sequence, target]. The target is set
+        # to None when the entry is cancelled or has run.
+        self._heap = []  # type: List[list]
+        self._sequence = 0
+        self._cancelled = 0
+        self._handle = None  # type: Optional[asyncio.Handle]
+        self._running = False
+        # Time patterns to reschedule if the time moves backwards
+        self._patterns = set()  # type: Set[_ScheduledPattern]
+        self._now = None  # type: Optional[datetime.datetime]
+
+    @callback
+    def async_schedule(self, point_in_time: datetime.datetime,
+                       target: Callable[[datetime.datetime], None]) \
+            -> Callable[[], None]:
+        """Schedule a callback to run at a point in UTC time.
+
+        The callback is called with the current UTC time. Returns a function
+        that cancels the callback.
+
+        This method must be run in the event loop.
+        """
+        self._sequence += 1
+        entry = [point_in_time, self._sequence, target]
+        heapq.heappush(self._heap, entry)
+
+        if self._running and self._heap[0] is entry:
+            self._async_arm()
+
+        @callback
+        def cancel():
+            """Cancel the scheduled callback."""
+            if entry[2] is None:
+                return
+
+            entry[2] = None
+            self._cancelled += 1
+
+            if (self._cancelled > self._MIN_CANCELLED_COMPACT and
+                    self._cancelled > len(self._heap) // 2):
+                self._heap = [item for item in self._heap
+                              if item[2] is not None]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+        return cancel
+
+    @callback
+    def async_schedule_pattern(
+            self, next_match: Callable[[datetime.datetime],
+                                       Optional[datetime.datetime]],
+            target: Callable[[datetime.datetime], None]) \
+            -> Callable[[], None]:
+        """Schedule a callback to run at every point in time of a pattern.
+
+        next_match is called with a point in UTC time in whole seconds and
+        returns the first point in time of the pattern at or after it, or
+        None. Like a time changed listener, the callback runs for every
+        matching time the scheduler runs at, also if the time moved back.
+        Returns a function that cancels the callback.
+
+        This method must be run in the event loop.
+        """
+        now = dt_util.utcnow()
+        pattern = _ScheduledPattern(next_match, target)
+        self._patterns.add(pattern)
+
+        if self._now is None or self._now < now:
+            self._now = now
+
+        start = now.replace(microsecond=0) + datetime.timedelta(seconds=1)
+        self._async_schedule_pattern(pattern, start)
+
+        @callback
+        def cancel():
+            """Cancel the scheduled pattern."""
+            self._patterns.discard(pattern)
+
+            if pattern.cancel is not None:
+                pattern.cancel()
+                pattern.cancel = None
+
+        return cancel
+
+    @callback
+    def async_time_changed(self, event: Event) -> None:
+        """Run the callbacks due at the time of a time changed event.
+
+        This method must be run in the event loop.
+        """
+        now = event.data[ATTR_NOW]
+
+        # Time patterns compared naive times as UTC
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=dt_util.UTC)
+
+        self.async_run_due(dt_util.as_utc(now))
+
+    @callback
+    def async_run_due(self, now: datetime.datetime) -> None:
+        """Run all callbacks scheduled at or before now.
+
+        Callbacks scheduled while running will wait for the next run, even
+        if they are already due.
+
+        This method must be run in the event loop.
+        """
+        # Time patterns run again for times they already passed
+        if self._now is not None and now < self._now:
+            start = now.replace(microsecond=0)
+
+            for pattern in self._patterns:
+                if pattern.cancel is not None:
+                    pattern.cancel()
+                self._async_schedule_pattern(pattern, start)
+
+        self._now = now
+        heap = self._heap
+        due = []
+
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap))
+
+        for entry in due:
+            target = entry[2]
+
+            if target is None:
+                continue
+
+            entry[2] = None
+
+            try:
+                target(now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running scheduled job %s", target)
+
+        if self._running and (due or self._handle is None):
+            self._async_arm()
+
+    @callback
+    def async_start(self) -> None:
+        """Start running callbacks when they are due.
+
+        This method must be run in the event loop.
+        """
+        self._running = True
+        self._async_arm()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop running callbacks when they are due.
+
+        This method must be run in the event loop.
+        """
+        self._running = False
+
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    @callback
+    def _async_schedule_pattern(self, pattern: '_ScheduledPattern',
+                                start: datetime.datetime) -> None:
+        """Schedule the first point in time of a pattern at or after start."""
+        match = pattern.next_match(start)
+        pattern.cancel = None if match is None else self.async_schedule(
+            match, functools.partial(self._async_run_pattern, pattern))
+
+    @callback
+    def _async_run_pattern(self, pattern: '_ScheduledPattern',
+                           now: datetime.datetime) -> None:
+        """Run a pattern callback if now matches and schedule the next run."""
+        second = now.replace(microsecond=0)
+        self._async_schedule_pattern(
+            pattern, second + datetime.timedelta(seconds=1))
+
+        # The scheduler can run later than the match, like for a time
+        # changed event that skipped it
+        if pattern.next_match(second) == second:
+            pattern.target(now)
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the loop timer for the earliest scheduled callback."""
+        heap = self._heap
+
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+            self._cancelled = max(self._cancelled - 1, 0)
+
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        if not heap:
+            return
+
+        delay = (heap[0][0] - dt_util.utcnow()).total_seconds()
+        self._handle = self._loop.call_at(
+            self._loop.time() + max(delay, 0), self._async_fire)
+
+    @callback
+    def _async_fire(self) -> None:
+        """Run due callbacks when the loop timer fires."""
+        self._handle = None
+        self.async_run_due(dt_util.utcnow())
+
+
+class _ScheduledPattern:
+    """A callback scheduled at every point in time of a pattern."""
+
+    __slots__ = ['next_match', 'target', 'cancel']
+
+    def __init__(self, next_match: Callable[[datetime.datetime],
+                                            Optional[datetime.datetime]],
+                 target: Callable[[datetime.datetime], None]) -> None:
+        """Initialize a scheduled pattern."""
+        self.next_match = next_match
+        self.target = target
+        self.cancel = None  # type: Optional[Callable[[], None]]
+
+
 class Config:
     """Configuration settings for Home Assistant."""
 
@@ -1152,8 +1501,8 @@ def _async_create_timer(hass):
         """Fire next time event."""
         nonlocal handle
 
-        hass.bus.async_fire(EVENT_TIME_CHANGED,
-                            {ATTR_NOW: dt_util.utcnow()})
+        now = dt_util.utcnow()
+        hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: now})
         nxt += 1
         slp_seconds = nxt - monotonic()
 
@@ -1169,8 +1518,10 @@ def _async_create_timer(hass):
         """Stop the timer."""
         if handle is not None:
             handle.cancel()
+        hass.scheduler.async_stop()
 
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, stop_timer)
 
     _LOGGER.info("Timer:starting")
+    hass.scheduler.async_start()
     fire_time_event(monotonic())
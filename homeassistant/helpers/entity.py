@@ -20,6 +20,9 @@ from homeassistant.util.async_ import run_callback_threadsafe
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
 
+# Number of coalesced scheduled state writes per entity id
+DATA_COALESCED_UPDATES = 'entity_coalesced_updates'
+
 
 def generate_entity_id(entity_id_format: str, name: Optional[str],
                        current_ids: Optional[List[str]] = None,
@@ -79,6 +82,14 @@ class Entity:
     # Process updates in parallel
     parallel_updates = None
 
+    # Coalesce scheduled state writes made within this many seconds into a
+    # single write. 0 coalesces the requests of one event loop iteration.
+    coalesce_updates = None  # type: Optional[float]
+
+    # Pending coalesced state write
+    _scheduled_update = None
+    _scheduled_refresh = False
+
     # Name in the entity registry
     registry_name = None
 
@@ -283,13 +294,49 @@ class Entity:
 
         That avoid executor dead looks.
         """
-        self.hass.add_job(self.async_update_ha_state(force_refresh))
+        if self.coalesce_updates is None:
+            self.hass.add_job(self.async_update_ha_state(force_refresh))
+        else:
+            self.hass.add_job(
+                self.async_schedule_update_ha_state, force_refresh)
 
     @callback
     def async_schedule_update_ha_state(self, force_refresh=False):
         """Schedule an update ha state change task."""
+        if self.coalesce_updates is None:
+            self.hass.async_add_job(self.async_update_ha_state(force_refresh))
+            return
+
+        self._scheduled_refresh = self._scheduled_refresh or force_refresh
+
+        if self._scheduled_update is not None:
+            coalesced = self.hass.data.setdefault(DATA_COALESCED_UPDATES, {})
+            coalesced[self.entity_id] = coalesced.get(self.entity_id, 0) + 1
+            return
+
+        if self.coalesce_updates > 0:
+            self._scheduled_update = self.hass.loop.call_later(
+                self.coalesce_updates, self._async_write_scheduled_update)
+        else:
+            self._scheduled_update = self.hass.loop.call_soon(
+                self._async_write_scheduled_update)
+
+    @callback
+    def _async_write_scheduled_update(self):
+        """Write the coalesced state update."""
+        force_refresh = self._scheduled_refresh
+        self._scheduled_update = None
+        self._scheduled_refresh = False
         self.hass.async_add_job(self.async_update_ha_state(force_refresh))
 
+    @callback
+    def async_cancel_scheduled_update(self):
+        """Cancel a pending coalesced state write."""
+        if self._scheduled_update is not None:
+            self._scheduled_update.cancel()
+            self._scheduled_update = None
+            self._scheduled_refresh = False
+
     @asyncio.coroutine
     def async_device_update(self, warning=True):
         """Process 'update' or 'async_update' from entity.
@@ -326,6 +373,8 @@ class Entity:
 
     async def async_remove(self):
         """Remove entity from Home Assistant."""
+        self.async_cancel_scheduled_update()
+
         if self.platform is not None:
             await self.platform.async_remove_entity(self.entity_id)
         else:
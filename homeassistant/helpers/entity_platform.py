@@ -360,6 +360,7 @@ class EntityPlatform:
     async def _async_remove_entity(self, entity_id):
         """Remove entity id from platform."""
         entity = self.entities.pop(entity_id)
+        entity.async_cancel_scheduled_update()
 
         if hasattr(entity, 'async_will_remove_from_hass'):
             await entity.async_will_remove_from_hass()
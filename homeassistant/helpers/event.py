@@ -1,15 +1,21 @@
 """Helpers for listening to events."""
 from datetime import timedelta
 import functools as ft
+import logging
 
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.sun import get_astral_event_next
-from ..core import HomeAssistant, callback
+from ..core import HomeAssistant, callback, split_entity_id
 from ..const import (
     ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
 from ..util import dt as dt_util
 from ..util.async_ import run_callback_threadsafe
 
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STATE_CHANGE_CALLBACKS = 'track_state_change_callbacks'
+DATA_STATE_CHANGE_LISTENER = 'track_state_change_listener'
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -63,10 +69,6 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
     @callback
     def state_change_listener(event):
         """Handle specific state changes."""
-        if entity_ids != MATCH_ALL and \
-           event.data.get('entity_id') not in entity_ids:
-            return
-
         old_state = event.data.get('old_state')
         if old_state is not None:
             old_state = old_state.state
@@ -80,18 +82,89 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
                                event.data.get('old_state'),
                                event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_listener)
+
+    return _async_track_entity_state_change(
+        hass, entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+def _async_track_entity_state_change(hass, entity_ids, listener):
+    """Call listener on state changes of the given entity ids.
+
+    All trackers share a single state changed listener on the bus that looks
+    up the listeners for the changed entity, so a state change only wakes up
+    the trackers interested in it.
+    """
+    entity_callbacks = hass.data.get(DATA_STATE_CHANGE_CALLBACKS)
+
+    if entity_callbacks is None:
+        entity_callbacks = hass.data[DATA_STATE_CHANGE_CALLBACKS] = {}
+
+    if DATA_STATE_CHANGE_LISTENER not in hass.data:
+        @callback
+        def state_change_dispatcher(event):
+            """Dispatch state changes by entity id."""
+            listeners = entity_callbacks.get(event.data.get('entity_id'))
+
+            if listeners is None:
+                return
+
+            for entity_listener in listeners:
+                try:
+                    entity_listener(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing state changed for %s",
+                        event.data.get('entity_id'))
+
+        hass.data[DATA_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_dispatcher)
+
+    # Listeners are stored as tuples that are replaced on every change so the
+    # dispatcher can iterate them while listeners are being removed.
+    entity_ids = frozenset(entity_ids)
+
+    for entity_id in entity_ids:
+        entity_callbacks[entity_id] = \
+            entity_callbacks.get(entity_id, ()) + (listener,)
+
+    @callback
+    def remove_listener():
+        """Remove state change listener."""
+        for entity_id in entity_ids:
+            listeners = entity_callbacks.get(entity_id, ())
+
+            if listener not in listeners:
+                continue
+
+            listeners = tuple(
+                item for item in listeners if item is not listener)
+
+            if listeners:
+                entity_callbacks[entity_id] = listeners
+            else:
+                entity_callbacks.pop(entity_id)
+
+        if not entity_callbacks and DATA_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(DATA_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
 @callback
 @bind_hass
 def async_track_template(hass, template, action, variables=None):
-    """Add a listener that track state changes with template condition."""
-    from . import condition
+    """Add a listener that track state changes with template condition.
 
+    The template is rendered to find out which states it uses. After every
+    render the listener is moved to the states that render accessed.
+    """
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
 
@@ -99,7 +172,15 @@ def async_track_template(hass, template, action, variables=None):
     def template_condition_listener(entity_id, from_s, to_s):
         """Check if condition is correct and run action."""
         nonlocal already_triggered
-        template_result = condition.async_template(hass, template, variables)
+        render_info = template.async_render_to_info(variables)
+        async_track_dependencies(render_info)
+
+        if render_info.exception is not None:
+            _LOGGER.error("Error during template condition: %s",
+                          render_info.exception)
+            template_result = False
+        else:
+            template_result = render_info.result.lower() == 'true'
 
         # Check to see if template returns true
         if template_result and not already_triggered:
@@ -108,14 +189,81 @@ def async_track_template(hass, template, action, variables=None):
         elif not template_result:
             already_triggered = False
 
-    return async_track_state_change(
-        hass, template.extract_entities(variables),
-        template_condition_listener)
+    dependencies = None
+    async_remove_listener = None
+
+    @callback
+    def async_track_dependencies(render_info):
+        """Listen to the states the template accessed."""
+        nonlocal dependencies, async_remove_listener
+        if render_info.dependencies == dependencies:
+            return
+
+        if async_remove_listener is not None:
+            async_remove_listener()
+        dependencies = render_info.dependencies
+        async_remove_listener = async_track_render_info(
+            hass, [render_info], template_condition_listener)
+
+    async_track_dependencies(template.async_render_to_info(variables))
+
+    @callback
+    def async_remove():
+        """Remove the listener."""
+        async_remove_listener()
+
+    return async_remove
 
 
 track_template = threaded_listener_factory(async_track_template)
 
 
+@callback
+@bind_hass
+def async_track_render_info(hass, render_infos, action):
+    """Track state changes of the states accessed by template renders.
+
+    render_infos is a list of RenderInfo returned by
+    Template.async_render_to_info. The action is called like a
+    async_track_state_change action.
+
+    Returns a function that can be called to remove the listener.
+    """
+    domains = set()
+    entity_ids = set()
+    for render_info in render_infos:
+        dependencies = render_info.dependencies
+        if dependencies == MATCH_ALL:
+            return async_track_state_change(hass, MATCH_ALL, action)
+        domains |= dependencies[0]
+        entity_ids |= dependencies[1]
+
+    remove_listeners = []
+
+    if entity_ids:
+        remove_listeners.append(
+            async_track_state_change(hass, entity_ids, action))
+
+    if domains:
+        @callback
+        def domain_state_listener(entity_id, old_state, new_state):
+            """Handle state changes within the tracked domains."""
+            if (entity_id not in entity_ids and
+                    split_entity_id(entity_id)[0] in domains):
+                hass.async_run_job(action, entity_id, old_state, new_state)
+
+        remove_listeners.append(async_track_state_change(
+            hass, MATCH_ALL, domain_state_listener))
+
+    @callback
+    def async_remove():
+        """Remove the listeners."""
+        for remove_listener in remove_listeners:
+            remove_listener()
+
+    return async_remove
+
+
 @callback
 @bind_hass
 def async_track_same_state(hass, period, action, async_check_same_func,
@@ -192,27 +340,11 @@ def async_track_point_in_utc_time(hass, action, point_in_time):
     point_in_time = dt_util.as_utc(point_in_time)
 
     @callback
-    def point_in_time_listener(event):
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, 'run'):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        point_in_time_listener.run = True
-        async_unsub()
-
+    def point_in_time_listener(now):
+        """Run action when the point in time is reached."""
         hass.async_run_job(action, now)
 
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                        point_in_time_listener)
-
-    return async_unsub
+    return hass.scheduler.async_schedule(point_in_time, point_in_time_listener)
 
 
 track_point_in_utc_time = threaded_listener_factory(
@@ -332,26 +464,48 @@ def async_track_utc_time_change(hass, action, year=None, month=None, day=None,
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
-    pmp = _process_time_match
-    year, month, day = pmp(year), pmp(month), pmp(day)
-    hour, minute, second = pmp(hour), pmp(minute), pmp(second)
+    utc_now = dt_util.utcnow()
+    years = None if year is None or year == MATCH_ALL else \
+        _process_time_values(year, range(1970, utc_now.year + 101))
+    months = _process_time_values(month, range(1, 13))
+    days = _process_time_values(day, range(1, 32))
+    hours = _process_time_values(hour, range(24))
+    minutes = _process_time_values(minute, range(60))
+    seconds = _process_time_values(second, range(60))
 
-    @callback
-    def pattern_time_change_listener(event):
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
+    def next_match(start):
+        """Return the first point in UTC time matching at or after start."""
+        if not local:
+            return dt_util.find_next_time_match(
+                start, seconds, minutes, hours, days, months, years)
+
+        start = dt_util.as_local(start).replace(tzinfo=None)
+
+        while True:
+            match = dt_util.find_next_time_match(
+                start, seconds, minutes, hours, days, months, years)
+
+            if match is None:
+                return None
 
+            utc_match = dt_util.as_utc(match)
+
+            # Skip wall clock times that do not exist because of DST
+            if dt_util.as_local(utc_match).replace(tzinfo=None) == match:
+                return utc_match
+
+            start = match + timedelta(seconds=1)
+
+    @callback
+    def pattern_time_change_listener(now):
+        """Run action for a matching point in time."""
         if local:
             now = dt_util.as_local(now)
 
-        # pylint: disable=too-many-boolean-expressions
-        if second(now.second) and minute(now.minute) and hour(now.hour) and \
-           day(now.day) and month(now.month) and year(now.year):
-
-            hass.async_run_job(action, now)
+        hass.async_run_job(action, now)
 
-    return hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                 pattern_time_change_listener)
+    return hass.scheduler.async_schedule_pattern(
+        next_match, pattern_time_change_listener)
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -381,6 +535,12 @@ def _process_state_match(parameter):
     return lambda state: state in parameter
 
 
+def _process_time_values(parameter, values):
+    """Return a sorted list of the values matching parameter."""
+    matcher = _process_time_match(parameter)
+    return [value for value in values if matcher(value)]
+
+
 def _process_time_match(parameter):
     """Wrap parameter in a tuple if it is not one and returns it."""
     if parameter is None or parameter == MATCH_ALL:
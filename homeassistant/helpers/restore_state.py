@@ -1,21 +1,31 @@
 """Support for restoring entity states on startup."""
 import asyncio
+import json
 import logging
 from datetime import timedelta
 
 import async_timeout
 
-from homeassistant.core import HomeAssistant, CoreState, callback
-from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.core import HomeAssistant, CoreState, State, callback
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP)
 from homeassistant.loader import bind_hass
 from homeassistant.components.history import get_states, last_recorder_run
 from homeassistant.components.recorder import (
     wait_connection_ready, DOMAIN as _RECORDER)
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.remote import JSONEncoder
 import homeassistant.util.dt as dt_util
 
 RECORDER_TIMEOUT = 10
 DATA_RESTORE_CACHE = 'restore_state_cache'
+DATA_RESTORE_STORE = 'restore_state_store'
+STORAGE_KEY = 'core.restore_state'
+STORAGE_VERSION = 1
+SNAPSHOT_INTERVAL = timedelta(minutes=15)
 _LOCK = 'restore_lock'
+_SNAPSHOT_LOADED = 'restore_snapshot_loaded'
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -49,20 +59,97 @@ def _load_restore_cache(hass: HomeAssistant):
     _LOGGER.debug('Created cache with %s', list(hass.data[DATA_RESTORE_CACHE]))
 
 
+def _encode_states(states):
+    """Convert states to JSON compatible dictionaries for the snapshot."""
+    encoded = []
+
+    for state in states:
+        try:
+            encoded.append(json.loads(json.dumps(state, cls=JSONEncoder)))
+        except (TypeError, ValueError):
+            _LOGGER.debug("Not storing %s in the snapshot", state.entity_id)
+
+    return encoded
+
+
+@callback
+def _async_get_store(hass: HomeAssistant) -> Store:
+    """Return the snapshot store and keep the snapshot up to date.
+
+    The snapshot of all states is written periodically and when Home
+    Assistant stops, so the next start can restore without querying the
+    recorder.
+    """
+    store = hass.data.get(DATA_RESTORE_STORE)
+
+    if store is not None:
+        return store
+
+    store = hass.data[DATA_RESTORE_STORE] = Store(
+        hass, STORAGE_VERSION, STORAGE_KEY)
+
+    async def async_dump_states(*_):
+        """Write a snapshot of the current states."""
+        data = await hass.async_add_executor_job(
+            _encode_states, hass.states.async_all())
+        await store.async_save(data)
+
+    async_track_time_interval(hass, async_dump_states, SNAPSHOT_INTERVAL)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_dump_states)
+
+    return store
+
+
+async def _async_load_snapshot(hass: HomeAssistant):
+    """Load the restore cache from the snapshot if there is one."""
+    data = await _async_get_store(hass).async_load()
+
+    if data is None:
+        return
+
+    @callback
+    def remove_cache(event):
+        """Remove the states cache."""
+        hass.data.pop(DATA_RESTORE_CACHE, None)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, remove_cache)
+
+    states = (State.from_dict(item) for item in data)
+    hass.data[DATA_RESTORE_CACHE] = {
+        state.entity_id: state for state in states if state is not None}
+    _LOGGER.debug('Created cache from snapshot with %s states',
+                  len(hass.data[DATA_RESTORE_CACHE]))
+
+
 @bind_hass
 async def async_get_last_state(hass, entity_id: str):
-    """Restore state."""
+    """Restore state.
+
+    States are restored from the snapshot written when Home Assistant last
+    stopped. Without a snapshot, they are queried from the last recorder run.
+    """
     if DATA_RESTORE_CACHE in hass.data:
         return hass.data[DATA_RESTORE_CACHE].get(entity_id)
 
-    if _RECORDER not in hass.config.components:
-        return None
-
     if hass.state not in (CoreState.starting, CoreState.not_running):
         _LOGGER.debug("Cache for %s can only be loaded during startup, not %s",
                       entity_id, hass.state)
         return None
 
+    if _LOCK not in hass.data:
+        hass.data[_LOCK] = asyncio.Lock(loop=hass.loop)
+
+    async with hass.data[_LOCK]:
+        if _SNAPSHOT_LOADED not in hass.data:
+            hass.data[_SNAPSHOT_LOADED] = True
+            await _async_load_snapshot(hass)
+
+    if DATA_RESTORE_CACHE in hass.data:
+        return hass.data[DATA_RESTORE_CACHE].get(entity_id)
+
+    if _RECORDER not in hass.config.components:
+        return None
+
     try:
         with async_timeout.timeout(RECORDER_TIMEOUT, loop=hass.loop):
             connected = await wait_connection_ready(hass)
@@ -72,9 +159,6 @@ async def async_get_last_state(hass, entity_id: str):
     if not connected:
         return None
 
-    if _LOCK not in hass.data:
-        hass.data[_LOCK] = asyncio.Lock(loop=hass.loop)
-
     async with hass.data[_LOCK]:
         if DATA_RESTORE_CACHE not in hass.data:
             await hass.async_add_job(
@@ -1,10 +1,12 @@
 """Template helper methods for rendering strings with Home Assistant data."""
 from datetime import datetime
+from functools import lru_cache, wraps
 import json
 import logging
 import math
 import random
 import re
+import threading
 
 import jinja2
 from jinja2 import contextfilter
@@ -26,6 +28,17 @@ _LOGGER = logging.getLogger(__name__)
 _SENTINEL = object()
 DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# The RenderInfo collecting state accesses of the current render, per thread
+_RENDER_INFO = threading.local()
+
+# Inputs other than states that a render can read, with a function returning
+# their current value
+_INPUTS = {
+    'location': lambda hass: (
+        hass.config.latitude, hass.config.longitude, hass.config.units),
+    'time_zone': lambda hass: dt_util.DEFAULT_TIME_ZONE,
+}
+
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
     r"(?:(?:states\.|(?:is_state|is_state_attr|state_attr|states)"
@@ -82,6 +95,94 @@ def extract_entities(template, variables=None):
     return MATCH_ALL
 
 
+class RenderInfo:
+    """Holds the result of a render and the states it accessed."""
+
+    def __init__(self, template):
+        """Initialize the render info."""
+        self.template = template
+        self.result = None
+        self.exception = None
+        self.all_states = False
+        self.domains = set()
+        self.entities = set()
+        self.inputs = set()
+        self.volatile = False
+
+    @property
+    def dependencies(self):
+        """Return the states the render depends on.
+
+        This is MATCH_ALL if the render failed or did not access any state,
+        for example a template that only uses now().
+        """
+        if (self.all_states or self.exception is not None or
+                not (self.domains or self.entities)):
+            return MATCH_ALL
+        return frozenset(self.domains), frozenset(self.entities)
+
+    def merge(self, other):
+        """Add the states and inputs accessed by another render."""
+        self.all_states = self.all_states or other.all_states
+        self.domains |= other.domains
+        self.entities |= other.entities
+        self.inputs |= other.inputs
+        self.volatile = self.volatile or other.volatile
+
+    def __repr__(self):
+        """Representation of the render info."""
+        return ("<RenderInfo {} all_states={} domains={} entities={} "
+                "inputs={} volatile={}>"
+                .format(self.template, self.all_states, self.domains,
+                        self.entities, self.inputs, self.volatile))
+
+
+def _collect_entity(entity_id):
+    """Record that a template accessed the state of an entity."""
+    render_info = getattr(_RENDER_INFO, 'current', None)
+    if render_info is not None and isinstance(entity_id, str):
+        render_info.entities.add(entity_id.lower())
+
+
+def _collect_domain(domain):
+    """Record that a template accessed all states of a domain."""
+    render_info = getattr(_RENDER_INFO, 'current', None)
+    if render_info is not None:
+        render_info.domains.add(domain)
+
+
+def _collect_all_states():
+    """Record that a template accessed all states."""
+    render_info = getattr(_RENDER_INFO, 'current', None)
+    if render_info is not None:
+        render_info.all_states = True
+
+
+def _collect_input(name):
+    """Record that a template read one of the inputs in _INPUTS."""
+    render_info = getattr(_RENDER_INFO, 'current', None)
+    if render_info is not None:
+        render_info.inputs.add(name)
+
+
+def _collect_volatile():
+    """Record that a template read a value that changes on every render."""
+    render_info = getattr(_RENDER_INFO, 'current', None)
+    if render_info is not None:
+        render_info.volatile = True
+
+
+def _volatile(func):
+    """Wrap a template function whose result changes on every call."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        """Record the call and run the function."""
+        _collect_volatile()
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -93,6 +194,7 @@ class Template:
         self.template = template
         self._compiled_code = None
         self._compiled = None
+        self._memo = None
         self.hass = hass
 
     def ensure_valid(self):
@@ -101,7 +203,7 @@ class Template:
             return
 
         try:
-            self._compiled_code = ENV.compile(self.template)
+            self._compiled_code = _compile(self.template)
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err)
 
@@ -128,10 +230,80 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
+        if kwargs:
+            try:
+                return self._compiled.render(kwargs).strip()
+            except jinja2.TemplateError as err:
+                raise TemplateError(err)
+
+        # Without variables the result only depends on the states and
+        # inputs the render read
+        memo = self._memo
+        if memo is not None:
+            states, inputs, result = memo
+            get_state = self.hass.states.get
+            if (all(get_state(entity_id) is state
+                    for entity_id, state in states) and
+                    all(_INPUTS[name](self.hass) == value
+                        for name, value in inputs)):
+                for entity_id, _ in states:
+                    _collect_entity(entity_id)
+                for name, _ in inputs:
+                    _collect_input(name)
+                return result
+
+        render_info = RenderInfo(self)
+        outer_render_info = getattr(_RENDER_INFO, 'current', None)
+        _RENDER_INFO.current = render_info
         try:
-            return self._compiled.render(kwargs).strip()
+            result = self._compiled.render(kwargs).strip()
         except jinja2.TemplateError as err:
             raise TemplateError(err)
+        finally:
+            _RENDER_INFO.current = outer_render_info
+            if outer_render_info is not None:
+                outer_render_info.merge(render_info)
+
+        if (render_info.entities and not render_info.domains and
+                not render_info.all_states and not render_info.volatile):
+            get_state = self.hass.states.get
+            self._memo = (
+                tuple((entity_id, get_state(entity_id))
+                      for entity_id in render_info.entities),
+                tuple((name, _INPUTS[name](self.hass))
+                      for name in render_info.inputs),
+                result)
+        else:
+            self._memo = None
+
+        return result
+
+    def async_render_to_info(self, variables=None, **kwargs):
+        """Render the template and collect the states it accessed.
+
+        Errors are stored on the returned RenderInfo instead of raised.
+
+        This method must be run in the event loop.
+        """
+        render_info = RenderInfo(self)
+
+        if self._compiled is None:
+            try:
+                self._ensure_compiled()
+            except TemplateError as ex:
+                render_info.exception = ex
+                return render_info
+
+        previous = getattr(_RENDER_INFO, 'current', None)
+        _RENDER_INFO.current = render_info
+        try:
+            render_info.result = self.async_render(variables, **kwargs)
+        except TemplateError as ex:
+            render_info.exception = ex
+        finally:
+            _RENDER_INFO.current = previous
+
+        return render_info
 
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
@@ -180,7 +352,7 @@ class Template:
         global_vars = ENV.make_globals({
             'closest': template_methods.closest,
             'distance': template_methods.distance,
-            'is_state': self.hass.states.is_state,
+            'is_state': template_methods.is_state,
             'is_state_attr': template_methods.is_state_attr,
             'state_attr': template_methods.state_attr,
             'states': AllStates(self.hass),
@@ -211,6 +383,7 @@ class AllStates:
 
     def __iter__(self):
         """Return all states."""
+        _collect_all_states()
         return iter(
             _wrap_state(state) for state in
             sorted(self._hass.states.async_all(),
@@ -218,10 +391,12 @@ class AllStates:
 
     def __len__(self):
         """Return number of states."""
+        _collect_all_states()
         return len(self._hass.states.async_entity_ids())
 
     def __call__(self, entity_id):
         """Return the states."""
+        _collect_entity(entity_id)
         state = self._hass.states.get(entity_id)
         return STATE_UNKNOWN if state is None else state.state
 
@@ -236,18 +411,21 @@ class DomainStates:
 
     def __getattr__(self, name):
         """Return the states."""
-        return _wrap_state(
-            self._hass.states.get('{}.{}'.format(self._domain, name)))
+        entity_id = '{}.{}'.format(self._domain, name)
+        _collect_entity(entity_id)
+        return _wrap_state(self._hass.states.get(entity_id))
 
     def __iter__(self):
         """Return the iteration over all the states."""
+        _collect_domain(self._domain)
         return iter(sorted(
-            (_wrap_state(state) for state in self._hass.states.async_all()
-             if state.domain == self._domain),
+            (_wrap_state(state)
+             for state in self._hass.states.async_all(self._domain)),
             key=lambda state: state.entity_id))
 
     def __len__(self):
         """Return number of states."""
+        _collect_domain(self._domain)
         return len(self._hass.states.async_entity_ids(self._domain))
 
 
@@ -281,6 +459,12 @@ class TemplateState(State):
         return '<template ' + rep[1:]
 
 
+@lru_cache(maxsize=1024)
+def _compile(source):
+    """Compile a template source, shared by all templates with that source."""
+    return ENV.compile(source)
+
+
 def _wrap_state(state):
     """Wrap a state."""
     return None if state is None else TemplateState(state)
@@ -308,6 +492,7 @@ class TemplateMethods:
           closest(states.zone.school, 'group.children')
         """
         if len(args) == 1:
+            _collect_input('location')
             latitude = self._hass.config.latitude
             longitude = self._hass.config.longitude
             entities = args[0]
@@ -351,7 +536,8 @@ class TemplateMethods:
 
             group = self._hass.components.group
 
-            states = [self._hass.states.get(entity_id) for entity_id
+            _collect_entity(gr_entity_id)
+            states = [self._get_state(entity_id) for entity_id
                       in group.expand_entity_ids([gr_entity_id])]
 
         return _wrap_state(loc_helper.closest(latitude, longitude, states))
@@ -398,12 +584,19 @@ class TemplateMethods:
 
             locations.append((latitude, longitude))
 
+        _collect_input('location')
+
         if len(locations) == 1:
             return self._hass.config.distance(*locations[0])
 
         return self._hass.config.units.length(
             loc_util.distance(*locations[0] + locations[1]), 'm')
 
+    def is_state(self, entity_id, state):
+        """Test if a state is a specific value."""
+        _collect_entity(entity_id)
+        return self._hass.states.is_state(entity_id, state)
+
     def is_state_attr(self, entity_id, name, value):
         """Test if a state is a specific attribute."""
         state_attr = self.state_attr(entity_id, name)
@@ -411,7 +604,7 @@ class TemplateMethods:
 
     def state_attr(self, entity_id, name):
         """Get a specific attribute from a state."""
-        state_obj = self._hass.states.get(entity_id)
+        state_obj = self._get_state(entity_id)
         if state_obj is not None:
             return state_obj.attributes.get(name)
         return None
@@ -421,9 +614,14 @@ class TemplateMethods:
         if isinstance(entity_id_or_state, State):
             return entity_id_or_state
         elif isinstance(entity_id_or_state, str):
-            return self._hass.states.get(entity_id_or_state)
+            return self._get_state(entity_id_or_state)
         return None
 
+    def _get_state(self, entity_id):
+        """Return the state of an entity and record the access."""
+        _collect_entity(entity_id)
+        return self._hass.states.get(entity_id)
+
 
 def forgiving_round(value, precision=0):
     """Round accepted strings."""
@@ -490,6 +688,7 @@ def timestamp_custom(value, date_format=DATE_STR_FORMAT, local=True):
         date = dt_util.utc_from_timestamp(value)
 
         if local:
+            _collect_input('time_zone')
             date = dt_util.as_local(date)
 
         return date.strftime(date_format)
@@ -500,6 +699,7 @@ def timestamp_custom(value, date_format=DATE_STR_FORMAT, local=True):
 
 def timestamp_local(value):
     """Filter to convert given timestamp to local date/time."""
+    _collect_input('time_zone')
     try:
         return dt_util.as_local(
             dt_util.utc_from_timestamp(value)).strftime(DATE_STR_FORMAT)
@@ -588,6 +788,7 @@ def random_every_time(context, values):
     Unlike Jinja's random filter,
     this is context-dependent to avoid caching the chosen value.
     """
+    _collect_volatile()
     return random.choice(values)
 
 
@@ -627,8 +828,9 @@ ENV.globals['pi'] = math.pi
 ENV.globals['tau'] = math.pi * 2
 ENV.globals['e'] = math.e
 ENV.globals['float'] = forgiving_float
-ENV.globals['now'] = dt_util.now
-ENV.globals['utcnow'] = dt_util.utcnow
+ENV.globals['now'] = _volatile(dt_util.now)
+ENV.globals['utcnow'] = _volatile(dt_util.utcnow)
 ENV.globals['as_timestamp'] = forgiving_as_timestamp
-ENV.globals['relative_time'] = dt_util.get_age
+ENV.globals['relative_time'] = _volatile(dt_util.get_age)
 ENV.globals['strptime'] = strptime
+ENV.globals['lipsum'] = _volatile(ENV.globals['lipsum'])
@@ -10,14 +10,16 @@ call get_component(hass, 'switch.your_platform'). In both cases the config
 directory is checked to see if it contains a user provided version. If not
 available it will check the built-in components and platforms.
 """
+import asyncio
 import functools as ft
 import importlib
 import logging
 import sys
+from timeit import default_timer as timer
 from types import ModuleType
 
 # pylint: disable=unused-import
-from typing import Optional, Set, TYPE_CHECKING  # NOQA
+from typing import Dict, Iterable, List, Optional, Set, TYPE_CHECKING  # NOQA
 
 from homeassistant.const import PLATFORM_FORMAT
 from homeassistant.util import OrderedSet
@@ -35,6 +37,7 @@ _LOGGER = logging.getLogger(__name__)
 
 
 DATA_KEY = 'components'
+DATA_IMPORT_TIME = 'component_import_time'
 PATH_CUSTOM_COMPONENTS = 'custom_components'
 PACKAGE_COMPONENTS = 'homeassistant.components'
 
@@ -71,19 +74,11 @@ def get_component(hass, comp_or_platform) -> Optional[ModuleType]:
     except KeyError:
         pass
 
-    cache = hass.data.get(DATA_KEY)
-    if cache is None:
-        # Only insert if it's not there (happens during tests)
-        if sys.path[0] != hass.config.config_dir:
-            sys.path.insert(0, hass.config.config_dir)
-        cache = hass.data[DATA_KEY] = {}
-
-    # First check custom, then built-in
-    potential_paths = ['custom_components.{}'.format(comp_or_platform),
-                       'homeassistant.components.{}'.format(comp_or_platform)]
+    cache = _get_cache(hass)
 
-    for index, path in enumerate(potential_paths):
+    for index, path in enumerate(_potential_paths(comp_or_platform)):
         try:
+            start = timer()
             module = importlib.import_module(path)
 
             # In Python 3 you can import files from directories that do not
@@ -101,6 +96,7 @@ def get_component(hass, comp_or_platform) -> Optional[ModuleType]:
             _LOGGER.info("Loaded %s from %s", comp_or_platform, path)
 
             cache[comp_or_platform] = module
+            _record_import_time(hass, comp_or_platform, timer() - start)
 
             if index == 0:
                 _LOGGER.warning(
@@ -134,6 +130,85 @@ def get_component(hass, comp_or_platform) -> Optional[ModuleType]:
     return None
 
 
+def _get_cache(hass) -> Dict[str, Optional[ModuleType]]:
+    """Return the cache of loaded components."""
+    cache = hass.data.get(DATA_KEY)
+    if cache is None:
+        # Only insert if it's not there (happens during tests)
+        if sys.path[0] != hass.config.config_dir:
+            sys.path.insert(0, hass.config.config_dir)
+        cache = hass.data[DATA_KEY] = {}
+    return cache  # type: ignore
+
+
+def _potential_paths(comp_or_platform: str) -> List[str]:
+    """Return the module paths to try for a component or platform."""
+    # First check custom, then built-in
+    return ['custom_components.{}'.format(comp_or_platform),
+            'homeassistant.components.{}'.format(comp_or_platform)]
+
+
+def _record_import_time(hass, comp_or_platform: str,
+                        duration: float) -> None:
+    """Record how long the first import of a module took."""
+    import_time = hass.data.get(DATA_IMPORT_TIME)
+    if import_time is None:
+        import_time = hass.data[DATA_IMPORT_TIME] = {}
+    import_time.setdefault(comp_or_platform, duration)
+
+
+def _import_module(hass, comp_or_platform: str) -> Optional[ModuleType]:
+    """Import a component or platform without loading it.
+
+    Errors are ignored, get_component will report them when the component
+    is loaded.
+    """
+    start = timer()
+
+    for path in _potential_paths(comp_or_platform):
+        try:
+            module = importlib.import_module(path)
+        except Exception:  # pylint: disable=broad-except
+            continue
+
+        # Skip namespaces, see get_component
+        if getattr(module, '__file__', None) is None:
+            continue
+
+        _record_import_time(hass, comp_or_platform, timer() - start)
+        return module
+
+    return None
+
+
+async def async_import_components(hass,  # type: HomeAssistant
+                                  comps_or_platforms: Iterable[str]) -> None:
+    """Import components, platforms and their dependencies.
+
+    Modules are imported concurrently in the executor, one level of
+    dependencies at a time, so slow imports don't block the event loop.
+    Components still have to be loaded with get_component.
+
+    This method is a coroutine.
+    """
+    cache = _get_cache(hass)
+    seen = set()  # type: Set[str]
+    pending = set(comps_or_platforms)
+
+    while pending:
+        seen.update(pending)
+        names = [name for name in pending if name not in cache]
+        modules = [cache[name] for name in pending if name in cache]
+        modules.extend(await asyncio.gather(*(
+            hass.async_add_executor_job(_import_module, hass, name)
+            for name in names), loop=hass.loop))
+
+        pending = set(
+            dependency for module in modules
+            for dependency in getattr(module, 'DEPENDENCIES', [])
+            if dependency not in seen)
+
+
 class Components:
     """Helper to load components."""
 
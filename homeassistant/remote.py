@@ -12,6 +12,7 @@ import enum
 import json
 import logging
 import urllib.parse
+from types import MappingProxyType
 
 from typing import Optional
 
@@ -119,6 +120,8 @@ class JSONEncoder(json.JSONEncoder):
             return o.isoformat()
         elif isinstance(o, set):
             return list(o)
+        elif isinstance(o, MappingProxyType):
+            return dict(o)
         elif hasattr(o, 'as_dict'):
             return o.as_dict()
 
@@ -7,7 +7,12 @@ import os
 import homeassistant.util.package as pkg_util
 
 DATA_PIP_LOCK = 'pip_lock'
+DATA_REQUIREMENTS_STORE = 'requirements_store'
+DATA_SATISFIED_REQUIREMENTS = 'satisfied_requirements'
 CONSTRAINT_FILE = 'package_constraints.txt'
+STORAGE_KEY = 'core.requirements'
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -24,16 +29,60 @@ async def async_process_requirements(hass, name, requirements):
                           **pip_kwargs(hass.config.config_dir))
 
     async with pip_lock:
-        for req in requirements:
-            ret = await hass.async_add_job(pip_install, req)
-            if not ret:
-                _LOGGER.error("Not initializing %s because could not install "
-                              "requirement %s", name, req)
-                return False
+        satisfied = await _async_get_satisfied(hass)
+        added = False
+
+        try:
+            for req in requirements:
+                if req in satisfied:
+                    continue
+                ret = await hass.async_add_job(pip_install, req)
+                if not ret:
+                    _LOGGER.error("Not initializing %s because could not "
+                                  "install requirement %s", name, req)
+                    return False
+                satisfied.add(req)
+                added = True
+        finally:
+            if added:
+                await _async_save_satisfied(hass)
 
     return True
 
 
+async def _async_get_satisfied(hass):
+    """Return the requirements known to be satisfied.
+
+    The stored requirements are only used if no packages were installed or
+    removed since they were stored.
+    """
+    satisfied = hass.data.get(DATA_SATISFIED_REQUIREMENTS)
+
+    if satisfied is not None:
+        return satisfied
+
+    store = hass.data[DATA_REQUIREMENTS_STORE] = \
+        hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+    data = await store.async_load()
+    satisfied = hass.data[DATA_SATISFIED_REQUIREMENTS] = set()
+
+    if data and data['key'] == await hass.async_add_executor_job(
+            pkg_util.environment_key):
+        satisfied.update(data['requirements'])
+
+    return satisfied
+
+
+async def _async_save_satisfied(hass):
+    """Store the requirements known to be satisfied."""
+    key = await hass.async_add_executor_job(pkg_util.environment_key)
+
+    await hass.data[DATA_REQUIREMENTS_STORE].async_save({
+        'key': key,
+        'requirements': sorted(hass.data[DATA_SATISFIED_REQUIREMENTS]),
+    }, delay=SAVE_DELAY)
+
+
 def pip_kwargs(config_dir):
     """Return keyword arguments for PIP install."""
     kwargs = {
@@ -2,13 +2,13 @@
 import argparse
 import asyncio
 from contextlib import suppress
-from datetime import datetime
+from datetime import timedelta
 import logging
 from timeit import default_timer as timer
 
 from homeassistant import core
 from homeassistant.const import (
-    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
+    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
 from homeassistant.util import dt as dt_util
 
 BENCHMARKS = {}
@@ -67,11 +67,11 @@ async def async_million_events(hass):
 
     hass.bus.async_listen(event_name, listener)
 
+    start = timer()
+
     for _ in range(10**6):
         hass.bus.async_fire(event_name)
 
-    start = timer()
-
     await event.wait()
 
     return timer() - start
@@ -79,9 +79,10 @@ async def async_million_events(hass):
 
 @benchmark
 # pylint: disable=invalid-name
-async def async_million_time_changed_helper(hass):
-    """Run a million events through time changed helper."""
+async def async_match_all_events(hass):
+    """Run 100k events with many MATCH_ALL listeners subscribed."""
     count = 0
+    event_name = 'benchmark_event'
     event = asyncio.Event(loop=hass.loop)
 
     @core.callback
@@ -90,24 +91,78 @@ async def async_million_time_changed_helper(hass):
         nonlocal count
         count += 1
 
-        if count == 10**6:
+        if count == 10**5:
             event.set()
 
-    hass.helpers.event.async_track_time_change(listener, minute=0, second=0)
-    event_data = {
-        ATTR_NOW: datetime(2017, 10, 10, 15, 0, 0, tzinfo=dt_util.UTC)
-    }
+    @core.callback
+    def match_all_listener(_):
+        """Handle any event."""
+        pass
 
-    for _ in range(10**6):
-        hass.bus.async_fire(EVENT_TIME_CHANGED, event_data)
+    for _ in range(20):
+        hass.bus.async_listen(MATCH_ALL, match_all_listener)
+
+    hass.bus.async_listen(event_name, listener)
 
     start = timer()
 
+    for _ in range(10**5):
+        hass.bus.async_fire(event_name)
+
     await event.wait()
 
     return timer() - start
 
 
+@benchmark
+# pylint: disable=invalid-name
+async def async_million_time_changed_helper(hass):
+    """Run a million scheduled matches through time changed helper."""
+    count = 0
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    hass.helpers.event.async_track_utc_time_change(listener, second=0)
+    now = dt_util.utcnow()
+
+    start = timer()
+
+    for minutes in range(1, 10**6 + 1):
+        hass.scheduler.async_run_due(now + timedelta(minutes=minutes))
+
+    assert count == 10**6
+
+    return timer() - start
+
+
+@benchmark
+# pylint: disable=invalid-name
+async def async_pending_timers(hass):
+    """Run 1000 seconds of time changes with 10k timers pending."""
+    now = dt_util.utcnow()
+
+    @core.callback
+    def listener(_):
+        """Handle timer."""
+        pass
+
+    for _ in range(10**4):
+        hass.helpers.event.async_track_point_in_utc_time(
+            listener, now + timedelta(days=1))
+
+    start = timer()
+
+    for seconds in range(1, 1001):
+        hass.bus.async_fire(EVENT_TIME_CHANGED, {
+            ATTR_NOW: now + timedelta(seconds=seconds)})
+
+    return timer() - start
+
+
 @benchmark
 # pylint: disable=invalid-name
 async def async_million_state_changed_helper(hass):
@@ -143,6 +198,142 @@ async def async_million_state_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+# pylint: disable=invalid-name
+async def async_mqtt_messages(hass):
+    """Match 10k MQTT messages against a growing number of subscriptions."""
+    from homeassistant.components import mqtt
+
+    client = mqtt.MQTT(hass, 'localhost', 1883, None, 60, None, None, None,
+                       None, None, None, None, None, None, None)
+
+    async def perform_subscription(topic, qos):
+        """Skip subscribing at the broker."""
+        pass
+
+    client._async_perform_subscription = perform_subscription
+
+    count = 0
+
+    @core.callback
+    def listener(*args):
+        """Handle message."""
+        nonlocal count
+        count += 1
+
+    messages = [
+        mqtt.Message('homeassistant/sensor/node_{}/state'.format(idx % 500),
+                     b'21.5')
+        for idx in range(10**4)]
+    total = 0
+
+    for subscriptions in (100, 500, 1500):
+        while len(client.subscriptions) < subscriptions:
+            idx = len(client.subscriptions)
+            topic = ('homeassistant/sensor/node_{}/state',
+                     'homeassistant/light/node_{}/+',
+                     'homeassistant/switch/node_{}/#')[idx % 3]
+            await client.async_subscribe(
+                topic.format(idx // 3), listener, 0, 'utf-8')
+
+        start = timer()
+
+        for msg in messages:
+            client._mqtt_handle_message(msg)
+
+        runtime = timer() - start
+        total += runtime
+        print('{} subscriptions: {:.0f} messages/s'.format(
+            subscriptions, len(messages) / runtime))
+
+    return total
+
+
+@benchmark
+# pylint: disable=invalid-name
+async def async_render_templates(hass):
+    """Render 400 templates 250 times while a few states change."""
+    from homeassistant.helpers.template import Template
+
+    sources = (
+        "{{ states('sensor.temperature_%d') | float | round(1) }}",
+        "{%% if is_state('light.room_%d', 'on') %%}On{%% else %%}Off"
+        "{%% endif %%}",
+        "{{ state_attr('sensor.temperature_%d', 'battery') | int + 10 }}",
+        "{{ (states.sensor.temperature_%d.state | float * 1.8 + 32) "
+        "| round(1) }} F",
+    )
+    templates = []
+
+    for idx in range(100):
+        hass.states.async_set(
+            'sensor.temperature_{}'.format(idx), idx / 3,
+            {'battery': idx, 'unit_of_measurement': '°C'})
+        hass.states.async_set('light.room_{}'.format(idx), 'on')
+        templates.extend(
+            Template(source % idx, hass) for source in sources)
+
+    start = timer()
+
+    for run in range(250):
+        for idx in range(run % 100, 100, 25):
+            hass.states.async_set(
+                'sensor.temperature_{}'.format(idx), run,
+                {'battery': idx, 'unit_of_measurement': '°C'})
+        for tpl in templates:
+            tpl.async_render()
+
+    return timer() - start
+
+
+@benchmark
+# pylint: disable=invalid-name
+async def async_active_zone_lookups(hass):
+    """Find the active zone of 10k GPS updates with 500 zones."""
+    from homeassistant.components.zone.zone import async_active_zone
+
+    for idx in range(500):
+        hass.states.async_set('zone.zone_{}'.format(idx), 'zoning', {
+            'latitude': 32 + idx % 25 * 0.02,
+            'longitude': -117 - idx // 25 * 0.02,
+            'radius': 100 + idx % 7 * 50,
+        })
+
+    start = timer()
+
+    for idx in range(10**4):
+        async_active_zone(
+            hass, 32 + idx % 97 * 0.005, -117 - idx % 89 * 0.005, 30)
+
+    return timer() - start
+
+
+@benchmark
+# pylint: disable=invalid-name
+async def async_coalesced_state_writes(hass):
+    """Schedule 100k state writes for 100 entities that coalesce them."""
+    from homeassistant.helpers.entity import Entity
+
+    entities = []
+
+    for idx in range(100):
+        entity = Entity()
+        entity.hass = hass
+        entity.entity_id = 'sensor.chatty_{}'.format(idx)
+        entity.coalesce_updates = 0
+        entities.append(entity)
+
+    start = timer()
+
+    for _ in range(100):
+        for _ in range(10):
+            for entity in entities:
+                entity.async_schedule_update_ha_state()
+        await hass.async_block_till_done()
+
+    return timer() - start
+
+
 @benchmark
 @asyncio.coroutine
 def logbook_filtering_state(hass):
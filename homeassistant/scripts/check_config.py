@@ -200,6 +200,9 @@ def check(config_dir, secrets=False):
         # Ensure !secrets point to the patched function
         yaml.yaml.SafeLoader.add_constructor('!secret', yaml._secret_yaml)
 
+    # Parse all files to record the files and secrets that are used
+    yaml.clear_config_cache()
+
     try:
         hass = core.HomeAssistant()
         hass.config.config_dir = config_dir
@@ -225,6 +228,7 @@ def check(config_dir, secrets=False):
             # Ensure !secrets point to the original function
             yaml.yaml.SafeLoader.add_constructor('!secret', yaml._secret_yaml)
         bootstrap.clear_secret_cache()
+        yaml.clear_config_cache()
 
     return res
 
@@ -19,6 +19,7 @@ ATTR_COMPONENT = 'component'
 
 DATA_SETUP = 'setup_tasks'
 DATA_DEPS_REQS = 'deps_reqs_processed'
+DATA_SETUP_TIME = 'setup_time'
 
 SLOW_SETUP_WARNING = 10
 
@@ -152,6 +153,7 @@ async def _async_setup_component(hass: core.HomeAssistant,
         end = timer()
         if warn_task:
             warn_task.cancel()
+        hass.data.setdefault(DATA_SETUP_TIME, {})[domain] = end - start
     _LOGGER.info("Setup of domain %s took %.1f seconds.", domain, end - start)
 
     if result is False:
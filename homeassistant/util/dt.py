@@ -1,9 +1,11 @@
 """Helper methods to handle the time in Home Assistant."""
+import bisect
+import calendar
 import datetime as dt
 import re
 
 # pylint: disable=unused-import
-from typing import Any, Dict, Union, Optional, Tuple  # NOQA
+from typing import Any, Dict, List, Union, Optional, Tuple  # NOQA
 
 import pytz
 import pytz.exceptions as pytzexceptions
@@ -211,3 +213,95 @@ def get_age(date: dt.datetime) -> str:
         return formatn(minute, 'minute')
 
     return formatn(second, 'second')
+
+
+def _next_value(values: List[int], current: int) -> Optional[int]:
+    """Return the first value that is equal to or larger than current."""
+    idx = bisect.bisect_left(values, current)
+    return values[idx] if idx < len(values) else None
+
+
+# pylint: disable=too-many-arguments,too-many-return-statements
+def find_next_time_match(start: dt.datetime, seconds: List[int],
+                         minutes: List[int], hours: List[int],
+                         days: List[int], months: List[int],
+                         years: Optional[List[int]] = None) \
+        -> Optional[dt.datetime]:
+    """Return the first whole second at or after start matching a pattern.
+
+    Every pattern field is a sorted list of the allowed values, years can be
+    None to allow any year. Fields are compared against the wall clock of
+    start, so pass a naive datetime to search in local time. Returns None if
+    nothing matches within the next hundred years.
+    """
+    if not (seconds and minutes and hours and days and months and
+            (years is None or years)):
+        return None
+
+    result = start.replace(microsecond=0)
+    if result < start:
+        result += dt.timedelta(seconds=1)
+
+    last_year = result.year + 100
+
+    while result.year <= last_year:
+        if years is not None and result.year not in years:
+            year = _next_value(years, result.year)
+            if year is None or year > last_year:
+                return None
+            result = result.replace(
+                year=year, month=1, day=1, hour=0, minute=0, second=0)
+            continue
+
+        if result.month not in months:
+            month = _next_value(months, result.month)
+            if month is None:
+                result = result.replace(
+                    year=result.year + 1, month=1, day=1, hour=0, minute=0,
+                    second=0)
+            else:
+                result = result.replace(
+                    month=month, day=1, hour=0, minute=0, second=0)
+            continue
+
+        days_in_month = calendar.monthrange(result.year, result.month)[1]
+
+        if result.day not in days:
+            day = _next_value(days, result.day)
+            if day is None or day > days_in_month:
+                result = result.replace(
+                    day=1, hour=0, minute=0, second=0) + \
+                    dt.timedelta(days=days_in_month)
+            else:
+                result = result.replace(day=day, hour=0, minute=0, second=0)
+            continue
+
+        if result.hour not in hours:
+            hour = _next_value(hours, result.hour)
+            if hour is None:
+                result = result.replace(hour=0, minute=0, second=0) + \
+                    dt.timedelta(days=1)
+            else:
+                result = result.replace(hour=hour, minute=0, second=0)
+            continue
+
+        if result.minute not in minutes:
+            minute = _next_value(minutes, result.minute)
+            if minute is None:
+                result = result.replace(minute=0, second=0) + \
+                    dt.timedelta(hours=1)
+            else:
+                result = result.replace(minute=minute, second=0)
+            continue
+
+        if result.second not in seconds:
+            second = _next_value(seconds, result.second)
+            if second is None:
+                result = result.replace(second=0) + dt.timedelta(minutes=1)
+            else:
+                result = result.replace(second=second)
+            continue
+
+        return result
+
+    return None
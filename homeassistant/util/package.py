@@ -1,5 +1,6 @@
 """Helpers to install PyPi packages."""
 import asyncio
+import hashlib
 import logging
 import os
 from subprocess import PIPE, Popen
@@ -7,7 +8,7 @@ import sys
 import threading
 from urllib.parse import urlparse
 
-from typing import Optional
+from typing import Dict, Optional, Tuple  # noqa: F401
 
 import pkg_resources
 
@@ -15,6 +16,9 @@ _LOGGER = logging.getLogger(__name__)
 
 INSTALL_LOCK = threading.Lock()
 
+# Installed distributions by the search path they were found on
+_ENVIRONMENT_CACHE = {}  # type: Dict[Tuple, pkg_resources.Environment]
+
 
 def is_virtual_env():
     """Return if we run in a virtual environtment."""
@@ -58,6 +62,8 @@ def install_package(package: str, upgrade: bool = True,
                           package, stderr.decode('utf-8').lstrip().strip())
             return False
 
+        # Find the installed package next time
+        _ENVIRONMENT_CACHE.clear()
         return True
 
 
@@ -73,10 +79,44 @@ def check_package_exists(package: str) -> bool:
         # This is a zip file
         req = pkg_resources.Requirement.parse(urlparse(package).fragment)
 
-    env = pkg_resources.Environment()
+    env = _get_environment()
     return any(dist in req for dist in env[req.project_name])
 
 
+def _get_environment() -> pkg_resources.Environment:
+    """Return the distributions installed on the current search path.
+
+    Scanning the search path is slow, so the result is reused until a
+    package is installed or the search path changes.
+    """
+    search_path = tuple(sys.path)
+    env = _ENVIRONMENT_CACHE.get(search_path)
+
+    if env is None:
+        _ENVIRONMENT_CACHE.clear()
+        env = _ENVIRONMENT_CACHE[search_path] = \
+            pkg_resources.Environment(list(search_path))
+
+    return env
+
+
+def environment_key() -> str:
+    """Return a key that changes when packages are installed or removed.
+
+    Installing or removing a package changes the modification time of the
+    directory on the search path it is installed in.
+    """
+    state = [sys.executable, sys.version]
+
+    for path in sys.path:
+        try:
+            state.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            state.append((path, None))
+
+    return hashlib.sha1(repr(state).encode('utf-8')).hexdigest()
+
+
 async def async_get_user_site(deps_dir: str) -> str:
     """Return user local library path.
 
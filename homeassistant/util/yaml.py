@@ -1,10 +1,14 @@
 """YAML utility functions."""
+import hashlib
+import io
 import logging
 import os
+import pickle
 import sys
 import fnmatch
+import threading
 from collections import OrderedDict
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Optional, Tuple  # noqa: F401
 
 import yaml
 try:
@@ -24,6 +28,14 @@ _SECRET_NAMESPACE = 'homeassistant'
 SECRET_YAML = 'secrets.yaml'
 __SECRET_CACHE = {}  # type: Dict
 
+CONFIG_CACHE_VERSION = 2
+# Parsed files by path. Entries hold the size, modification time and hash
+# of the file, the pickled result and what else the result depends on.
+_CONFIG_CACHE = {}  # type: Dict[str, Dict]
+_CONFIG_CACHE_CHANGED = False
+# Dependencies of the files being parsed and cache checks of the current load
+_LOAD_STATE = threading.local()
+
 
 class NodeListClass(list):
     """Wrapper class to be able to add attributes on a list."""
@@ -61,13 +73,40 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+if getattr(yaml, '__with_libyaml__', False):
+    # pylint: disable=too-many-ancestors,no-member
+    class _CSafeLineLoader(yaml.CSafeLoader):
+        """C accelerated loader with the constructors of SafeLineLoader."""
+
+        def __init__(self, stream) -> None:
+            """Initialize the loader."""
+            super().__init__(stream)
+            self.name = getattr(stream, 'name', '<file>')
+            self.stream = stream
+else:
+    _CSafeLineLoader = None
+
+
 def load_yaml(fname: str) -> Union[List, Dict]:
-    """Load a YAML file."""
+    """Load a YAML file.
+
+    Parsed files are cached. A cached result is used as long as the file,
+    the files it includes and the environment variables it uses are
+    unchanged. Files that use secrets are never cached.
+    """
+    frames = getattr(_LOAD_STATE, 'frames', None)
+    if not frames:
+        # Check every cached file at most once per load
+        _LOAD_STATE.frames = []
+        _LOAD_STATE.checked = {}
+
+    _add_dependency(('file', fname))
+
+    if _cache_valid(fname):
+        return pickle.loads(_CONFIG_CACHE[fname]['data'])
+
     try:
-        with open(fname, encoding='utf-8') as conf_file:
-            # If configuration file is empty YAML returns None
-            # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or OrderedDict()
+        return _load_and_cache(fname)
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc)
@@ -76,6 +115,220 @@ def load_yaml(fname: str) -> Union[List, Dict]:
         raise HomeAssistantError(exc)
 
 
+def _parse_yaml(stream: io.StringIO) -> Union[List, Dict]:
+    """Parse YAML, with the C accelerated loader if available."""
+    if _CSafeLineLoader is not None:
+        try:
+            # If configuration file is empty YAML returns None
+            # We convert that to an empty dict
+            return yaml.load(stream, Loader=_CSafeLineLoader) or OrderedDict()
+        except yaml.YAMLError:
+            # Parse again to raise the same error as the Python loader
+            stream.seek(0)
+
+    return yaml.load(stream, Loader=SafeLineLoader) or OrderedDict()
+
+
+def _load_and_cache(fname: str) -> Union[List, Dict]:
+    """Parse a YAML file and cache the result."""
+    global _CONFIG_CACHE_CHANGED  # pylint: disable=invalid-name
+
+    stat_key = _stat_key(fname)
+
+    with open(fname, encoding='utf-8') as conf_file:
+        content = conf_file.read()
+
+    stream = io.StringIO(content)
+    stream.name = fname
+    dependencies = []  # type: List[Optional[Tuple]]
+    _LOAD_STATE.frames.append(dependencies)
+
+    try:
+        result = _parse_yaml(stream)
+    finally:
+        _LOAD_STATE.frames.pop()
+
+    # Files that can't be checked for changes or contain secrets are not
+    # cached, and neither are the files including them
+    if (stat_key is None or None in dependencies or
+            os.path.basename(fname) == SECRET_YAML):
+        _CONFIG_CACHE.pop(fname, None)
+        _add_dependency(None)
+        return result
+
+    try:
+        data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        _add_dependency(None)
+        return result
+
+    _CONFIG_CACHE[fname] = {
+        'stat': stat_key,
+        'hash': _hash_content(content),
+        'data': data,
+        'dependencies': tuple(dependencies),
+    }
+    _CONFIG_CACHE_CHANGED = True
+    _LOAD_STATE.checked[fname] = True
+    return result
+
+
+def _add_dependency(dependency: Optional[Tuple]) -> None:
+    """Record what the file being parsed depends on.
+
+    None marks the file as not cacheable.
+    """
+    frames = getattr(_LOAD_STATE, 'frames', None)
+    if frames:
+        frames[-1].append(dependency)
+
+
+def _stat_key(fname: str) -> Optional[Tuple[int, int]]:
+    """Return the size and modification time of a file."""
+    try:
+        stat = os.stat(fname)
+    except (OSError, ValueError):
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _hash_content(content: str) -> str:
+    """Return the hash of the content of a file."""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def _cache_valid(fname: str) -> bool:
+    """Return if the cached result of a file can be used."""
+    checked = _LOAD_STATE.checked
+
+    if fname in checked:
+        return checked[fname]
+
+    # Assume invalid while checking, to stop on recursive includes
+    checked[fname] = False
+    entry = _CONFIG_CACHE.get(fname)
+    valid = (entry is not None and _file_unchanged(fname, entry) and
+             all(_dependency_valid(dependency)
+                 for dependency in entry['dependencies']))
+    checked[fname] = valid
+    return valid
+
+
+def _file_unchanged(fname: str, entry: Dict) -> bool:
+    """Return if the content of a file matches a cache entry."""
+    global _CONFIG_CACHE_CHANGED  # pylint: disable=invalid-name
+
+    stat_key = _stat_key(fname)
+
+    if stat_key is None:
+        return False
+
+    if stat_key == entry['stat']:
+        return True
+
+    # Touched files are only parsed again if their content changed
+    try:
+        with open(fname, encoding='utf-8') as conf_file:
+            content = conf_file.read()
+    except (OSError, UnicodeDecodeError):
+        return False
+
+    if _hash_content(content) != entry['hash']:
+        return False
+
+    entry['stat'] = stat_key
+    _CONFIG_CACHE_CHANGED = True
+    return True
+
+
+def _dependency_valid(dependency: Tuple) -> bool:
+    """Return if a dependency of a cached file is unchanged."""
+    kind = dependency[0]
+
+    if kind == 'file':
+        return _cache_valid(dependency[1])
+    if kind == 'dir':
+        _, loc, pattern, files = dependency
+        return tuple(_find_files(loc, pattern)) == files
+    if kind == 'env':
+        return os.environ.get(dependency[1]) == dependency[2]
+    return False
+
+
+def clear_config_cache() -> None:
+    """Clear the cache of parsed files."""
+    _CONFIG_CACHE.clear()
+
+
+def load_config_cache(path: str) -> None:
+    """Load the cache of parsed files stored by save_config_cache.
+
+    The cache is only loaded if no other user can access it.
+    """
+    global _CONFIG_CACHE_CHANGED  # pylint: disable=invalid-name
+
+    try:
+        with open(path, mode='rb') as cache_file:
+            if not _cache_file_private(os.fstat(cache_file.fileno())):
+                _LOGGER.warning("Ignoring the configuration cache %s, other "
+                                "users can access it", path)
+                return
+            stored = pickle.load(cache_file)
+    except FileNotFoundError:
+        return
+    except Exception:  # pylint: disable=broad-except
+        # A broken cache must never prevent loading the configuration
+        _LOGGER.warning("Unable to load the configuration cache %s", path)
+        return
+
+    if (not isinstance(stored, dict) or
+            stored.get('version') != CONFIG_CACHE_VERSION):
+        return
+
+    _CONFIG_CACHE.update(stored['files'])
+    _CONFIG_CACHE_CHANGED = False
+
+
+def _cache_file_private(stat: os.stat_result) -> bool:
+    """Return if a cache file is owned by us and only accessible to us."""
+    if not hasattr(os, 'getuid'):
+        return True
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+
+def save_config_cache(path: str) -> None:
+    """Store the cache of parsed files if it changed.
+
+    The cache is only stored if its directory exists. Only the owner can
+    read and write it.
+    """
+    global _CONFIG_CACHE_CHANGED  # pylint: disable=invalid-name
+
+    if not _CONFIG_CACHE_CHANGED or not os.path.isdir(os.path.dirname(path)):
+        return
+
+    tmp_path = '{}.tmp'.format(path)
+
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC |
+                     getattr(os, 'O_BINARY', 0), 0o600)
+        with open(fd, mode='wb') as cache_file:
+            if hasattr(os, 'fchmod'):
+                # Tighten an existing file created with other permissions
+                os.fchmod(fd, 0o600)
+            pickle.dump({
+                'version': CONFIG_CACHE_VERSION,
+                'files': _CONFIG_CACHE,
+            }, cache_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError) as err:
+        _LOGGER.warning("Unable to store the configuration cache %s: %s",
+                        path, err)
+        return
+
+    _CONFIG_CACHE_CHANGED = False
+
+
 def dump(_dict: dict) -> str:
     """Dump YAML to a string and remove null."""
     return yaml.safe_dump(
@@ -125,12 +378,19 @@ def _find_files(directory: str, pattern: str):
                 yield filename
 
 
+def _find_yaml_files(directory: str) -> Tuple[str, ...]:
+    """Find the YAML files in a directory for an include."""
+    files = tuple(_find_files(directory, '*.yaml'))
+    _add_dependency(('dir', directory, '*.yaml', files))
+    return files
+
+
 def _include_dir_named_yaml(loader: SafeLineLoader,
                             node: yaml.nodes.Node) -> OrderedDict:
     """Load multiple files from directory as a dictionary."""
     mapping = OrderedDict()  # type: OrderedDict
     loc = os.path.join(os.path.dirname(loader.name), node.value)
-    for fname in _find_files(loc, '*.yaml'):
+    for fname in _find_yaml_files(loc):
         filename = os.path.splitext(os.path.basename(fname))[0]
         mapping[filename] = load_yaml(fname)
     return _add_reference(mapping, loader, node)
@@ -141,7 +401,7 @@ def _include_dir_merge_named_yaml(loader: SafeLineLoader,
     """Load multiple files from directory as a merged dictionary."""
     mapping = OrderedDict()  # type: OrderedDict
     loc = os.path.join(os.path.dirname(loader.name), node.value)
-    for fname in _find_files(loc, '*.yaml'):
+    for fname in _find_yaml_files(loc):
         if os.path.basename(fname) == SECRET_YAML:
             continue
         loaded_yaml = load_yaml(fname)
@@ -154,7 +414,7 @@ def _include_dir_list_yaml(loader: SafeLineLoader,
                            node: yaml.nodes.Node):
     """Load multiple files from directory as a list."""
     loc = os.path.join(os.path.dirname(loader.name), node.value)
-    return [load_yaml(f) for f in _find_files(loc, '*.yaml')
+    return [load_yaml(f) for f in _find_yaml_files(loc)
             if os.path.basename(f) != SECRET_YAML]
 
 
@@ -164,7 +424,7 @@ def _include_dir_merge_list_yaml(loader: SafeLineLoader,
     loc = os.path.join(os.path.dirname(loader.name),
                        node.value)  # type: str
     merged_list = []  # type: List
-    for fname in _find_files(loc, '*.yaml'):
+    for fname in _find_yaml_files(loc):
         if os.path.basename(fname) == SECRET_YAML:
             continue
         loaded_yaml = load_yaml(fname)
@@ -212,6 +472,7 @@ def _env_var_yaml(loader: SafeLineLoader,
                   node: yaml.nodes.Node):
     """Load environment variables and embed it into the configuration YAML."""
     args = node.value.split()
+    _add_dependency(('env', args[0], os.environ.get(args[0])))
 
     # Check for a default value
     if len(args) > 1:
@@ -251,6 +512,9 @@ def _load_secret_yaml(secret_path: str) -> Dict:
 def _secret_yaml(loader: SafeLineLoader,
                  node: yaml.nodes.Node):
     """Load secrets and embed it into the configuration YAML."""
+    # Secrets are never written to the configuration cache
+    _add_dependency(None)
+
     secret_path = os.path.dirname(loader.name)
     while True:
         secrets = _load_secret_yaml(secret_path)
@@ -306,6 +570,10 @@ yaml.SafeLoader.add_constructor('!include_dir_named', _include_dir_named_yaml)
 yaml.SafeLoader.add_constructor('!include_dir_merge_named',
                                 _include_dir_merge_named_yaml)
 
+if _CSafeLineLoader is not None:
+    # Share the constructors, including the ones registered later on
+    _CSafeLineLoader.yaml_constructors = yaml.SafeLoader.yaml_constructors
+
 
 # From: https://gist.github.com/miracle2k/3184458
 # pylint: disable=redefined-outer-name
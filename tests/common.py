@@ -145,6 +145,10 @@ def async_test_home_assistant(loop):
     hass.config_entries._entries = []
     hass.config_entries._store._async_ensure_stop_listener = lambda: None
 
+    # Don't schedule restore state snapshots during tests
+    hass.data[restore_state.DATA_RESTORE_STORE] = storage.Store(
+        hass, restore_state.STORAGE_VERSION, restore_state.STORAGE_KEY)
+
     hass.state = ha.CoreState.running
 
     # Mock async_start
@@ -535,6 +539,7 @@ class MockConfigEntry(config_entries.ConfigEntry):
         manager._entries.append(self)
 
 
+@contextmanager
 def patch_yaml_files(files_dict, endswith=True):
     """Patch load_yaml with a dictionary of yaml files."""
     # match using endswith, start search with longest string
@@ -565,7 +570,10 @@ def patch_yaml_files(files_dict, endswith=True):
         # Not found
         raise FileNotFoundError("File not found: {}".format(fname))
 
-    return patch.object(yaml, 'open', mock_open_f, create=True)
+    # Don't mix up mocked files with parsed files from the cache
+    with patch.object(yaml, 'open', mock_open_f, create=True), \
+            patch.dict(yaml._CONFIG_CACHE, clear=True):
+        yield
 
 
 def mock_coro(return_value=None):
@@ -628,6 +636,8 @@ def init_recorder_component(hass, add_config=None):
     """Initialize the recorder."""
     config = dict(add_config) if add_config else {}
     config[recorder.CONF_DB_URL] = 'sqlite://'  # In memory DB
+    # Commit whatever is queued right away so tests don't wait on the window
+    config.setdefault(recorder.CONF_COMMIT_INTERVAL, 0)
 
     with patch('homeassistant.components.recorder.migration.migrate_schema'):
         assert setup_component(hass, recorder.DOMAIN,
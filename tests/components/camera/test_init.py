@@ -3,6 +3,7 @@ import asyncio
 import base64
 from unittest.mock import patch, mock_open
 
+import async_timeout
 import pytest
 
 from homeassistant.setup import setup_component, async_setup_component
@@ -154,3 +155,100 @@ async def test_webocket_camera_thumbnail(hass, hass_ws_client, mock_camera):
     assert msg['result']['content_type'] == 'image/jpeg'
     assert msg['result']['content'] == \
         base64.b64encode(b'Test').decode('utf-8')
+
+
+async def test_get_image_shares_fetch(hass, mock_camera):
+    """Test concurrent requests share the image being fetched."""
+    with patch('homeassistant.components.camera.demo.DemoCamera.camera_image',
+               return_value=b'Test') as mock_image:
+        images = await asyncio.gather(
+            camera.async_get_image(hass, 'camera.demo_camera'),
+            camera.async_get_image(hass, 'camera.demo_camera'),
+            loop=hass.loop)
+
+    assert len(mock_image.mock_calls) == 1
+    assert [image.content for image in images] == [b'Test', b'Test']
+
+
+async def test_still_streams_share_frames(hass, aiohttp_client, mock_camera):
+    """Test still streams of one camera share the fetched frames."""
+    await async_setup_component(hass, 'http', {'http': {}})
+    client = await aiohttp_client(hass.http.app)
+    component = hass.data[camera.DOMAIN]
+    demo_camera = component.get_entity('camera.demo_camera')
+    url = '/api/camera_proxy_stream/camera.demo_camera?token={}&interval=10'
+
+    with patch('homeassistant.components.camera.demo.DemoCamera.camera_image',
+               return_value=b'Test') as mock_image:
+        responses = []
+        for _ in range(2):
+            resp = await client.get(url.format(demo_camera.access_tokens[-1]))
+            assert resp.status == 200
+            data = b''
+            while b'Test' not in data:
+                data += await resp.content.read(1)
+            responses.append(resp)
+
+        assert len(mock_image.mock_calls) == 1
+
+        for resp in responses:
+            resp.close()
+
+
+async def test_still_stream_paced_by_frames(hass, aiohttp_client, mock_camera):
+    """Test a still stream writes frames as soon as they are published."""
+    await async_setup_component(hass, 'http', {'http': {}})
+    client = await aiohttp_client(hass.http.app)
+    component = hass.data[camera.DOMAIN]
+    demo_camera = component.get_entity('camera.demo_camera')
+    first_read = asyncio.Event(loop=hass.loop)
+
+    async def produce_frames(broker):
+        """Publish a second frame once the first one was read."""
+        broker.async_publish(b'Frame1')
+        await first_read.wait()
+        broker.async_publish(b'Frame2')
+        await asyncio.sleep(60, loop=hass.loop)
+
+    demo_camera._frame_broker = camera.CameraFrameBroker(
+        demo_camera, produce_frames)
+
+    resp = await client.get(
+        '/api/camera_proxy_stream/camera.demo_camera?token={}&interval=10'
+        .format(demo_camera.access_tokens[-1]))
+    assert resp.status == 200
+
+    data = b''
+    while b'Frame1' not in data:
+        data += await resp.content.read(1)
+    first_read.set()
+
+    with async_timeout.timeout(5, loop=hass.loop):
+        while b'Frame2' not in data:
+            data += await resp.content.read(1)
+
+    resp.close()
+
+
+async def test_frame_broker_drops_frames_for_slow_consumer(hass):
+    """Test a slow subscriber only gets the newest frame."""
+    produced = asyncio.Event(loop=hass.loop)
+
+    async def produce_frames(broker):
+        """Publish three frames."""
+        for frame in (b'1', b'2', b'3'):
+            broker.async_publish(frame)
+        produced.set()
+
+    cam = camera.Camera()
+    cam.hass = hass
+    broker = camera.CameraFrameBroker(cam, produce_frames)
+    subscription = broker.async_subscribe()
+    await produced.wait()
+
+    assert await subscription.async_next_frame() == b'3'
+    assert subscription.dropped == 2
+    assert await subscription.async_next_frame() is None
+    assert broker.frame == b'3'
+
+    subscription.async_cancel()
@@ -0,0 +1,49 @@
+"""The tests for the camera proxy platform."""
+import asyncio
+from unittest.mock import patch
+
+from homeassistant.components.camera import proxy
+
+
+async def test_resizer_remembers_resized_images(hass):
+    """Test resized images are reused for the same image and options."""
+    resizer = proxy.async_get_resizer(hass)
+    opts = proxy.ImageOpts(100, None, False)
+
+    with patch('homeassistant.components.camera.proxy._resize_image',
+               side_effect=lambda image, opts: image.lower()) as mock_resize:
+        assert await asyncio.gather(
+            resizer.async_resize(b'IMAGE', opts),
+            resizer.async_resize(b'IMAGE', opts),
+            loop=hass.loop) == [b'image', b'image']
+        assert await resizer.async_resize(b'IMAGE', opts) == b'image'
+        assert await resizer.async_resize(
+            b'IMAGE', proxy.ImageOpts(200, None, False)) == b'image'
+        assert await resizer.async_resize(
+            b'IMAGE', proxy.ImageOpts(None, None, False)) == b'IMAGE'
+
+    assert len(mock_resize.mock_calls) == 2
+    assert resizer.hits == 1
+    assert proxy.async_get_resizer(hass) is resizer
+
+
+async def test_resizer_evicts_least_recently_used(hass):
+    """Test the cache stays within its size."""
+    resizer = proxy.ImageResizer(hass, cache_size=10)
+    opts = proxy.ImageOpts(100, None, False)
+
+    with patch('homeassistant.components.camera.proxy._resize_image',
+               side_effect=lambda image, opts: image) as mock_resize:
+        await resizer.async_resize(b'aaaa', opts)
+        await resizer.async_resize(b'bbbb', opts)
+        await resizer.async_resize(b'aaaa', opts)
+        await resizer.async_resize(b'cccc', opts)
+        await resizer.async_resize(b'aaaa', opts)
+        await resizer.async_resize(b'bbbb', opts)
+        await resizer.async_resize(b'x' * 11, opts)
+        await resizer.async_resize(b'x' * 11, opts)
+
+    assert [call[1][0] for call in mock_resize.mock_calls] == [
+        b'aaaa', b'bbbb', b'cccc', b'bbbb', b'x' * 11, b'x' * 11]
+
+    resizer.async_shutdown()
@@ -24,7 +24,7 @@ from homeassistant.remote import JSONEncoder
 
 from tests.common import (
     get_test_home_assistant, fire_time_changed,
-    patch_yaml_files, assert_setup_component, mock_restore_cache)
+    patch_yaml_files, assert_setup_component, mock_restore_cache, mock_coro)
 
 TEST_PLATFORM = {device_tracker.DOMAIN: {CONF_PLATFORM: 'test'}}
 
@@ -111,6 +111,22 @@ class TestComponentsDeviceTracker(unittest.TestCase):
         self.assertEqual(device.consider_home, config.consider_home)
         self.assertEqual(device.icon, config.icon)
 
+    def test_reading_yaml_config_written_at_once(self):
+        """Test devices written in one go can be read back."""
+        devices = [
+            device_tracker.Device(
+                self.hass, timedelta(seconds=180), True, dev_id,
+                'AB:CD:EF:GH:IJ:{}'.format(idx), 'Test name {}'.format(idx))
+            for idx, dev_id in enumerate(('test', 'test2'))]
+        device_tracker.update_config_devices(self.yaml_devices, devices)
+        with assert_setup_component(1, device_tracker.DOMAIN):
+            assert setup_component(self.hass, device_tracker.DOMAIN,
+                                   TEST_PLATFORM)
+        config = device_tracker.load_config(self.yaml_devices, self.hass,
+                                            timedelta(seconds=0))
+        assert [(dev.dev_id, dev.mac, dev.name) for dev in config] == [
+            (dev.dev_id, dev.mac, dev.name) for dev in devices]
+
     # pylint: disable=invalid-name
     @patch('homeassistant.components.device_tracker._LOGGER.warning')
     def test_track_with_duplicate_mac_dev_id(self, mock_warning):
@@ -608,6 +624,58 @@ async def test_old_style_track_new_is_skipped(mock_device_tracker_conf, hass):
     assert mock_device_tracker_conf[0].track is False
 
 
+async def test_see_many(mock_device_tracker_conf, hass):
+    """Test seeing multiple devices at once."""
+    known = device_tracker.Device(
+        hass, timedelta(seconds=60), True, 'known', 'AB:CD:EF:GH:IJ:KL')
+    tracker = device_tracker.DeviceTracker(
+        hass, timedelta(seconds=60), True, {}, [known])
+    events = []
+    hass.bus.async_listen(device_tracker.EVENT_NEW_DEVICE, events.append)
+
+    with patch('homeassistant.components.device_tracker.Device'
+               '.async_update_ha_state',
+               side_effect=device_tracker.Device.async_update_ha_state,
+               autospec=True) as mock_update:
+        await tracker.async_see_many([
+            {'mac': 'ab:cd:ef:gh:ij:kl', 'battery': 40},
+            {'mac': '01:02:03:04:05:06', 'host_name': 'phone'},
+            {'dev_id': 'tablet'},
+            {'mac': 'ab:cd:ef:gh:ij:kl', 'battery': 50},
+        ])
+        await hass.async_block_till_done()
+
+    assert mock_update.call_count == 3
+    assert hass.states.get('device_tracker.known').attributes[
+        device_tracker.ATTR_BATTERY] == 50
+    assert hass.states.get('device_tracker.phone').state == STATE_HOME
+    assert hass.states.get('device_tracker.tablet') is not None
+    assert [event.data[ATTR_ENTITY_ID] for event in events] == \
+        ['device_tracker.phone', 'device_tracker.tablet']
+    assert [device.dev_id for device in mock_device_tracker_conf] == \
+        ['phone', 'tablet']
+
+
+async def test_scanner_sees_devices_at_once(mock_device_tracker_conf, hass):
+    """Test that a scan result is passed to the tracker at once."""
+    scanner = get_component(hass, 'device_tracker.test').SCANNER
+    scanner.reset()
+    scanner.come_home('DEV1')
+    scanner.come_home('DEV2')
+
+    with patch('homeassistant.components.device_tracker.DeviceTracker'
+               '.async_see', side_effect=AssertionError), \
+            patch('homeassistant.components.device_tracker.DeviceTracker'
+                  '.async_see_many', return_value=mock_coro()) as mock_see:
+        await async_setup_component(hass, device_tracker.DOMAIN, {
+            device_tracker.DOMAIN: {CONF_PLATFORM: 'test'}})
+        await hass.async_block_till_done()
+
+    assert len(mock_see.mock_calls) == 1
+    assert [kwargs['mac'] for kwargs in mock_see.mock_calls[0][1][0]] == \
+        ['DEV1', 'DEV2']
+
+
 def test_see_schema_allowing_ios_calls():
     """Test SEE service schema allows extra keys.
 
@@ -10,6 +10,7 @@ from homeassistant.const import (
     STATE_ON, STATE_OFF, STATE_HOME, STATE_UNKNOWN, ATTR_ICON, ATTR_HIDDEN,
     ATTR_ASSUMED_STATE, STATE_NOT_HOME, ATTR_FRIENDLY_NAME)
 import homeassistant.components.group as group
+from homeassistant.helpers.event import DATA_STATE_CHANGE_CALLBACKS
 
 from tests.common import get_test_home_assistant, assert_setup_component
 
@@ -336,6 +337,12 @@ class TestComponentsGroup(unittest.TestCase):
                          self.hass.states.get(
                              group.ENTITY_ID_FORMAT.format('peeps')).state)
 
+    def _count_state_trackers(self):
+        """Count the state change trackers registered by entity id."""
+        entity_callbacks = self.hass.data[DATA_STATE_CHANGE_CALLBACKS]
+        return len({listener for listeners in entity_callbacks.values()
+                    for listener in listeners})
+
     def test_reloading_groups(self):
         """Test reloading the group config."""
         assert setup_component(self.hass, 'group', {'group': {
@@ -356,7 +363,7 @@ class TestComponentsGroup(unittest.TestCase):
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.all_tests', 'group.empty_group', 'group.second_group',
              'group.test_group']
-        assert self.hass.bus.listeners['state_changed'] == 3
+        assert self._count_state_trackers() == 3
 
         with patch('homeassistant.config.load_yaml_config_file', return_value={
             'group': {
@@ -370,7 +377,7 @@ class TestComponentsGroup(unittest.TestCase):
 
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.all_tests', 'group.hello']
-        assert self.hass.bus.listeners['state_changed'] == 2
+        assert self._count_state_trackers() == 2
 
     def test_changing_group_visibility(self):
         """Test that a group can be hidden and shown."""
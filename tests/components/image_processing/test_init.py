@@ -1,4 +1,5 @@
 """The tests for the image_processing component."""
+import asyncio
 from unittest.mock import patch, PropertyMock
 
 from homeassistant.core import callback
@@ -7,9 +8,11 @@ from homeassistant.setup import setup_component
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.components.http as http
 import homeassistant.components.image_processing as ip
+from homeassistant.components.camera import Image
 
 from tests.common import (
-    get_test_home_assistant, get_test_instance_port, assert_setup_component)
+    get_test_home_assistant, get_test_instance_port, assert_setup_component,
+    mock_coro)
 
 
 class TestSetupImageProcessing:
@@ -296,3 +299,118 @@ class TestImageProcessingFace:
         assert event_data[0]['gender'] == 'male'
         assert event_data[0]['entity_id'] == \
             'image_processing.demo_face'
+
+
+class CountingImageProcessing(ip.ImageProcessingEntity):
+    """Image processing entity remembering the processed images."""
+
+    def __init__(self, hass, camera_entity, threshold=0, batch_key=None):
+        """Initialize the entity."""
+        self.hass = hass
+        self.entity_id = 'image_processing.{}'.format(
+            camera_entity.split('.')[1])
+        self._camera_entity = camera_entity
+        self._threshold = threshold
+        self._batch_key = batch_key
+        self.images = []
+        self.batches = []
+
+    @property
+    def camera_entity(self):
+        """Return camera entity id from process pictures."""
+        return self._camera_entity
+
+    @property
+    def frame_change_threshold(self):
+        """Return how much a frame has to change to be processed."""
+        return self._threshold
+
+    @property
+    def batch_key(self):
+        """Return the batch key."""
+        return self._batch_key
+
+    def process_image(self, image):
+        """Process image."""
+        self.images.append(image)
+
+    def process_images(self, frames):
+        """Process images together."""
+        self.batches.append(frames)
+        super().process_images(frames)
+
+
+def _mock_get_image(*images):
+    """Patch the camera to return the given images."""
+    return patch('homeassistant.components.camera.async_get_image',
+                 side_effect=[mock_coro(Image('image/jpeg', image))
+                              for image in images])
+
+
+async def test_skip_unchanged_frames(hass):
+    """Test identical frames are only processed once."""
+    entity = CountingImageProcessing(hass, 'camera.demo_camera')
+
+    with _mock_get_image(b'one', b'one', b'two', b'one', b'one'):
+        for _ in range(4):
+            await entity.async_update()
+
+        assert entity.images == [b'one', b'two', b'one']
+
+        entity.async_clear_last_frame()
+        await entity.async_update()
+
+    assert entity.images == [b'one', b'two', b'one', b'one']
+
+
+async def test_skip_similar_frames(hass):
+    """Test frames are skipped while their fingerprint barely changes."""
+    entity = CountingImageProcessing(hass, 'camera.demo_camera', threshold=5)
+    fingerprints = {
+        b'one': bytes([100] * 4),
+        b'noisy one': bytes([104] * 4),
+        b'dark': bytes([10] * 4),
+    }
+
+    with _mock_get_image(b'one', b'noisy one', b'dark'), \
+            patch('homeassistant.components.image_processing'
+                  '._frame_fingerprint', side_effect=fingerprints.get):
+        for _ in range(3):
+            await entity.async_update()
+
+    assert entity.images == [b'one', b'dark']
+
+
+async def test_process_all_frames_without_threshold(hass):
+    """Test every frame is processed without a threshold."""
+    entity = CountingImageProcessing(
+        hass, 'camera.demo_camera', threshold=None)
+
+    with _mock_get_image(b'one', b'one'):
+        for _ in range(2):
+            await entity.async_update()
+
+    assert entity.images == [b'one', b'one']
+    assert ip.ImageProcessingEntity().frame_change_threshold is None
+
+
+async def test_batch_frames_of_entities(hass):
+    """Test entities with the same batch key process frames together."""
+    first = CountingImageProcessing(hass, 'camera.first', batch_key='test')
+    second = CountingImageProcessing(hass, 'camera.second', batch_key='test')
+    other = CountingImageProcessing(hass, 'camera.other', batch_key='other')
+
+    with patch('homeassistant.components.camera.async_get_image',
+               side_effect=lambda hass, entity_id, timeout: mock_coro(
+                   Image('image/jpeg', entity_id.encode()))):
+        await asyncio.gather(
+            first.async_update(), second.async_update(), other.async_update(),
+            loop=hass.loop)
+
+    batches = first.batches + second.batches
+    assert len(batches) == 1
+    assert sorted(image for _, image in batches[0]) == \
+        [b'camera.first', b'camera.second']
+    assert other.batches == [[(other, b'camera.other')]]
+    assert first.images == [b'camera.first']
+    assert second.images == [b'camera.second']
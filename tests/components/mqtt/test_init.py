@@ -662,3 +662,129 @@ def test_mqtt_subscribes_topics_on_connect(hass):
     }
     calls = {call[1][1]: call[1][2] for call in hass.add_job.mock_calls}
     assert calls == expected
+
+
+def test_subscription_tree_matches():
+    """Test the subscription tree only returns matching subscriptions."""
+    tree = mqtt.SubscriptionTree()
+    exact = mqtt.Subscription('home/kitchen/temp', None)
+    level = mqtt.Subscription('home/+/temp', None)
+    subtree = mqtt.Subscription('home/#', None)
+    everything = mqtt.Subscription('#', None)
+    other = mqtt.Subscription('office/kitchen/temp', None)
+
+    for subscription in (exact, level, subtree, everything, other):
+        tree.add(subscription)
+
+    def topics(topic):
+        return sorted(sub.topic for sub in tree.matches(topic))
+
+    assert topics('home/kitchen/temp') == \
+        ['#', 'home/#', 'home/+/temp', 'home/kitchen/temp']
+    assert topics('home/hall/temp') == ['#', 'home/#', 'home/+/temp']
+    assert topics('home') == ['#', 'home/#']
+    assert topics('homes/kitchen') == ['#']
+    assert topics('office/kitchen/temp') == ['#', 'office/kitchen/temp']
+
+    tree.remove(everything)
+    tree.remove(exact)
+    assert topics('home/kitchen/temp') == ['home/#', 'home/+/temp']
+    assert topics('homes/kitchen') == []
+
+    tree.remove(level)
+    tree.remove(subtree)
+    assert topics('home/kitchen/temp') == []
+    assert 'home' not in tree._root.children
+
+
+async def test_received_messages_handled_in_batches(hass):
+    """Test received messages wake up the event loop once per batch."""
+    await async_mock_mqtt_client(hass)
+    calls = []
+
+    @callback
+    def record_calls(*args):
+        """Record the received messages."""
+        calls.append(args)
+
+    await mqtt.async_subscribe(hass, 'test-topic', record_calls)
+
+    with mock.patch.object(hass.loop, 'call_soon_threadsafe',
+                           wraps=hass.loop.call_soon_threadsafe) as mock_wake:
+        for idx in range(mqtt.MAX_MESSAGES_PER_BATCH * 2 + 1):
+            hass.data['mqtt']._mqtt_on_message(
+                None, None, mqtt.Message('test-topic', str(idx).encode()))
+        for _ in range(3):
+            await asyncio.sleep(0, loop=hass.loop)
+
+    assert [call[1][0] for call in mock_wake.mock_calls].count(
+        hass.data['mqtt']._mqtt_handle_messages) == 1
+    assert [args[1] for args in calls] == \
+        [str(idx) for idx in range(mqtt.MAX_MESSAGES_PER_BATCH * 2 + 1)]
+
+
+async def test_failing_subscriber_does_not_drop_batch(hass, caplog):
+    """Test a failing subscriber only loses its own message."""
+    await async_mock_mqtt_client(hass)
+    calls = []
+
+    @callback
+    def record_calls(topic, payload, qos):
+        """Record the received messages and fail on the first."""
+        calls.append(payload)
+        if payload == '0':
+            raise ValueError('broken subscriber')
+
+    await mqtt.async_subscribe(hass, 'test-topic', record_calls)
+
+    for idx in range(3):
+        hass.data['mqtt']._mqtt_on_message(
+            None, None, mqtt.Message('test-topic', str(idx).encode()))
+    await asyncio.sleep(0, loop=hass.loop)
+
+    assert calls == ['0', '1', '2']
+    assert 'Error handling message on test-topic' in caplog.text
+
+
+async def test_publishes_handed_to_paho_in_batches(hass):
+    """Test concurrent publishes share one executor job."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    client = hass.data['mqtt']
+
+    with mock.patch.object(client, '_publish_messages',
+                           wraps=client._publish_messages) as mock_publish:
+        await asyncio.wait([
+            hass.async_add_job(
+                client.async_publish('test-topic', str(idx), 0, False))
+            for idx in range(3)], loop=hass.loop)
+
+    assert mock_publish.call_count == 1
+    assert mqtt_client.publish.mock_calls == [
+        mock.call('test-topic', str(idx), 0, False) for idx in range(3)]
+    assert client._publish_task is None
+
+
+async def test_publish_errors_reported_per_message(hass):
+    """Test a failing publish only fails its own caller."""
+    mqtt_client = await async_mock_mqtt_client(hass)
+    client = hass.data['mqtt']
+
+    def publish(topic, payload, qos, retain):
+        """Fail to publish the second message."""
+        if payload == '1':
+            raise ValueError('bad payload')
+
+    mqtt_client.publish.side_effect = publish
+
+    results = await asyncio.gather(*[
+        hass.async_add_job(
+            client.async_publish('test-topic', str(idx), 0, False))
+        for idx in range(3)], loop=hass.loop, return_exceptions=True)
+
+    assert results[0] is None
+    assert isinstance(results[1], ValueError)
+    assert results[2] is None
+    assert mqtt_client.publish.mock_calls == [
+        mock.call('test-topic', str(idx), 0, False) for idx in range(3)]
+    assert client._pending_publishes == []
+    assert client._publish_task is None
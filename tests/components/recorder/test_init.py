@@ -4,13 +4,16 @@ import unittest
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import exc
 
+import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.const import MATCH_ALL
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import (
+    Events, StateAttributes, States)
 
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -202,3 +205,123 @@ def test_recorder_setup_failure():
         rec.join()
 
     hass.stop()
+
+
+def test_saving_batch_links_states(hass_recorder):
+    """Test states written in one batch keep their event linkage."""
+    hass = hass_recorder({'commit_interval': 0.5})
+    entity_ids = ['test.recorder_{}'.format(idx) for idx in range(5)]
+    for entity_id in entity_ids:
+        hass.states.set(entity_id, 'on')
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert sorted(st.entity_id for st in db_states) == entity_ids
+        for db_state in db_states:
+            db_event = session.query(Events).get(db_state.event_id)
+            assert db_event.event_type == 'state_changed'
+            assert db_state.entity_id in db_event.event_data
+
+
+def test_saving_batch_max_events(hass_recorder):
+    """Test batches are split at the configured maximum size."""
+    hass = hass_recorder({'commit_max_events': 2})
+    instance = hass.data[DATA_INSTANCE]
+    with patch.object(instance, '_commit_events',
+                      wraps=instance._commit_events) as commit:
+        # Queue directly so the recorder sees all events at once
+        with instance.queue.mutex:
+            for idx in range(5):
+                instance.queue.queue.append(ha.Event(
+                    'test_event', {'idx': idx}))
+                instance.queue.unfinished_tasks += 1
+            instance.queue.not_empty.notify()
+        instance.block_till_done()
+
+    assert [len(call[0][0]) for call in commit.call_args_list] == [2, 2, 1]
+
+    with session_scope(hass=hass) as session:
+        assert session.query(Events).filter_by(
+            event_type='test_event').count() == 5
+
+
+def test_saving_batch_drops_only_failing_event(hass_recorder):
+    """Test an event that can't be saved doesn't lose its batch."""
+    hass = hass_recorder({'commit_max_events': 5})
+    instance = hass.data[DATA_INSTANCE]
+    from_event = Events.from_event
+
+    def fail_second(event):
+        """Fail to convert the second event."""
+        if event.data.get('idx') == 1:
+            raise exc.IntegrityError('INSERT', {}, Exception())
+        return from_event(event)
+
+    with patch.object(Events, 'from_event', side_effect=fail_second), \
+            patch.object(instance, '_commit_events',
+                         wraps=instance._commit_events) as commit:
+        with instance.queue.mutex:
+            for idx in range(3):
+                instance.queue.queue.append(ha.Event(
+                    'test_event', {'idx': idx}))
+                instance.queue.unfinished_tasks += 1
+            instance.queue.not_empty.notify()
+        instance.block_till_done()
+
+    assert [len(call[0][0]) for call in commit.call_args_list] == [
+        3, 1, 1, 1]
+
+    # The recorder keeps running
+    hass.bus.fire('test_event', {'idx': 3})
+    hass.block_till_done()
+    instance.block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert sorted(event.to_native().data['idx'] for event in session.query(
+            Events).filter_by(event_type='test_event')) == [0, 2, 3]
+
+
+def test_saving_state_deduplicates_attributes(hass_recorder):
+    """Test identical attributes are stored once and shared by states."""
+    hass = hass_recorder()
+    attributes = {'test_attr': 5, 'test_attr_10': 'nice'}
+    for state in ('on', 'off', 'on'):
+        hass.states.set('test.recorder', state, attributes)
+        hass.block_till_done()
+    hass.states.set('test.recorder', 'off', {'test_attr': 6})
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert len({st.attributes_id for st in db_states[:3]}) == 1
+        shared_id = db_states[0].attributes_id
+        assert all(st.attributes is None for st in db_states)
+        assert db_states[3].to_native().attributes == {'test_attr': 6}
+
+    # Attributes already in the database are found without the cache
+    hass.data[DATA_INSTANCE]._attributes_ids.clear()
+    hass.states.set('test.recorder', 'on', attributes)
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        assert session.query(States).order_by(
+            States.state_id.desc()).first().attributes_id == shared_id
+
+
+def test_compile_statistics_scheduled(hass_recorder):
+    """Test the previous hour's statistics are compiled when enabled."""
+    with patch('homeassistant.components.recorder.statistics.'
+               'compile_statistics') as compile_statistics:
+        hass = hass_recorder({'statistics': True})
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+
+    assert len(compile_statistics.mock_calls) == 1
+    start = compile_statistics.mock_calls[0][1][1]
+    assert (start.minute, start.second, start.microsecond) == (0, 0, 0)
@@ -9,7 +9,7 @@ import homeassistant.core as ha
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.util import dt
 from homeassistant.components.recorder.models import (
-    Base, Events, States, RecorderRuns)
+    Base, Events, StateAttributes, States, RecorderRuns)
 
 ENGINE = None
 SESSION = None
@@ -78,6 +78,29 @@ class TestStates(unittest.TestCase):
         assert db_state.last_changed == event.time_fired
         assert db_state.last_updated == event.time_fired
 
+    def test_to_native_shared_attributes(self):
+        """Test converting a state with shared attributes."""
+        db_state = States(
+            entity_id='sensor.temperature', state='18',
+            state_attributes=StateAttributes(shared_attrs='{"unit": "C"}'),
+            last_changed=datetime(2016, 7, 9, 11, 0, 0, tzinfo=dt.UTC),
+            last_updated=datetime(2016, 7, 9, 11, 0, 0, tzinfo=dt.UTC))
+
+        assert db_state.to_native().attributes == {'unit': 'C'}
+
+
+class TestStateAttributes(unittest.TestCase):
+    """Test StateAttributes model."""
+
+    # pylint: disable=no-self-use
+
+    def test_hash_shared_attrs(self):
+        """Test the attributes hash is stable and fits a signed bigint."""
+        value = StateAttributes.hash_shared_attrs('{"unit": "C"}')
+        assert value == StateAttributes.hash_shared_attrs('{"unit": "C"}')
+        assert value != StateAttributes.hash_shared_attrs('{"unit": "F"}')
+        assert 0 <= value < 2 ** 63
+
 
 class TestRecorderRuns(unittest.TestCase):
     """Test recorder run model."""
@@ -7,7 +7,8 @@ from unittest.mock import patch
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.purge import purge_old_data
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import (
+    Events, StateAttributes, States)
 from homeassistant.components.recorder.util import session_scope
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -132,6 +133,24 @@ class TestRecorderPurge(unittest.TestCase):
             # we should only have 3 states left after purging
             self.assertEqual(states.count(), 3)
 
+    def test_purge_unused_attributes(self):
+        """Test deleting attributes no longer used by any state."""
+        self._add_test_states()
+        with session_scope(hass=self.hass) as session:
+            used = StateAttributes(hash=1, shared_attrs='{"used": 1}')
+            unused = StateAttributes(hash=2, shared_attrs='{"unused": 1}')
+            session.add_all([used, unused])
+            session.flush()
+            session.query(States).filter_by(state='dontpurgeme').update(
+                {'attributes_id': used.attributes_id})
+
+        purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+
+        with session_scope(hass=self.hass) as session:
+            attributes = session.query(StateAttributes).all()
+            self.assertEqual(
+                [attrs.shared_attrs for attrs in attributes], ['{"used": 1}'])
+
     def test_purge_old_events(self):
         """Test deleting old events."""
         self._add_test_events()
@@ -207,5 +226,5 @@ class TestRecorderPurge(unittest.TestCase):
                                         service_data=service_data)
                 self.hass.block_till_done()
                 self.hass.data[DATA_INSTANCE].block_till_done()
-                self.assertEqual(mock_logger.debug.mock_calls[4][1][0],
+                self.assertEqual(mock_logger.debug.mock_calls[5][1][0],
                                  "Vacuuming SQLite to free space")
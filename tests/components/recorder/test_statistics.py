@@ -0,0 +1,65 @@
+"""The tests for the recorder statistics."""
+from datetime import timedelta
+import unittest
+from unittest.mock import patch
+
+import homeassistant.util.dt as dt_util
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import Statistics
+from homeassistant.components.recorder.statistics import (
+    aggregate_values, compile_statistics)
+from homeassistant.components.recorder.util import session_scope
+
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+def test_aggregate_values():
+    """Test aggregating numeric values per entity."""
+    rows = [
+        ('sensor.a', '1'), ('sensor.a', '3'), ('sensor.a', 'unknown'),
+        ('sensor.a', None), ('sensor.a', 'nan'), ('sensor.a', 'inf'),
+        ('sensor.b', 'on'),
+        ('sensor.c', '-2.5'),
+    ]
+    assert list(aggregate_values(rows)) == [
+        ('sensor.a', 2, 1, 3, 2),
+        ('sensor.c', -2.5, -2.5, -2.5, 1),
+    ]
+
+
+class TestCompileStatistics(unittest.TestCase):
+    """Test compiling hourly statistics."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Set up things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        init_recorder_component(self.hass)
+        self.hass.start()
+
+    def tearDown(self):  # pylint: disable=invalid-name
+        """Stop everything that was started."""
+        self.hass.stop()
+
+    def test_compile_statistics(self):
+        """Test statistics are compiled once per hour."""
+        start = dt_util.utcnow().replace(
+            minute=0, second=0, microsecond=0) - timedelta(hours=2)
+
+        for minutes, state in ((10, '4'), (20, '8'), (70, '100')):
+            with patch('homeassistant.components.recorder.dt_util.utcnow',
+                       return_value=start + timedelta(minutes=minutes)):
+                self.hass.states.set('sensor.power', state)
+                self.hass.block_till_done()
+                self.hass.data[DATA_INSTANCE].block_till_done()
+
+        instance = self.hass.data[DATA_INSTANCE]
+        compile_statistics(instance, start)
+        compile_statistics(instance, start)
+
+        with session_scope(hass=self.hass) as session:
+            stats = session.query(Statistics).all()
+            assert len(stats) == 1
+            assert stats[0].domain == 'sensor'
+            assert stats[0].entity_id == 'sensor.power'
+            assert (stats[0].mean, stats[0].min, stats[0].max,
+                    stats[0].count) == (6, 4, 8, 2)
@@ -137,6 +137,79 @@ class TestHistoryStatsSensor(unittest.TestCase):
         self.assertEqual(sensor3.state, 2)
         self.assertEqual(sensor4.state, 50)
 
+    def test_measure_incremental(self):
+        """Test the measure is kept up to date without the history."""
+        now = dt_util.utcnow()
+        t0 = now - timedelta(minutes=40)
+        t1 = t0 + timedelta(minutes=20)
+        t2 = now - timedelta(minutes=10)
+        t3 = now - timedelta(minutes=5)
+
+        # Start     t0        t1        t2        t3        End
+        # |--20min--|--20min--|--10min--|--5min---|--5min---|
+        # |---off---|---on----|---off---|---on----|---off---|
+
+        fake_states = {
+            'binary_sensor.test_id': [
+                ha.State('binary_sensor.test_id', 'on', last_changed=t0),
+                ha.State('binary_sensor.test_id', 'off', last_changed=t1),
+                ha.State('binary_sensor.test_id', 'on', last_changed=t2),
+            ]
+        }
+
+        def set_start(start):
+            """Set the start of the period."""
+            self.hass.states.set('test.start', start.timestamp())
+
+        start = Template('{{ states("test.start") }}', self.hass)
+        end = Template('{{ as_timestamp(now()) + 3600 }}', self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, 'binary_sensor.test_id', 'on', start, end, None,
+            'time', 'Test')
+
+        set_start(now - timedelta(minutes=60))
+
+        with patch('homeassistant.components.history.'
+                   'state_changes_during_period', return_value=fake_states), \
+                patch('homeassistant.components.history.get_state',
+                      return_value=None):
+            sensor.update()
+
+        self.assertEqual(sensor.state, 0.5)
+
+        sensor.record_change(ha.State(
+            'binary_sensor.test_id', 'off', last_changed=t3,
+            last_updated=t3))
+        sensor.record_change(ha.State(
+            'binary_sensor.test_id', 'off', {'attr': 1}, last_changed=t3))
+
+        with patch('homeassistant.components.history.'
+                   'state_changes_during_period',
+                   side_effect=AssertionError):
+            sensor.update()
+            self.assertEqual(sensor.state, 0.42)
+            self.assertEqual(sensor.count, 2)
+
+            # The start moves forward, the state at the start is on
+            set_start(now - timedelta(minutes=30))
+            sensor.update()
+            self.assertEqual(sensor.state, 0.25)
+            self.assertEqual(sensor.count, 1)
+
+        # The start moves back before the loaded changes
+        set_start(now - timedelta(minutes=90))
+
+        with patch('homeassistant.components.history.'
+                   'state_changes_during_period',
+                   return_value=fake_states) as mock_changes, \
+                patch('homeassistant.components.history.get_state',
+                      return_value=None):
+            sensor.update()
+
+        self.assertEqual(len(mock_changes.mock_calls), 1)
+        self.assertEqual(sensor.state, 0.42)
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template('{{ now() }}', self.hass)
@@ -44,6 +44,42 @@ class TestTemplateSensor:
         state = self.hass.states.get('sensor.test_template_sensor')
         assert state.state == 'It Works.'
 
+    def test_template_tracks_accessed_states(self):
+        """Test the sensor follows the states its template accessed."""
+        with assert_setup_component(1):
+            assert setup_component(self.hass, 'sensor', {
+                'sensor': {
+                    'platform': 'template',
+                    'sensors': {
+                        'test_template_sensor': {
+                            'value_template':
+                                "{% if is_state('input_boolean.use_a', 'on')"
+                                " %}{{ states('sensor.a') }}{% else %}"
+                                "{{ states.sensor | count }}{% endif %}"
+                        }
+                    }
+                }
+            })
+
+        self.hass.states.set('input_boolean.use_a', 'on')
+        self.hass.states.set('sensor.a', '1')
+        self.hass.start()
+        self.hass.block_till_done()
+        assert self.hass.states.get('sensor.test_template_sensor').state == '1'
+
+        self.hass.states.set('sensor.a', '2')
+        self.hass.block_till_done()
+        assert self.hass.states.get('sensor.test_template_sensor').state == '2'
+
+        # Now the template counts all sensors, including itself
+        self.hass.states.set('input_boolean.use_a', 'off')
+        self.hass.block_till_done()
+        assert self.hass.states.get('sensor.test_template_sensor').state == '2'
+
+        self.hass.states.set('sensor.b', '3')
+        self.hass.block_till_done()
+        assert self.hass.states.get('sensor.test_template_sensor').state == '3'
+
     def test_icon_template(self):
         """Test icon template."""
         with assert_setup_component(1):
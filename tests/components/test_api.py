@@ -245,6 +245,16 @@ def test_api_get_components(hass, mock_api_client):
     assert set(result) == hass.config.components
 
 
+async def test_api_get_components_timing(hass, mock_api_client):
+    """Test the return of how long setting up components took."""
+    resp = await mock_api_client.get(const.URL_API_COMPONENTS_TIMING)
+    result = await resp.json()
+
+    assert set(result) >= {'api', 'http'}
+    assert result['http']['import'] >= 0
+    assert result['http']['setup'] >= 0
+
+
 @asyncio.coroutine
 def test_api_get_event_listeners(hass, mock_api_client):
     """Test if we can get the list of events being listened for."""
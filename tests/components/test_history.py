@@ -1,13 +1,21 @@
 """The tests the History component."""
 # pylint: disable=protected-access,invalid-name
+import asyncio
 from datetime import timedelta
+from itertools import groupby
+import json
 import unittest
 from unittest.mock import patch, sentinel
 
+from aiohttp import ClientPayloadError
+import pytest
+
 from homeassistant.setup import setup_component, async_setup_component
 import homeassistant.core as ha
 import homeassistant.util.dt as dt_util
 from homeassistant.components import history, recorder
+from homeassistant.components.recorder.models import States, Statistics
+from homeassistant.components.recorder.statistics import compile_statistics
 
 from tests.common import (
     init_recorder_component, mock_state_change_event, get_test_home_assistant)
@@ -198,6 +206,32 @@ class TestComponentHistory(unittest.TestCase):
             include_start_time_state=True)
         assert states == hist
 
+    def test_iter_significant_states(self):
+        """Test streaming significant states grouped by entity."""
+        zero, four, states = self.record_states()
+        one = zero + timedelta(seconds=1)
+        one_and_half = zero + timedelta(seconds=1.5)
+        for entity_id in states:
+            if entity_id == 'media_player.test':
+                states[entity_id] = states[entity_id][1:]
+            for state in states[entity_id]:
+                if state.last_changed == one:
+                    state.last_changed = one_and_half
+
+        with patch.object(history, 'STREAM_BATCH_SIZE', 2):
+            hist = list(history.iter_significant_states(
+                self.hass, one_and_half, four, filters=history.Filters()))
+
+        grouped = {
+            entity_id: list(group) for entity_id, group
+            in groupby(hist, lambda state: state.entity_id)}
+        assert len(grouped) == len(states)
+        assert states == grouped
+
+        # Entities are in the same order as get_significant_states
+        assert list(grouped) == list(history.get_significant_states(
+            self.hass, one_and_half, four, filters=history.Filters()))
+
     def test_get_significant_states_without_initial(self):
         """Test that only significant states are returned.
 
@@ -428,6 +462,108 @@ class TestComponentHistory(unittest.TestCase):
                     history.CONF_ENTITIES: ['media_player.test']}}})
         self.check_significant_states(zero, four, states, config)
 
+    def test_get_aggregated_states(self):
+        """Test numeric states are aggregated per bucket."""
+        self.init_recorder()
+        start = dt_util.utcnow().replace(
+            hour=3, minute=0, second=0, microsecond=0) - timedelta(days=1)
+
+        for minutes, entity_id, state in (
+                (1, 'sensor.power', '10'), (2, 'sensor.power', '20'),
+                (3, 'sensor.power', 'unavailable'), (4, 'sensor.power', '60'),
+                (6, 'sensor.power', '5'), (2, 'light.kitchen', 'on')):
+            with patch('homeassistant.components.recorder.dt_util.utcnow',
+                       return_value=start + timedelta(minutes=minutes)):
+                self.hass.states.set(entity_id, state)
+                self.wait_recording_done()
+
+        hist = history.get_aggregated_states(
+            self.hass, start, start + timedelta(hours=1),
+            timedelta(minutes=5), filters=history.Filters())
+
+        assert list(hist) == ['sensor.power']
+        assert hist['sensor.power'] == [
+            {'entity_id': 'sensor.power', 'start': start,
+             'mean': 30, 'min': 10, 'max': 60},
+            {'entity_id': 'sensor.power',
+             'start': start + timedelta(minutes=5),
+             'mean': 5, 'min': 5, 'max': 5},
+        ]
+
+    def test_get_aggregated_states_statistics(self):
+        """Test complete hours are read from compiled statistics."""
+        self.init_recorder()
+        instance = self.hass.data[recorder.DATA_INSTANCE]
+        start = dt_util.utcnow().replace(
+            hour=3, minute=0, second=0, microsecond=0) - timedelta(days=1)
+
+        for minutes, state in ((30, '10'), (90, '20'), (150, '30')):
+            with patch('homeassistant.components.recorder.dt_util.utcnow',
+                       return_value=start + timedelta(minutes=minutes)):
+                self.hass.states.set('sensor.power', state)
+                self.wait_recording_done()
+
+        compile_statistics(instance, start)
+        compile_statistics(instance, start + timedelta(hours=1))
+
+        # Statistics replace the states of compiled hours
+        with recorder.session_scope(hass=self.hass) as session:
+            session.query(Statistics).filter(
+                Statistics.start == start).update({'mean': 15})
+
+        hist = history.get_aggregated_states(
+            self.hass, start, start + timedelta(hours=3),
+            timedelta(hours=1), filters=history.Filters())
+
+        assert [bucket['mean'] for bucket in hist['sensor.power']] == [
+            15, 20, 30]
+
+    def test_get_aggregated_states_uncompiled_hours(self):
+        """Test hours without statistics are read from the states."""
+        self.init_recorder()
+        instance = self.hass.data[recorder.DATA_INSTANCE]
+        start = dt_util.utcnow().replace(
+            hour=3, minute=0, second=0, microsecond=0) - timedelta(days=1)
+
+        for minutes, state in ((30, '10'), (90, '20'), (150, '30')):
+            with patch('homeassistant.components.recorder.dt_util.utcnow',
+                       return_value=start + timedelta(minutes=minutes)):
+                self.hass.states.set('sensor.power', state)
+                self.wait_recording_done()
+
+        compile_statistics(instance, start + timedelta(hours=1))
+
+        with recorder.session_scope(hass=self.hass) as session:
+            session.query(Statistics).update({'mean': 25})
+
+        hist = history.get_aggregated_states(
+            self.hass, start, start + timedelta(hours=3),
+            timedelta(hours=1), filters=history.Filters())
+
+        assert [bucket['mean'] for bucket in hist['sensor.power']] == [
+            10, 25, 30]
+
+    def test_get_aggregated_states_non_numeric(self):
+        """Test states without a finite number are skipped."""
+        self.init_recorder()
+        start = dt_util.utcnow().replace(
+            hour=3, minute=0, second=0, microsecond=0) - timedelta(days=1)
+
+        with recorder.session_scope(hass=self.hass) as session:
+            for minutes, state in ((10, '10'), (20, None), (30, 'unknown'),
+                                   (40, 'nan'), (50, 'inf'), (55, '20')):
+                when = start + timedelta(minutes=minutes)
+                session.add(States(
+                    entity_id='sensor.power', domain='sensor', state=state,
+                    last_changed=when, last_updated=when, created=when))
+
+        hist = history.get_aggregated_states(
+            self.hass, start, start + timedelta(hours=1),
+            timedelta(hours=1), filters=history.Filters())
+
+        bucket, = hist['sensor.power']
+        assert (bucket['mean'], bucket['min'], bucket['max']) == (15, 10, 20)
+
     def check_significant_states(self, zero, four, states, config):
         """Check if significant states are retrieved."""
         filters = history.Filters()
@@ -525,3 +661,119 @@ async def test_fetch_period_api(hass, aiohttp_client):
     response = await client.get(
         '/api/history/period/{}'.format(dt_util.utcnow().isoformat()))
     assert response.status == 200
+
+
+async def test_fetch_period_api_streams_states(hass, aiohttp_client):
+    """Test the fetch period view streams states grouped by entity."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    start = dt_util.utcnow()
+    for state in ('on', 'off'):
+        hass.states.async_set('light.kitchen', state)
+        hass.states.async_set('light.hallway', state)
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await aiohttp_client(hass.http.app)
+    with patch.object(history, 'STREAM_CHUNK_SIZE', 10):
+        response = await client.get(
+            '/api/history/period/{}'.format(start.isoformat()))
+        assert response.status == 200
+        result = json.loads(await response.text())
+
+    assert [[state['entity_id'] for state in states]
+            for states in result] == [['light.kitchen'] * 2,
+                                      ['light.hallway'] * 2]
+    assert [state['state'] for state in result[0]] == ['on', 'off']
+
+
+async def test_fetch_period_api_stream_errors(hass, aiohttp_client):
+    """Test errors while streaming are not reported as complete results."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    client = await aiohttp_client(hass.http.app)
+
+    def fail_after(*states):
+        """Yield the states and fail."""
+        yield from states
+        raise ValueError
+
+    with patch.object(history, 'iter_significant_states',
+                      return_value=fail_after()):
+        response = await client.get('/api/history/period')
+        assert response.status == 500
+
+    with patch.object(history, 'STREAM_CHUNK_SIZE', 10), \
+            patch.object(history, 'iter_significant_states',
+                         return_value=fail_after(
+                             ha.State('light.kitchen', 'on'))):
+        response = await client.get('/api/history/period')
+        assert response.status == 200
+        with pytest.raises(ClientPayloadError):
+            await response.read()
+
+
+async def test_fetch_period_api_stream_stalled_client(
+        hass, aiohttp_client, caplog):
+    """Test a client that stops reading is disconnected."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    client = await aiohttp_client(hass.http.app)
+    states = [ha.State('light.kitchen', str(idx)) for idx in range(10)]
+
+    async def stall(self, data):
+        """Never finish writing."""
+        await asyncio.sleep(10, loop=hass.loop)
+
+    with patch.object(history, 'STREAM_CHUNK_SIZE', 10), \
+            patch.object(history, 'STREAM_MAX_PENDING', 1), \
+            patch.object(history, 'STREAM_WRITE_TIMEOUT', 0.1), \
+            patch.object(history, 'iter_significant_states',
+                         return_value=iter(states)), \
+            patch('aiohttp.web.StreamResponse.write', stall):
+        response = await client.get('/api/history/period')
+        assert response.status == 200
+        with pytest.raises(ClientPayloadError):
+            await response.read()
+
+    assert 'Client stopped reading history' in caplog.text
+
+
+async def test_fetch_period_api_resolution(hass, aiohttp_client):
+    """Test the fetch period view with an aggregation resolution."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    start = dt_util.utcnow()
+    for state in ('1', '3'):
+        hass.states.async_set('sensor.power', state)
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await aiohttp_client(hass.http.app)
+    response = await client.get(
+        '/api/history/period/{}'.format(start.isoformat()),
+        params={'resolution': '1d'})
+    assert response.status == 200
+    result = await response.json()
+    assert len(result) == 1
+    assert [(bucket['min'], bucket['max'], bucket['mean'])
+            for bucket in result[0]] == [(1, 3, 2)]
+
+    response = await client.get(
+        '/api/history/period/{}'.format(start.isoformat()),
+        params={'resolution': '5 minutes'})
+    assert response.status == 400
+
+
+def test_parse_resolution():
+    """Test parsing the aggregation resolution."""
+    assert history.parse_resolution('30s') == timedelta(seconds=30)
+    assert history.parse_resolution('5m') == timedelta(minutes=5)
+    assert history.parse_resolution('2h') == timedelta(hours=2)
+    assert history.parse_resolution('1d') == timedelta(days=1)
+    assert history.parse_resolution('0m') is None
+    assert history.parse_resolution('5') is None
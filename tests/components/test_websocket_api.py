@@ -215,6 +215,32 @@ def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_serialize_once(hass, websocket_client):
+    """Test an event is serialized once for all subscriptions."""
+    for iden in (5, 6):
+        await websocket_client.send_json({
+            'id': iden,
+            'type': wapi.TYPE_SUBSCRIBE_EVENTS,
+            'event_type': 'test_event'
+        })
+        msg = await websocket_client.receive_json()
+        assert msg['success']
+
+    with patch.object(wapi, 'JSON_DUMP', wraps=wapi.JSON_DUMP) as json_dump:
+        hass.bus.async_fire('test_event', {'hello': 'world'})
+
+        with timeout(3, loop=hass.loop):
+            msgs = [await websocket_client.receive_json() for _ in range(2)]
+
+    # Once for the event and once for each message id
+    assert json_dump.call_count == 3
+    assert hass.data[wapi.DATA_EVENT_JSON][0].event_type == 'test_event'
+    assert sorted(msg['id'] for msg in msgs) == [5, 6]
+    for msg in msgs:
+        assert msg['type'] == wapi.TYPE_EVENT
+        assert msg['event']['data'] == {'hello': 'world'}
+
+
 @asyncio.coroutine
 def test_get_states(hass, websocket_client):
     """Test get_states command."""
@@ -233,7 +259,7 @@ def test_get_states(hass, websocket_client):
 
     states = []
     for state in hass.states.async_all():
-        state = state.as_dict()
+        state = dict(state.as_dict())
         state['last_changed'] = state['last_changed'].isoformat()
         state['last_updated'] = state['last_updated'].isoformat()
         states.append(state)
@@ -1,5 +1,6 @@
 """Test zone component."""
 
+import random
 import unittest
 from unittest.mock import Mock
 
@@ -221,3 +222,85 @@ class TestComponentZone(unittest.TestCase):
 
         assert zone.zone.in_zone(self.hass.states.get('zone.passive_zone'),
                                  latitude, longitude)
+
+
+def active_zone_all_zones(hass, latitude, longitude, radius=0):
+    """Find the active zone by checking all zones."""
+    closest = min_dist = None
+
+    for state in sorted(hass.states.async_all(zone.DOMAIN),
+                        key=lambda state: state.entity_id):
+        if state.attributes.get('passive') or not zone.zone.in_zone(
+                state, latitude, longitude, radius):
+            continue
+
+        dist = zone.zone.distance(
+            latitude, longitude,
+            state.attributes['latitude'], state.attributes['longitude'])
+
+        if closest is None or dist < min_dist or (
+                dist == min_dist and state.attributes['radius'] <
+                closest.attributes['radius']):
+            closest, min_dist = state, dist
+
+    return closest
+
+
+async def test_active_zone_index_matches_all_zones(hass):
+    """Test the zone index finds the same zones as checking all zones."""
+    rand = random.Random(1)
+    # Around San Diego, the antimeridian and close to the pole
+    centers = [(32.88, -117.23), (-16.5, 179.99), (88.95, 10.0)]
+
+    for idx in range(100):
+        lat, lon = rand.choice(centers)
+        hass.states.async_set('zone.zone_{}'.format(idx), 'zoning', {
+            'latitude': lat + rand.uniform(-0.3, 0.3),
+            'longitude': (lon + rand.uniform(-0.3, 0.3) + 180) % 360 - 180,
+            'radius': rand.choice([50, 250, 1000, 5000, 100000]),
+            'passive': rand.random() < 0.1,
+        })
+
+    # Zones at the same distance with the same radius
+    hass.states.async_set('zone.same_b', 'zoning', {
+        'latitude': 10, 'longitude': 10, 'radius': 100})
+    hass.states.async_set('zone.same_a', 'zoning', {
+        'latitude': 10, 'longitude': 10, 'radius': 100})
+
+    assert zone.zone.async_active_zone(hass, 10, 10).entity_id == \
+        'zone.same_a'
+
+    for _ in range(500):
+        lat, lon = rand.choice(centers)
+        lat += rand.uniform(-0.4, 0.4)
+        lon = (lon + rand.uniform(-0.4, 0.4) + 180) % 360 - 180
+        radius = rand.choice([0, 20, 500, 30000])
+
+        assert zone.zone.async_active_zone(hass, lat, lon, radius) == \
+            active_zone_all_zones(hass, lat, lon, radius)
+
+
+async def test_active_zone_index_follows_zone_changes(hass):
+    """Test the zone index is updated when zones change."""
+    assert zone.zone.async_active_zone(hass, 32.88, -117.23) is None
+
+    hass.states.async_set('zone.moving', 'zoning', {
+        'latitude': 32.88, 'longitude': -117.23, 'radius': 100})
+    assert zone.zone.async_active_zone(
+        hass, 32.88, -117.23).entity_id == 'zone.moving'
+
+    hass.states.async_set('zone.moving', 'zoning', {
+        'latitude': 52.37, 'longitude': 4.89, 'radius': 100})
+    assert zone.zone.async_active_zone(hass, 32.88, -117.23) is None
+    assert zone.zone.async_active_zone(
+        hass, 52.37, 4.89).entity_id == 'zone.moving'
+
+    hass.states.async_set('zone.moving', 'zoning', {
+        'latitude': 52.37, 'longitude': 4.89, 'radius': 100,
+        'passive': True})
+    assert zone.zone.async_active_zone(hass, 52.37, 4.89) is None
+
+    hass.states.async_set('zone.moving', 'zoning', {
+        'latitude': 52.37, 'longitude': 4.89, 'radius': 100})
+    hass.states.async_remove('zone.moving')
+    assert zone.zone.async_active_zone(hass, 52.37, 4.89) is None
@@ -124,10 +124,17 @@ def mock_device_tracker_conf():
     async def mock_update_config(path, id, entity):
         devices.append(entity)
 
+    async def mock_update_config_devices(path, entities):
+        devices.extend(entities)
+
     with patch(
         'homeassistant.components.device_tracker'
         '.DeviceTracker.async_update_config',
             side_effect=mock_update_config
+    ), patch(
+        'homeassistant.components.device_tracker'
+        '.DeviceTracker.async_update_config_devices',
+            side_effect=mock_update_config_devices
     ), patch(
         'homeassistant.components.device_tracker.async_load_config',
             side_effect=lambda *args: mock_coro(devices)
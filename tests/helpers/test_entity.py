@@ -400,3 +400,90 @@ def test_async_remove_no_platform(hass):
     assert len(hass.states.async_entity_ids()) == 1
     yield from ent.async_remove()
     assert len(hass.states.async_entity_ids()) == 0
+
+
+class CountingEntity(entity.Entity):
+    """Entity that counts how often its state is written."""
+
+    entity_id = 'test.test'
+
+    def __init__(self):
+        """Initialize the entity."""
+        self.writes = 0
+        self.updates = 0
+
+    @property
+    def state(self):
+        """Return the number of writes."""
+        self.writes += 1
+        return self.writes
+
+    @asyncio.coroutine
+    def async_update(self):
+        """Count the updates."""
+        self.updates += 1
+
+
+@asyncio.coroutine
+def test_coalesce_updates_in_loop_iteration(hass):
+    """Test scheduled writes of one loop iteration are coalesced."""
+    ent = CountingEntity()
+    ent.hass = hass
+    ent.coalesce_updates = 0
+
+    ent.async_schedule_update_ha_state()
+    ent.async_schedule_update_ha_state(True)
+    ent.async_schedule_update_ha_state()
+    yield from hass.async_block_till_done()
+
+    assert ent.writes == 1
+    assert ent.updates == 1
+    assert hass.states.get('test.test').state == '1'
+    assert hass.data[entity.DATA_COALESCED_UPDATES] == {'test.test': 2}
+
+    ent.async_schedule_update_ha_state()
+    yield from hass.async_block_till_done()
+
+    assert ent.writes == 2
+    assert ent.updates == 1
+
+
+@asyncio.coroutine
+def test_coalesce_updates_within_window(hass):
+    """Test scheduled writes within the window are coalesced."""
+    ent = CountingEntity()
+    ent.hass = hass
+    ent.coalesce_updates = 5
+
+    with patch.object(hass.loop, 'call_later') as mock_call_later:
+        ent.async_schedule_update_ha_state()
+        ent.async_schedule_update_ha_state()
+        hass.add_job(ent.schedule_update_ha_state)
+        yield from hass.async_block_till_done()
+
+    assert ent.writes == 0
+    assert len(mock_call_later.mock_calls) == 1
+    delay, write = mock_call_later.mock_calls[0][1]
+    assert delay == 5
+
+    write()
+    yield from hass.async_block_till_done()
+
+    assert ent.writes == 1
+    assert hass.data[entity.DATA_COALESCED_UPDATES] == {'test.test': 2}
+
+
+@asyncio.coroutine
+def test_async_remove_cancels_coalesced_update(hass):
+    """Test a pending coalesced write is dropped when removing."""
+    ent = CountingEntity()
+    ent.hass = hass
+    ent.coalesce_updates = 0
+
+    yield from ent.async_update_ha_state()
+    ent.async_schedule_update_ha_state()
+    yield from ent.async_remove()
+    yield from hass.async_block_till_done()
+
+    assert ent.writes == 1
+    assert hass.states.get('test.test') is None
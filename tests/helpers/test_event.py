@@ -12,7 +12,11 @@ from homeassistant.setup import setup_component
 import homeassistant.core as ha
 from homeassistant.const import MATCH_ALL
 from homeassistant.helpers.event import (
+    DATA_STATE_CHANGE_CALLBACKS,
+    DATA_STATE_CHANGE_LISTENER,
     async_call_later,
+    async_track_render_info,
+    async_track_state_change,
     track_point_in_utc_time,
     track_point_in_time,
     track_utc_time_change,
@@ -27,6 +31,7 @@ from homeassistant.helpers.event import (
 from homeassistant.helpers.template import Template
 from homeassistant.components import sun
 import homeassistant.util.dt as dt_util
+from homeassistant.util.async_ import run_callback_threadsafe
 
 from tests.common import get_test_home_assistant, fire_time_changed
 from unittest.mock import patch
@@ -266,6 +271,56 @@ class TestEventHelpers(unittest.TestCase):
         self.assertEqual(2, len(wildcard_runs))
         self.assertEqual(2, len(wildercard_runs))
 
+    def test_track_template_follows_accessed_states(self):
+        """Test tracking template only listens to the states it used."""
+        runs = []
+        template_condition = Template(
+            "{% if is_state('input_boolean.use_a', 'on') %}"
+            "{{ is_state('switch.a', 'on') }}"
+            "{% else %}{{ is_state('switch.b', 'on') }}{% endif %}",
+            self.hass
+        )
+
+        self.hass.states.set('input_boolean.use_a', 'on')
+        track_template(self.hass, template_condition,
+                       lambda entity_id, old, new: runs.append(entity_id))
+        self.hass.block_till_done()
+        self.assertEqual(
+            {'input_boolean.use_a', 'switch.a'},
+            set(self.hass.data[DATA_STATE_CHANGE_CALLBACKS]))
+
+        # switch.b is not used by the template right now
+        self.hass.states.set('switch.b', 'on')
+        self.hass.block_till_done()
+        self.assertEqual([], runs)
+
+        self.hass.states.set('input_boolean.use_a', 'off')
+        self.hass.block_till_done()
+        self.assertEqual(['input_boolean.use_a'], runs)
+        self.assertEqual(
+            {'input_boolean.use_a', 'switch.b'},
+            set(self.hass.data[DATA_STATE_CHANGE_CALLBACKS]))
+
+    def test_track_render_info_domain(self):
+        """Test tracking states of a domain a template iterated."""
+        runs = []
+        info = Template(
+            '{{ states.light | length }}', self.hass).async_render_to_info()
+
+        remove = run_callback_threadsafe(
+            self.hass.loop, async_track_render_info, self.hass, [info],
+            lambda entity_id, old, new: runs.append(entity_id)).result()
+
+        self.hass.states.set('light.kitchen', 'on')
+        self.hass.states.set('switch.kitchen', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.kitchen'], runs)
+
+        run_callback_threadsafe(self.hass.loop, remove).result()
+        self.hass.states.set('light.kitchen', 'off')
+        self.hass.block_till_done()
+        self.assertEqual(['light.kitchen'], runs)
+
     def test_track_same_state_simple_trigger(self):
         """Test track_same_change with trigger simple."""
         thread_runs = []
@@ -633,6 +688,39 @@ class TestEventHelpers(unittest.TestCase):
         self.hass.block_till_done()
         self.assertEqual(2, len(specific_runs))
 
+    def test_periodic_task_local_dst(self):
+        """Test local time patterns skip times that do not exist."""
+        specific_runs = []
+        orig_time_zone = dt_util.DEFAULT_TIME_ZONE
+        time_zone = dt_util.get_time_zone('Europe/Amsterdam')
+        dt_util.set_default_time_zone(time_zone)
+
+        try:
+            with patch('homeassistant.util.dt.utcnow',
+                       return_value=dt_util.as_utc(time_zone.localize(
+                           datetime(2018, 3, 25, 1, 0, 0)))):
+                unsub = track_utc_time_change(
+                    self.hass, specific_runs.append, hour=2, minute=30,
+                    second=0, local=True)
+
+            # 2:30 does not exist on March 25, next run is March 26
+            self._send_time_changed(dt_util.as_utc(time_zone.localize(
+                datetime(2018, 3, 25, 12, 0, 0))))
+            self.hass.block_till_done()
+            self.assertEqual(0, len(specific_runs))
+
+            self._send_time_changed(dt_util.as_utc(time_zone.localize(
+                datetime(2018, 3, 26, 2, 30, 0))))
+            self.hass.block_till_done()
+            self.assertEqual(1, len(specific_runs))
+            self.assertEqual(
+                datetime(2018, 3, 26, 2, 30, 0),
+                specific_runs[0].replace(tzinfo=None))
+
+            unsub()
+        finally:
+            dt_util.set_default_time_zone(orig_time_zone)
+
     def test_periodic_task_wrong_input(self):
         """Test periodic tasks with wrong input."""
         specific_runs = []
@@ -663,3 +751,70 @@ def test_async_call_later(hass):
     assert p_action is action
     assert p_point == now + timedelta(seconds=3)
     assert remove is mock()
+
+
+async def test_track_state_change_indexed_by_entity(hass):
+    """Test trackers are only called for the entities they track."""
+    light_runs = []
+    multi_runs = []
+
+    @ha.callback
+    def light_callback(entity_id, old_state, new_state):
+        light_runs.append(entity_id)
+
+    @ha.callback
+    def multi_callback(entity_id, old_state, new_state):
+        multi_runs.append(entity_id)
+
+    unsub_light = async_track_state_change(
+        hass, 'light.Bowl', light_callback)
+    unsub_multi = async_track_state_change(
+        hass, ['light.bowl', 'switch.kitchen', 'switch.kitchen'],
+        multi_callback)
+
+    hass.states.async_set('light.bowl', 'on')
+    hass.states.async_set('switch.kitchen', 'on')
+    hass.states.async_set('switch.other', 'on')
+    await hass.async_block_till_done()
+
+    assert light_runs == ['light.bowl']
+    assert multi_runs == ['light.bowl', 'switch.kitchen']
+
+    unsub_light()
+    hass.states.async_set('light.bowl', 'off')
+    await hass.async_block_till_done()
+
+    assert light_runs == ['light.bowl']
+    assert multi_runs == ['light.bowl', 'switch.kitchen', 'light.bowl']
+    assert DATA_STATE_CHANGE_LISTENER in hass.data
+
+    unsub_multi()
+    assert DATA_STATE_CHANGE_LISTENER not in hass.data
+    assert hass.data[DATA_STATE_CHANGE_CALLBACKS] == {}
+
+
+async def test_track_state_change_remove_while_dispatching(hass):
+    """Test a tracker can remove another tracker of the same entity."""
+    runs = []
+    unsub_second = None
+
+    @ha.callback
+    def first_callback(entity_id, old_state, new_state):
+        runs.append('first')
+        unsub_second()
+
+    @ha.callback
+    def second_callback(entity_id, old_state, new_state):
+        runs.append('second')
+
+    async_track_state_change(hass, 'light.bowl', first_callback)
+    unsub_second = async_track_state_change(
+        hass, 'light.bowl', second_callback)
+
+    hass.states.async_set('light.bowl', 'on')
+    await hass.async_block_till_done()
+    assert runs == ['first', 'second']
+
+    hass.states.async_set('light.bowl', 'off')
+    await hass.async_block_till_done()
+    assert runs == ['first', 'second', 'first']
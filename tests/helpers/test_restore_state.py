@@ -4,17 +4,19 @@ from datetime import timedelta
 from unittest.mock import patch, MagicMock
 
 from homeassistant.setup import setup_component
-from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP)
 from homeassistant.core import CoreState, split_entity_id, State
 import homeassistant.util.dt as dt_util
 from homeassistant.components import input_boolean, recorder
+from homeassistant.helpers import restore_state
 from homeassistant.helpers.restore_state import (
     async_get_last_state, DATA_RESTORE_CACHE)
 from homeassistant.components.recorder.models import RecorderRuns, States
 
 from tests.common import (
     get_test_home_assistant, mock_coro, init_recorder_component,
-    mock_component)
+    mock_component, async_fire_time_changed)
 
 
 @asyncio.coroutine
@@ -188,3 +190,64 @@ def test_filling_the_cache():
     assert state.state == 'off'
 
     hass.stop()
+
+
+async def test_restore_from_snapshot(hass, hass_storage):
+    """Test states are restored from the snapshot without the recorder."""
+    mock_component(hass, 'recorder')
+    hass.state = CoreState.starting
+    last_changed = dt_util.utcnow() - timedelta(hours=1)
+    hass_storage[restore_state.STORAGE_KEY] = {
+        'version': restore_state.STORAGE_VERSION,
+        'key': restore_state.STORAGE_KEY,
+        'data': [{
+            'entity_id': 'input_boolean.b1',
+            'state': 'on',
+            'attributes': {'friendly_name': 'B1'},
+            'last_changed': last_changed.isoformat(),
+            'last_updated': last_changed.isoformat(),
+        }],
+    }
+
+    with patch('homeassistant.helpers.restore_state.last_recorder_run') \
+            as mock_last_run:
+        state = await async_get_last_state(hass, 'input_boolean.b1')
+        assert await async_get_last_state(hass, 'input_boolean.b2') is None
+
+    assert not mock_last_run.called
+    assert state.state == 'on'
+    assert state.attributes == {'friendly_name': 'B1'}
+    assert state.last_changed == last_changed
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    assert DATA_RESTORE_CACHE not in hass.data
+
+
+async def test_dump_snapshot(hass, hass_storage):
+    """Test the snapshot is written periodically and on stop."""
+    hass.data.pop(restore_state.DATA_RESTORE_STORE)
+    restore_state._async_get_store(hass)
+
+    hass.states.async_set('input_boolean.b1', 'on', {'since': dt_util.now()})
+    # States that can't be serialized are left out
+    hass.states.async_set('sensor.unserializable', 'on', {'obj': object()})
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + restore_state.SNAPSHOT_INTERVAL)
+    await hass.async_block_till_done()
+
+    data = hass_storage[restore_state.STORAGE_KEY]['data']
+    assert [item['entity_id'] for item in data] == ['input_boolean.b1']
+    state = State.from_dict(data[0])
+    assert state.state == 'on'
+    assert state.last_changed == \
+        hass.states.get('input_boolean.b1').last_changed
+
+    hass.states.async_set('input_boolean.b1', 'off')
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    data = hass_storage[restore_state.STORAGE_KEY]['data']
+    assert data[0]['state'] == 'off'
@@ -1019,3 +1019,145 @@ def test_length_of_states(hass):
 
     tpl = template.Template('{{ states.sensor | length }}', hass)
     assert tpl.async_render() == '2'
+
+
+async def test_render_to_info_entities(hass):
+    """Test render info records the entities a template accessed."""
+    hass.states.async_set('light.kitchen', 'on')
+    hass.states.async_set('sensor.temp', '21', {'unit': 'C'})
+
+    tpl = template.Template(
+        "{% if is_state('light.Kitchen', 'on') %}"
+        "{{ states.sensor.temp.state }}{{ state_attr('sensor.temp', 'unit') }}"
+        "{% else %}{{ states('sensor.other') }}{% endif %}", hass)
+    info = tpl.async_render_to_info()
+
+    assert info.result == '21C'
+    assert info.exception is None
+    assert info.entities == {'light.kitchen', 'sensor.temp'}
+    assert info.dependencies == (frozenset(), frozenset(info.entities))
+
+
+async def test_render_to_info_domains_and_all_states(hass):
+    """Test render info records domain and all states access."""
+    hass.states.async_set('sensor.test', '23')
+
+    info = template.Template(
+        '{{ states.sensor | length }}', hass).async_render_to_info()
+    assert info.result == '1'
+    assert info.domains == {'sensor'}
+    assert info.dependencies == (frozenset({'sensor'}), frozenset())
+
+    info = template.Template(
+        '{% for state in states %}{{ state.state }}{% endfor %}',
+        hass).async_render_to_info()
+    assert info.all_states
+    assert info.dependencies == MATCH_ALL
+
+
+async def test_render_to_info_no_states_or_error(hass):
+    """Test render info falls back to all states without dependencies."""
+    info = template.Template('{{ 1 + 1 }}', hass).async_render_to_info()
+    assert info.result == '2'
+    assert info.dependencies == MATCH_ALL
+
+    info = template.Template(
+        '{{ states.sensor.missing.state.lower() }}',
+        hass).async_render_to_info()
+    assert isinstance(info.exception, TemplateError)
+    assert info.entities == {'sensor.missing'}
+    assert info.dependencies == MATCH_ALL
+
+    # Collection stops once the render is done
+    hass.states.async_all()
+    assert getattr(template._RENDER_INFO, 'current', None) is None
+
+
+def test_compiled_template_shared(hass):
+    """Test templates with the same source share the compiled code."""
+    tpl1 = template.Template('{{ states.sensor.shared.state }}', hass)
+    tpl2 = template.Template('{{ states.sensor.shared.state }}', hass)
+    tpl1.ensure_valid()
+    tpl2.ensure_valid()
+    assert tpl1._compiled_code is tpl2._compiled_code
+
+
+async def test_render_memoized_until_state_changes(hass):
+    """Test a render is reused until a state it accessed changes."""
+    hass.states.async_set('sensor.temp', '21', {'unit': 'C'})
+    hass.states.async_set('sensor.other', '5')
+
+    tpl = template.Template(
+        "{{ states.sensor.temp.state }}"
+        "{{ state_attr('sensor.temp', 'unit') }}", hass)
+    assert tpl.async_render() == '21C'
+
+    with patch.object(tpl._compiled, 'render',
+                      wraps=tpl._compiled.render) as mock_render:
+        assert tpl.async_render() == '21C'
+        # Other entities do not invalidate the result
+        hass.states.async_set('sensor.other', '6')
+        assert tpl.async_render() == '21C'
+        assert mock_render.call_count == 0
+
+        # Nested renders still collect the entities of a memoized render
+        info = tpl.async_render_to_info()
+        assert info.result == '21C'
+        assert info.entities == {'sensor.temp'}
+        assert mock_render.call_count == 0
+
+        hass.states.async_set('sensor.temp', '22', {'unit': 'C'})
+        assert tpl.async_render() == '22C'
+        assert mock_render.call_count == 1
+
+        # Renders with variables are never memoized
+        assert tpl.async_render({'extra': 1}) == '22C'
+        assert mock_render.call_count == 2
+
+
+async def test_render_not_memoized(hass):
+    """Test time dependent and domain wide renders are not memoized."""
+    hass.states.async_set('sensor.temp', '21')
+
+    for source in ("{{ states('sensor.temp') }}{{ now().year }}",
+                   "{% set clock = utcnow %}"
+                   "{{ states('sensor.temp') }}{{ clock().year }}",
+                   "{{ states('sensor.temp') }}{{ ['a', 'b'] | random }}",
+                   "{{ states.sensor | count }}",
+                   "{{ 1 + 1 }}"):
+        tpl = template.Template(source, hass)
+        tpl.async_render()
+        with patch.object(tpl._compiled, 'render',
+                          wraps=tpl._compiled.render) as mock_render:
+            tpl.async_render()
+            assert mock_render.call_count == 1, source
+
+
+async def test_render_memoized_until_input_changes(hass):
+    """Test a render is redone when a non state input it read changes."""
+    hass.states.async_set('test.object', 'happy', {
+        'latitude': hass.config.latitude + 0.1,
+        'longitude': hass.config.longitude,
+    })
+    hass.states.async_set('sensor.timestamp', '0')
+
+    tpl_distance = template.Template(
+        "{{ distance(states.test.object) | round }}", hass)
+    tpl_local = template.Template(
+        "{{ states('sensor.timestamp') | int | timestamp_local }}", hass)
+    distance = tpl_distance.async_render()
+    local = tpl_local.async_render()
+
+    info = tpl_distance.async_render_to_info()
+    assert info.inputs == {'location'}
+    assert tpl_distance.async_render() == distance
+
+    hass.config.latitude += 1
+    assert tpl_distance.async_render() != distance
+
+    time_zone = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(dt_util.get_time_zone('Asia/Tokyo'))
+    try:
+        assert tpl_local.async_render() != local
+    finally:
+        dt_util.set_default_time_zone(time_zone)
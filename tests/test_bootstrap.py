@@ -105,3 +105,23 @@ async def test_async_from_config_file_not_mount_deps_folder(loop):
 
         await bootstrap.async_from_config_file('mock-path', hass)
         assert len(mock_mount.mock_calls) == 0
+
+
+async def test_import_components_before_setup(hass):
+    """Test components and platforms are imported before setting up."""
+    with patch('homeassistant.loader.async_import_components',
+               return_value=mock_coro()) as mock_import, \
+            patch('homeassistant.bootstrap.async_setup_component',
+                  side_effect=lambda *args: mock_coro(True)) as mock_setup, \
+            patch('homeassistant.bootstrap.async_register_signal_handling'):
+        await bootstrap.async_from_config_dict({
+            'homeassistant': {},
+            'light': {'platform': 'hue'},
+            'light 2': [{'platform': 'lifx'}, {'no_platform': True}],
+            'sun': None,
+        }, hass, enable_log=False)
+
+    assert len(mock_import.mock_calls) == 1
+    assert mock_import.mock_calls[0][1][1] == {
+        'light', 'light.hue', 'light.lifx', 'sun'}
+    assert len(mock_setup.mock_calls) == 2
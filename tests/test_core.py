@@ -20,7 +20,8 @@ from homeassistant.util.unit_system import (METRIC_SYSTEM)
 from homeassistant.const import (
     __version__, EVENT_STATE_CHANGED, ATTR_FRIENDLY_NAME, CONF_UNIT_SYSTEM,
     ATTR_NOW, EVENT_TIME_CHANGED, EVENT_HOMEASSISTANT_STOP,
-    EVENT_HOMEASSISTANT_CLOSE, EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED)
+    EVENT_HOMEASSISTANT_CLOSE, EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED,
+    MATCH_ALL)
 
 from tests.common import get_test_home_assistant
 
@@ -465,6 +466,23 @@ class TestState(unittest.TestCase):
         state = ha.State('domain.hello', 'world', {'some': 'attr'})
         self.assertEqual(state, ha.State.from_dict(state.as_dict()))
 
+    def test_as_dict_cached(self):
+        """Test the dict representation is built once and read-only."""
+        state = ha.State('domain.hello', 'world', {'some': 'attr'})
+        as_dict = state.as_dict()
+        self.assertIs(as_dict, state.as_dict())
+
+        with self.assertRaises(TypeError):
+            as_dict['state'] = 'changed'
+        with self.assertRaises(TypeError):
+            as_dict['attributes']['some'] = 'changed'
+
+        point = datetime(2018, 1, 1, tzinfo=dt_util.UTC)
+        state.last_changed = point
+        self.assertEqual(point, state.as_dict()['last_changed'])
+        state.last_updated = point
+        self.assertEqual(point, state.as_dict()['last_updated'])
+
     def test_dict_conversion_with_wrong_data(self):
         """Test conversion with wrong data."""
         self.assertIsNone(ha.State.from_dict(None))
@@ -523,6 +541,25 @@ class TestStateMachine(unittest.TestCase):
         states = sorted(state.entity_id for state in self.states.all())
         self.assertEqual(['light.bowl', 'switch.ac'], states)
 
+    def test_domain_index(self):
+        """Test domain queries follow sets and removes."""
+        self.states.set('light.Kitchen', 'off')
+        self.states.set('light.bowl', 'off')
+
+        self.assertEqual(['light.bowl', 'light.kitchen'],
+                         self.states.entity_ids('Light'))
+        self.assertEqual(['light.bowl', 'light.kitchen'],
+                         [state.entity_id for state
+                          in self.states.all('light')])
+        self.assertEqual('off', self.states.all('light')[0].state)
+        self.assertEqual([], self.states.all('sensor'))
+
+        self.assertTrue(self.states.remove('switch.AC'))
+        self.assertTrue(self.states.remove('light.bowl'))
+        self.assertEqual(['light.kitchen'], self.states.entity_ids('light'))
+        self.assertEqual([], self.states.entity_ids('switch'))
+        self.assertEqual([], self.states.all('switch'))
+
     def test_remove(self):
         """Test remove method."""
         events = []
@@ -966,3 +1003,219 @@ def test_track_task_functions(loop):
         assert hass._track_task
     finally:
         yield from hass.async_stop()
+
+
+def test_get_job_type():
+    """Test classifying how a job should be run."""
+    @ha.callback
+    def callback_func():
+        pass
+
+    @asyncio.coroutine
+    def coro_func():
+        pass
+
+    async def async_func():
+        pass
+
+    def executor_func():
+        pass
+
+    assert ha.get_job_type(callback_func) == ha.JobType.callback
+    assert ha.get_job_type(coro_func) == ha.JobType.coroutinefunction
+    assert ha.get_job_type(async_func) == ha.JobType.coroutinefunction
+    assert ha.get_job_type(executor_func) == ha.JobType.executor
+
+
+def _record_listener(calls):
+    """Return a callback listener that records its events."""
+    @ha.callback
+    def listener(event):
+        """Record event."""
+        calls.append(event)
+
+    return listener
+
+
+async def test_callback_listener_runs_inline(hass):
+    """Test callback listeners are called while the event is fired."""
+    calls = []
+
+    hass.bus.async_listen('test_event', _record_listener(calls))
+    hass.bus.async_fire('test_event')
+
+    assert len(calls) == 1
+    assert calls[0].event_type == 'test_event'
+
+
+async def test_listener_exception_does_not_stop_dispatch(hass, caplog):
+    """Test a failing callback listener does not block other listeners."""
+    calls = []
+
+    @ha.callback
+    def bad_listener(event):
+        """Raise an error."""
+        raise ValueError('boom')
+
+    hass.bus.async_listen('test_event', bad_listener)
+    hass.bus.async_listen('test_event', _record_listener(calls))
+    hass.bus.async_fire('test_event')
+
+    assert len(calls) == 1
+    assert 'Error running listener' in caplog.text
+
+
+async def test_dispatch_follows_listener_changes(hass):
+    """Test cached dispatch is updated on subscribe and unsubscribe."""
+    calls = []
+    all_calls = []
+
+    hass.bus.async_fire('test_event')
+
+    unsub = hass.bus.async_listen('test_event', _record_listener(calls))
+    unsub_all = hass.bus.async_listen(
+        MATCH_ALL, _record_listener(all_calls))
+    hass.bus.async_fire('test_event')
+
+    assert len(calls) == 1
+    assert len(all_calls) == 1
+
+    unsub_all()
+    hass.bus.async_fire('test_event')
+
+    assert len(calls) == 2
+    assert len(all_calls) == 1
+
+    unsub()
+    hass.bus.async_fire('test_event')
+
+    assert len(calls) == 2
+    assert 'test_event' not in hass.bus.async_listeners()
+
+
+async def test_match_all_does_not_receive_close(hass):
+    """Test MATCH_ALL listeners are not called for the close event."""
+    all_calls = []
+
+    hass.bus.async_listen(MATCH_ALL, _record_listener(all_calls))
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+
+    assert len(all_calls) == 0
+
+
+async def test_scheduler_runs_due_jobs_in_order(hass):
+    """Test the scheduler only runs jobs that are due, in order."""
+    now = datetime(2018, 1, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+    calls = []
+
+    def make_job(name):
+        """Return a job that records its name."""
+        return ha.callback(lambda utc_now: calls.append((name, utc_now)))
+
+    hass.scheduler.async_schedule(
+        now + timedelta(seconds=2), make_job('second'))
+    hass.scheduler.async_schedule(
+        now + timedelta(seconds=1), make_job('first'))
+    cancel = hass.scheduler.async_schedule(
+        now + timedelta(seconds=1), make_job('cancelled'))
+    cancel()
+
+    hass.scheduler.async_run_due(now)
+    assert calls == []
+
+    hass.scheduler.async_run_due(now + timedelta(seconds=1))
+    assert calls == [('first', now + timedelta(seconds=1))]
+
+    hass.scheduler.async_run_due(now + timedelta(seconds=5))
+    assert calls == [('first', now + timedelta(seconds=1)),
+                     ('second', now + timedelta(seconds=5))]
+
+    # Cancelling a job that has run does nothing
+    cancel()
+
+
+async def test_scheduler_defers_jobs_added_while_running(hass):
+    """Test jobs scheduled by a running job wait for the next run."""
+    now = datetime(2018, 1, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+    calls = []
+
+    @ha.callback
+    def job(utc_now):
+        """Reschedule itself in the past."""
+        calls.append(utc_now)
+        hass.scheduler.async_schedule(now, job)
+
+    hass.scheduler.async_schedule(now, job)
+    hass.scheduler.async_run_due(now)
+    assert len(calls) == 1
+
+    hass.scheduler.async_run_due(now)
+    assert len(calls) == 2
+
+
+async def test_scheduler_runs_on_time_changed(hass):
+    """Test time changed events run the jobs due at their time."""
+    now = datetime(2018, 1, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+    calls = []
+
+    hass.scheduler.async_schedule(now, calls.append)
+    hass.bus.async_fire(EVENT_TIME_CHANGED, {
+        ATTR_NOW: now - timedelta(seconds=1)})
+    assert calls == []
+
+    hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: now})
+    assert calls == [now]
+
+
+async def test_scheduler_pattern_runs_for_matching_times(hass):
+    """Test patterns run for matching times, also if time moves back."""
+    now = datetime(2018, 1, 1, 12, 0, 30, tzinfo=dt_util.UTC)
+    calls = []
+
+    def next_match(start):
+        """Return the next whole minute."""
+        if start.second == 0:
+            return start
+        return start.replace(second=0) + timedelta(minutes=1)
+
+    with patch('homeassistant.util.dt.utcnow', return_value=now):
+        cancel = hass.scheduler.async_schedule_pattern(
+            next_match, calls.append)
+
+    # Past the match, but the time does not match
+    hass.scheduler.async_run_due(now + timedelta(seconds=31))
+    assert calls == []
+
+    hass.scheduler.async_run_due(now + timedelta(seconds=90))
+    assert calls == [now + timedelta(seconds=90)]
+
+    # The time moved back to a matching time
+    hass.scheduler.async_run_due(now - timedelta(seconds=30))
+    assert calls == [now + timedelta(seconds=90),
+                     now - timedelta(seconds=30)]
+
+    cancel()
+    hass.scheduler.async_run_due(now + timedelta(minutes=10, seconds=30))
+    assert len(calls) == 2
+
+
+async def test_scheduler_runs_on_loop_timer(hass):
+    """Test a started scheduler runs jobs from a loop timer."""
+    calls = []
+    done = asyncio.Event(loop=hass.loop)
+
+    @ha.callback
+    def job(utc_now):
+        """Record call."""
+        calls.append(utc_now)
+        done.set()
+
+    hass.scheduler.async_start()
+    try:
+        hass.scheduler.async_schedule(
+            dt_util.utcnow() + timedelta(milliseconds=10), job)
+        await asyncio.wait_for(done.wait(), 1, loop=hass.loop)
+    finally:
+        hass.scheduler.async_stop()
+
+    assert len(calls) == 1
@@ -134,3 +134,20 @@ async def test_log_warning_custom_component(hass, caplog):
 
     loader.get_component(hass, 'light.test')
     assert 'You are using a custom component for light.test' in caplog.text
+
+
+async def test_import_components(hass, caplog):
+    """Test importing components with their dependencies in the executor."""
+    await loader.async_import_components(
+        hass, ['mqtt_eventstream', 'light.test', 'non_existing'])
+
+    import_time = hass.data[loader.DATA_IMPORT_TIME]
+    assert set(import_time) == {'mqtt_eventstream', 'mqtt', 'light.test'}
+    # Only loading a component reports errors
+    assert 'non_existing' not in caplog.text
+    assert 'mqtt' not in hass.data[loader.DATA_KEY]
+
+    comp = loader.get_component(hass, 'light.test')
+    assert comp.__name__ == 'custom_components.light.test'
+    assert hass.data[loader.DATA_IMPORT_TIME]['light.test'] == \
+        import_time['light.test']
@@ -1,11 +1,16 @@
 """Test requirements module."""
+from datetime import timedelta
 import os
+import tempfile
 from unittest import mock
 
-from homeassistant import loader, setup
+from homeassistant import loader, requirements, setup
 from homeassistant.requirements import CONSTRAINT_FILE
+from homeassistant.util import dt as dt_util
+import homeassistant.util.package as pkg_util
 
-from tests.common import get_test_home_assistant, MockModule
+from tests.common import (
+    async_fire_time_changed, get_test_home_assistant, MockModule)
 
 
 class TestRequirements:
@@ -18,10 +23,14 @@ class TestRequirements:
     def setup_method(self, method):
         """Setup the test."""
         self.hass = get_test_home_assistant()
+        # Store satisfied requirements outside of the test config
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass.config.config_dir = self.config_dir.name
 
     def teardown_method(self, method):
         """Clean up."""
         self.hass.stop()
+        self.config_dir.cleanup()
 
     @mock.patch('os.path.dirname')
     @mock.patch('homeassistant.util.package.is_virtual_env',
@@ -61,3 +70,62 @@ class TestRequirements:
         assert mock_install.call_args == mock.call(
             'package==0.0.1', target=self.hass.config.path('deps'),
             constraints=os.path.join('ha_package_path', CONSTRAINT_FILE))
+
+
+async def test_satisfied_requirements_not_installed_again(hass, hass_storage):
+    """Test requirements that are satisfied are only checked once."""
+    with mock.patch('homeassistant.util.package.install_package',
+                    return_value=True) as mock_install:
+        assert await requirements.async_process_requirements(
+            hass, 'comp', ['package==0.0.1'])
+        assert await requirements.async_process_requirements(
+            hass, 'other', ['package==0.0.1', 'other==0.0.2'])
+
+    assert [call[1][0] for call in mock_install.mock_calls] == [
+        'package==0.0.1', 'other==0.0.2']
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(
+        seconds=requirements.SAVE_DELAY))
+    await hass.async_block_till_done()
+
+    assert hass_storage[requirements.STORAGE_KEY]['data'] == {
+        'key': pkg_util.environment_key(),
+        'requirements': ['other==0.0.2', 'package==0.0.1'],
+    }
+
+
+async def test_stored_satisfied_requirements(hass, hass_storage):
+    """Test requirements stored as satisfied are not checked again."""
+    hass_storage[requirements.STORAGE_KEY] = {
+        'version': requirements.STORAGE_VERSION,
+        'data': {
+            'key': pkg_util.environment_key(),
+            'requirements': ['package==0.0.1'],
+        }
+    }
+
+    with mock.patch('homeassistant.util.package.install_package',
+                    return_value=True) as mock_install:
+        assert await requirements.async_process_requirements(
+            hass, 'comp', ['package==0.0.1'])
+
+    assert not mock_install.called
+
+
+async def test_stored_satisfied_requirements_changed_environment(
+        hass, hass_storage):
+    """Test stored requirements are checked if packages were installed."""
+    hass_storage[requirements.STORAGE_KEY] = {
+        'version': requirements.STORAGE_VERSION,
+        'data': {
+            'key': 'old environment',
+            'requirements': ['package==0.0.1'],
+        }
+    }
+
+    with mock.patch('homeassistant.util.package.install_package',
+                    return_value=True) as mock_install:
+        assert await requirements.async_process_requirements(
+            hass, 'comp', ['package==0.0.1'])
+
+    assert len(mock_install.mock_calls) == 1
@@ -164,3 +164,32 @@ class TestDateUtil(unittest.TestCase):
 
         diff = dt_util.now() - timedelta(minutes=365*60*24)
         self.assertEqual(dt_util.get_age(diff), "1 year")
+
+    def test_find_next_time_match(self):
+        """Test finding the next datetime matching a pattern."""
+        any_second = list(range(60))
+        any_minute = list(range(60))
+        any_hour = list(range(24))
+        any_day = list(range(1, 32))
+        any_month = list(range(1, 13))
+
+        def find(start, seconds=any_second, minutes=any_minute,
+                 hours=any_hour, days=any_day, months=any_month, years=None):
+            return dt_util.find_next_time_match(
+                start, seconds, minutes, hours, days, months, years)
+
+        start = datetime(2018, 1, 31, 23, 59, 30, 500)
+
+        assert find(start) == datetime(2018, 1, 31, 23, 59, 31)
+        assert find(start.replace(microsecond=0)) == start.replace(
+            microsecond=0)
+        assert find(start, seconds=[0]) == datetime(2018, 2, 1, 0, 0, 0)
+        assert find(start, seconds=[0], minutes=[0], hours=[12]) == \
+            datetime(2018, 2, 1, 12, 0, 0)
+        assert find(start, seconds=[0], minutes=[0], hours=[0], days=[30]) \
+            == datetime(2018, 3, 30, 0, 0, 0)
+        assert find(start, seconds=[0], minutes=[0], hours=[0], days=[29],
+                    months=[2]) == datetime(2020, 2, 29, 0, 0, 0)
+        assert find(start, years=[2019, 2021]) == datetime(2019, 1, 1)
+        assert find(start, years=[2017]) is None
+        assert find(start, seconds=[]) is None
@@ -217,3 +217,36 @@ def test_async_get_user_site(mock_env_copy):
         stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
         env=env)
     assert ret == os.path.join(deps_dir, 'lib_dir')
+
+
+def test_check_package_scans_once():
+    """Test the installed packages are only scanned once."""
+    package._ENVIRONMENT_CACHE.clear()
+
+    with patch('homeassistant.util.package.pkg_resources.Environment',
+               wraps=pkg_resources.Environment) as mock_env:
+        assert package.check_package_exists(TEST_EXIST_REQ)
+        assert not package.check_package_exists(TEST_NEW_REQ)
+        assert len(mock_env.mock_calls) == 1
+
+        with patch.object(sys, 'path', sys.path + ['/new_path']):
+            assert package.check_package_exists(TEST_EXIST_REQ)
+
+        assert len(mock_env.mock_calls) == 2
+
+
+def test_install_rescans_packages(
+        mock_sys, mock_exists, mock_popen, mock_env_copy, mock_venv):
+    """Test installed packages are scanned again after an install."""
+    package._ENVIRONMENT_CACHE[('path',)] = None
+    assert package.install_package(TEST_NEW_REQ, False)
+    assert package._ENVIRONMENT_CACHE == {}
+
+
+def test_environment_key():
+    """Test the environment key changes when the search path changes."""
+    key = package.environment_key()
+    assert package.environment_key() == key
+
+    with patch.object(sys, 'path', sys.path + [RESOURCE_DIR]):
+        assert package.environment_key() != key
@@ -1,6 +1,7 @@
 """Test Home Assistant yaml loader."""
 import io
 import os
+import tempfile
 import unittest
 import logging
 from unittest.mock import patch
@@ -442,3 +443,202 @@ def test_duplicate_key(caplog):
     with patch_yaml_files(files):
         load_yaml_config_file(YAML_CONFIG_FILE)
     assert 'contains duplicate key' in caplog.text
+
+
+@pytest.fixture
+def config_dir():
+    """Create a configuration directory with an empty config cache."""
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            patch.dict(yaml._CONFIG_CACHE, clear=True):
+        yield tmp_dir
+
+
+def write_file(path, content):
+    """Write a file and make sure its modification time changes."""
+    mtime_ns = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+def test_cached_file_not_parsed_again(config_dir):
+    """Test unchanged files are loaded from the cache."""
+    config_path = os.path.join(config_dir, YAML_CONFIG_FILE)
+    write_file(config_path, 'key:\n  - value\n')
+
+    first = yaml.load_yaml(config_path)
+
+    with patch.object(yaml.yaml, 'load') as mock_load:
+        second = yaml.load_yaml(config_path)
+
+    assert not mock_load.called
+    assert second == first == {'key': ['value']}
+    assert second is not first
+    assert second['key'].__line__ == first['key'].__line__ == 1
+    assert second['key'].__config_file__ == config_path
+
+    # Touched files with the same content are not parsed again
+    os.utime(config_path, ns=(0, 0))
+
+    with patch.object(yaml.yaml, 'load') as mock_load:
+        assert yaml.load_yaml(config_path) == first
+
+    assert not mock_load.called
+
+
+def test_cache_invalidated_by_include(config_dir):
+    """Test changes to included files invalidate the cache."""
+    config_path = os.path.join(config_dir, YAML_CONFIG_FILE)
+    os.mkdir(os.path.join(config_dir, 'sensors'))
+    write_file(config_path, 'sensor: !include_dir_list sensors\n'
+                            'light: !include light.yaml\n')
+    write_file(os.path.join(config_dir, 'light.yaml'), 'platform: hue\n')
+    write_file(os.path.join(config_dir, 'sensors', 'one.yaml'),
+               'platform: one\n')
+
+    assert yaml.load_yaml(config_path) == {
+        'sensor': [{'platform': 'one'}], 'light': {'platform': 'hue'}}
+
+    write_file(os.path.join(config_dir, 'light.yaml'), 'platform: lifx\n')
+
+    assert yaml.load_yaml(config_path) == {
+        'sensor': [{'platform': 'one'}], 'light': {'platform': 'lifx'}}
+
+    write_file(os.path.join(config_dir, 'sensors', 'two.yaml'),
+               'platform: two\n')
+
+    assert yaml.load_yaml(config_path) == {
+        'sensor': [{'platform': 'one'}, {'platform': 'two'}],
+        'light': {'platform': 'lifx'}}
+
+
+def test_cache_invalidated_by_secret_and_env(config_dir):
+    """Test changes to secrets and environment variables invalidate."""
+    config_path = os.path.join(config_dir, YAML_CONFIG_FILE)
+    secrets_path = os.path.join(config_dir, yaml.SECRET_YAML)
+    write_file(config_path, 'password: !secret password\n'
+                            'user: !env_var CACHE_TEST_USER nobody\n')
+    write_file(secrets_path, 'password: one\n')
+
+    try:
+        assert yaml.load_yaml(config_path) == {
+            'password': 'one', 'user': 'nobody'}
+
+        yaml.clear_secret_cache()
+        write_file(secrets_path, 'password: two\n')
+
+        with patch.dict(os.environ, {'CACHE_TEST_USER': 'paulus'}):
+            assert yaml.load_yaml(config_path) == {
+                'password': 'two', 'user': 'paulus'}
+    finally:
+        yaml.clear_secret_cache()
+
+
+def test_files_with_secrets_not_cached(config_dir):
+    """Test secrets never end up in the cache."""
+    config_path = os.path.join(config_dir, YAML_CONFIG_FILE)
+    http_path = os.path.join(config_dir, 'http.yaml')
+    light_path = os.path.join(config_dir, 'light.yaml')
+    write_file(config_path, 'http: !include http.yaml\n'
+                            'light: !include light.yaml\n')
+    write_file(http_path, 'api_password: !secret password\n')
+    write_file(light_path, 'platform: hue\n')
+    write_file(os.path.join(config_dir, yaml.SECRET_YAML),
+               'password: one\n')
+
+    try:
+        assert yaml.load_yaml(config_path) == {
+            'http': {'api_password': 'one'}, 'light': {'platform': 'hue'}}
+    finally:
+        yaml.clear_secret_cache()
+
+    assert list(yaml._CONFIG_CACHE) == [light_path]
+
+
+def test_c_loader_matches_python_loader(config_dir):
+    """Test the C loader gives the same result as the Python loader."""
+    if yaml._CSafeLineLoader is None:
+        pytest.skip("libyaml is not available")
+
+    config_path = os.path.join(config_dir, YAML_CONFIG_FILE)
+    write_file(config_path, 'a: 1\nb:\n  - x\n  - "2"\n'
+                            'c:\n  d: !include_dir_named sub\n')
+    os.mkdir(os.path.join(config_dir, 'sub'))
+    write_file(os.path.join(config_dir, 'sub', 'e.yaml'), 'f: true\n')
+
+    def lines(obj):
+        """Return the values with the line and file they were found on."""
+        if isinstance(obj, dict):
+            items = [(key, lines(value)) for key, value in obj.items()]
+        elif isinstance(obj, list):
+            items = [lines(value) for value in obj]
+        else:
+            items = obj
+        return (items, getattr(obj, '__line__', None),
+                getattr(obj, '__config_file__', None))
+
+    result = yaml.load_yaml(config_path)
+    yaml.clear_config_cache()
+
+    with patch.object(yaml, '_CSafeLineLoader', None):
+        expected = yaml.load_yaml(config_path)
+
+    assert lines(result) == lines(expected)
+
+
+def test_c_loader_error_message(config_dir):
+    """Test invalid files give the same error as with the Python loader."""
+    config_path = os.path.join(config_dir, YAML_CONFIG_FILE)
+    write_file(config_path, 'key: [value\n')
+
+    with pytest.raises(HomeAssistantError) as c_loader_err:
+        yaml.load_yaml(config_path)
+
+    with patch.object(yaml, '_CSafeLineLoader', None), \
+            pytest.raises(HomeAssistantError) as python_loader_err:
+        yaml.load_yaml(config_path)
+
+    assert str(c_loader_err.value) == str(python_loader_err.value)
+
+
+def test_config_cache_stored(config_dir):
+    """Test the cache of parsed files is stored and loaded."""
+    config_path = os.path.join(config_dir, YAML_CONFIG_FILE)
+    cache_path = os.path.join(config_dir, 'config_cache')
+    write_file(config_path, 'key: value\n')
+
+    yaml.load_yaml(config_path)
+    yaml.save_config_cache(cache_path)
+    yaml.clear_config_cache()
+    yaml.load_config_cache(cache_path)
+
+    with patch.object(yaml.yaml, 'load') as mock_load:
+        assert yaml.load_yaml(config_path) == {'key': 'value'}
+
+    assert not mock_load.called
+
+    # Broken caches are ignored
+    yaml.clear_config_cache()
+    write_file(cache_path, 'broken')
+    yaml.load_config_cache(cache_path)
+    assert yaml.load_yaml(config_path) == {'key': 'value'}
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'),
+                    reason="File permissions are not checked")
+def test_config_cache_private(config_dir, caplog):
+    """Test the cache is only accessible to its owner."""
+    config_path = os.path.join(config_dir, YAML_CONFIG_FILE)
+    cache_path = os.path.join(config_dir, 'config_cache')
+    write_file(config_path, 'key: value\n')
+
+    yaml.load_yaml(config_path)
+    yaml.save_config_cache(cache_path)
+    assert os.stat(cache_path).st_mode & 0o777 == 0o600
+
+    os.chmod(cache_path, 0o666)
+    yaml.clear_config_cache()
+    yaml.load_config_cache(cache_path)
+
+    assert yaml._CONFIG_CACHE == {}
+    assert 'other users can access it' in caplog.text